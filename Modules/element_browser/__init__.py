@@ -0,0 +1,31 @@
+"""Qt-free engine behind the Element Browser panel.
+
+Install this package next to ``DaVinciResolveScript`` in Resolve's scripting
+``Modules`` directory, or leave it beside ``Utility`` in a checkout.
+"""
+
+from .index import ScanIndex, default_index_path, iter_incremental_scan
+from .scan import (
+    DEFAULT_SCAN_WORKERS,
+    SEQ_EXTENSIONS,
+    ParallelDirectoryWalker,
+    detect_sequences,
+    iter_directory_listings,
+    list_directory,
+    sequences_in_directory,
+    walk_directories,
+)
+
+__all__ = [
+    "DEFAULT_SCAN_WORKERS",
+    "SEQ_EXTENSIONS",
+    "ParallelDirectoryWalker",
+    "ScanIndex",
+    "default_index_path",
+    "detect_sequences",
+    "iter_directory_listings",
+    "iter_incremental_scan",
+    "list_directory",
+    "sequences_in_directory",
+    "walk_directories",
+]
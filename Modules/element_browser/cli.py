@@ -0,0 +1,212 @@
+"""Command line front end: scan shot trees into manifests and import manifests into Resolve.
+
+    python -m element_browser scan /mnt/shows/abc /mnt/shows/xyz -o abc.json --processes 8
+    python -m element_browser import abc.json --timeline ABC_ingest
+    python -m element_browser import abc.json --timeline ABC --timeline-mode per_shot --dry-run
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .manifest import FORMAT_CSV, FORMAT_JSON, ManifestError, manifest_format, read_manifest, write_manifest
+from .media_import import (
+    DEFAULT_IMPORT_BATCH_SIZE,
+    FORM_PRINTF,
+    REIMPORT_POLICIES,
+    REIMPORT_SKIP,
+    ClipIndex,
+    MediaImporter,
+    switch_bin,
+)
+from .resolve_api import ResolveConnection, prepare_import
+from .scan import DEFAULT_SCAN_WORKERS, detect_sequences, list_directory
+from .sequences import sequence_import_item
+from .timeline import MODE_COMBINED, STAGE_IMPORT, TIMELINE_MODES, TimelineAssembly, clip_frames, timeline_groups
+
+DEFAULT_PROCESSES = min(8, os.cpu_count() or 1)
+DEFAULT_BIN_NAME = "Element Browser %Y-%m-%d"
+
+
+def log(message) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def scan_tasks(roots, max_depth=None, split=True):
+    """``(root, folder, max_depth)`` work units: each root, or each root's top level and its subfolders."""
+    tasks = []
+    for root in roots:
+        listing = list_directory(root) if split and max_depth != 0 else None
+        if listing is None:
+            tasks.append((root, root, max_depth))
+            continue
+        tasks.append((root, root, 0))
+        child_depth = None if max_depth is None else max_depth - 1
+        tasks.extend((root, subdir, child_depth) for subdir in sorted(listing[0]))
+    return tasks
+
+
+def _scan_task(task):
+    root, folder, max_depth, threads = task
+    records = list(detect_sequences(folder, max_depth=max_depth, workers=threads))
+    for record in records:
+        record["root"] = root
+    return records
+
+
+def scan_roots(roots, processes=DEFAULT_PROCESSES, threads=DEFAULT_SCAN_WORKERS, max_depth=None, split=True):
+    """Scan ``roots`` with a process pool and return their records sorted by folder and sequence."""
+    tasks = [task + (threads,) for task in scan_tasks(roots, max_depth, split)]
+    if processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_scan_task, tasks, chunksize=1))
+    else:
+        results = [_scan_task(task) for task in tasks]
+    records = [record for batch in results for record in batch]
+    records.sort(key=lambda record: (record["folder"], record["seq_key"]))
+    return records, len(tasks)
+
+
+def command_scan(args) -> int:
+    roots = [os.path.abspath(root) for root in args.roots]
+    invalid = [root for root in roots if not os.path.isdir(root)]
+    if invalid:
+        log("Not a folder: {}".format(", ".join(invalid)))
+        return 2
+
+    started = time.perf_counter()
+    records, task_count = scan_roots(roots, args.processes, args.threads, args.max_depth, not args.no_split)
+    fmt = manifest_format(args.output or "", args.format)
+    if args.output:
+        with open(args.output, "w", newline="" if fmt == FORMAT_CSV else None, encoding="utf-8") as handle:
+            write_manifest(handle, records, roots, fmt)
+    else:
+        write_manifest(sys.stdout, records, roots, fmt)
+    log("{} sequence(s) from {} root(s) in {} task(s), {:.2f}s".format(
+        len(records), len(roots), task_count, time.perf_counter() - started
+    ))
+    return 0
+
+
+def item_frames(item) -> int:
+    return sum(end - start + 1 for start, end in item.runs)
+
+
+def build_timelines(media_pool, project, entries, roots, args, import_seconds=0.0) -> list:
+    """Build ``--timeline`` from ``(folder, clips)`` entries and log each one.
+
+    With ``--dry-run`` the entries hold import items instead of clips and the
+    timelines are only planned, then printed as JSON lines.
+    """
+    length = item_frames if args.dry_run else clip_frames
+    assembly = TimelineAssembly(media_pool, project, dry_run=args.dry_run, length=length)
+    assembly.add_stage(STAGE_IMPORT, import_seconds)
+    plans = assembly.build(timeline_groups(entries, args.timeline, args.timeline_mode, roots))
+    for plan in plans:
+        if args.dry_run:
+            placed, _unplaced = plan.placements(length)
+            print(json.dumps({
+                "timeline": plan.name,
+                "clips": [{"sequence": item.name, "record_frame": plan.record_start + offset, "frames": frames}
+                          for item, offset, frames in placed],
+            }))
+        elif plan.timeline is None:
+            log("Timeline '{}' FAILED".format(plan.name))
+        else:
+            log("Timeline {}".format(plan.describe()))
+    if not args.dry_run:
+        log("Timeline stages: {}".format(assembly.describe_stages()))
+    return plans
+
+
+def command_import(args) -> int:
+    try:
+        records = read_manifest(args.manifest, args.format)
+    except (OSError, ManifestError) as exc:
+        log("Cannot read manifest: {}".format(exc))
+        return 2
+
+    pairs = [(record, item) for record, item in ((record, sequence_import_item(record)) for record in records) if item]
+    items = [item for _record, item in pairs]
+    folders = [record.get("folder") for record, _item in pairs]
+    roots = sorted({record["root"] for record in records if record.get("root")})
+    if args.dry_run:
+        for item in items:
+            print(json.dumps({"sequence": item.name, "style": list(item.style), "payload": item.payload(FORM_PRINTF)}))
+        log("{} of {} sequence(s) would be imported".format(len(items), len(records)))
+        if args.timeline:
+            build_timelines(None, None, [(folder, [item]) for folder, item in zip(folders, items)], roots, args)
+        return 0
+
+    connection = ResolveConnection()
+    media_pool = connection.media_pool()
+    if not media_pool:
+        log("Resolve project/media pool unavailable")
+        return 2
+
+    bin_name = time.strftime(args.bin)
+    clip_index = ClipIndex()
+    import_bin, _indexed = prepare_import(media_pool, clip_index, connection.project_key(), bin_name)
+    importer = MediaImporter(on_attempt=(lambda attempt: log(attempt.describe())) if args.verbose else None)
+    run = importer.start(media_pool, items, clip_index, args.reimport, args.batch_size)
+
+    started = time.perf_counter()
+    previous_bin = switch_bin(media_pool, import_bin)
+    try:
+        for _step in run.steps():
+            pass
+    finally:
+        switch_bin(media_pool, previous_bin)
+    import_seconds = time.perf_counter() - started
+    clips = run.clips()
+    log("Imported {} clip(s) for {} of {} sequence(s) into '{}' ({} already in the project) in {:.2f}s".format(
+        len(clips), run.done - len(run.failed()), run.total, bin_name, run.reused, import_seconds
+    ))
+    for item in run.failed():
+        log("Import FAILED for {}".format(item.name))
+
+    if args.timeline and clips:
+        entries = list(zip(folders, run.clips_by_item)) + [(None, run.unmatched)]
+        plans = build_timelines(media_pool, connection.project, entries, roots, args, import_seconds)
+        if not any(plan.timeline is not None for plan in plans):
+            log("Timeline creation failed")
+            return 1
+    return 1 if run.failed() else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="element_browser", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="scan shot roots into a sequence manifest")
+    scan.add_argument("roots", nargs="+")
+    scan.add_argument("-o", "--output", help="manifest path (default: stdout)")
+    scan.add_argument("--format", choices=[FORMAT_JSON, FORMAT_CSV], help="default: from the output extension, else JSON")
+    scan.add_argument("--processes", type=int, default=DEFAULT_PROCESSES, help="scan processes")
+    scan.add_argument("--threads", type=int, default=DEFAULT_SCAN_WORKERS, help="listing threads per process")
+    scan.add_argument("--max-depth", type=int, help="how deep to descend below each root")
+    scan.add_argument("--no-split", action="store_true", help="one task per root instead of one per top-level folder")
+    scan.set_defaults(func=command_scan)
+
+    imp = commands.add_parser("import", help="import a manifest's sequences into the current Resolve project")
+    imp.add_argument("manifest")
+    imp.add_argument("--format", choices=[FORMAT_JSON, FORMAT_CSV], help="default: from the file extension")
+    imp.add_argument("--bin", default=DEFAULT_BIN_NAME, help="bin to import into (strftime codes allowed)")
+    imp.add_argument("--timeline", help="also create a timeline with this name from the imported clips")
+    imp.add_argument("--timeline-mode", choices=TIMELINE_MODES, default=MODE_COMBINED,
+                     help="one timeline, or one per shot folder named after it")
+    imp.add_argument("--reimport", choices=REIMPORT_POLICIES, default=REIMPORT_SKIP,
+                     help="what to do with sequences already in the project")
+    imp.add_argument("--batch-size", type=int, default=DEFAULT_IMPORT_BATCH_SIZE, help="sequences per ImportMedia call")
+    imp.add_argument("--dry-run", action="store_true", help="print each sequence's payload as JSON lines instead of importing")
+    imp.add_argument("-v", "--verbose", action="store_true", help="log every ImportMedia call with its timing")
+    imp.set_defaults(func=command_import)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,187 @@
+"""Low-overhead timing for the panel's hot paths, kept in fixed-size ring buffers.
+
+Every channel keeps the last ``capacity`` samples of ``(start, duration,
+thread name, label)`` in preallocated slots, so recording is a lock and a few
+stores and memory never grows. :meth:`Diagnostics.summary` gives percentiles
+per channel and :meth:`Diagnostics.chrome_trace` exports every kept sample as
+Chrome trace events, viewable in ``chrome://tracing`` or Perfetto.
+"""
+
+import json
+import os
+import threading
+import time
+from array import array
+
+CHANNEL_SCAN_DIRECTORY = "scan.directory"
+CHANNEL_DECODE = "frame.decode"
+CHANNEL_SCALE = "frame.scale"
+CHANNEL_PLAYBACK_TICK = "playback.tick_late"
+CHANNEL_PLAYBACK_DROPPED = "playback.dropped"
+CHANNEL_IMPORT = "import.call"
+CHANNEL_TIMELINE = "timeline.create"
+CHANNEL_HEADER = "metadata.header"
+CHANNEL_FILTER = "filter.apply"
+DEFAULT_SAMPLES = 4096
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values, pct) -> float:
+    """Nearest-rank percentile of an ascending sequence; 0.0 when it is empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+class Channel:
+    """Ring buffer of timed samples for one hot path; safe to record from any thread."""
+
+    def __init__(self, name, capacity=DEFAULT_SAMPLES) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.starts = array("d", bytes(8 * capacity))
+        self.durations = array("d", bytes(8 * capacity))
+        self.threads = [None] * capacity
+        self.labels = [None] * capacity
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def record(self, start, duration, label=None) -> None:
+        """Add a sample; ``start`` and ``duration`` are ``time.perf_counter`` seconds."""
+        thread = threading.current_thread().name
+        with self._lock:
+            slot = self.recorded % self.capacity
+            self.starts[slot] = start
+            self.durations[slot] = duration
+            self.threads[slot] = thread
+            self.labels[slot] = label
+            self.recorded += 1
+
+    def span(self, label=None):
+        return _Span(self, label)
+
+    def __len__(self) -> int:
+        return min(self.recorded, self.capacity)
+
+    def samples(self) -> list[tuple]:
+        """Kept ``(start, duration, thread_name, label)`` samples, oldest first."""
+        with self._lock:
+            kept = min(self.recorded, self.capacity)
+            first = self.recorded - kept
+            slots = [(first + offset) % self.capacity for offset in range(kept)]
+            return [(self.starts[slot], self.durations[slot], self.threads[slot], self.labels[slot]) for slot in slots]
+
+    def summary(self) -> dict:
+        with self._lock:
+            kept = min(self.recorded, self.capacity)
+            durations = sorted(self.durations[:kept])
+            recorded = self.recorded
+        row = {"channel": self.name, "count": recorded, "kept": kept}
+        row["mean_ms"] = sum(durations) / kept * 1000.0 if kept else 0.0
+        for pct in PERCENTILES:
+            row["p{}_ms".format(pct)] = percentile(durations, pct) * 1000.0
+        row["max_ms"] = durations[-1] * 1000.0 if durations else 0.0
+        return row
+
+    def clear(self) -> None:
+        with self._lock:
+            self.recorded = 0
+            self.threads = [None] * self.capacity
+            self.labels = [None] * self.capacity
+
+
+class _Span:
+    __slots__ = ("channel", "label", "started")
+
+    def __init__(self, channel, label) -> None:
+        self.channel = channel
+        self.label = label
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        if self.channel is not None:
+            self.channel.record(self.started, time.perf_counter() - self.started, self.label)
+
+
+class Diagnostics:
+    """Named :class:`Channel` set. When disabled, recording costs one attribute check."""
+
+    def __init__(self, capacity=DEFAULT_SAMPLES, enabled=True) -> None:
+        self.capacity = capacity
+        self.enabled = enabled
+        self.channels: dict[str, Channel] = {}
+        self.origin = time.perf_counter()
+        self.origin_wall = time.time()
+        self._lock = threading.Lock()
+
+    def channel(self, name):
+        """The channel called ``name``, created on first use; ``None`` while disabled."""
+        if not self.enabled:
+            return None
+        channel = self.channels.get(name)
+        if channel is None:
+            with self._lock:
+                channel = self.channels.setdefault(name, Channel(name, self.capacity))
+        return channel
+
+    def record(self, name, start, duration, label=None) -> None:
+        if self.enabled:
+            self.channel(name).record(start, duration, label)
+
+    def span(self, name, label=None):
+        """Context manager timing its body into channel ``name``."""
+        return _Span(self.channel(name), label)
+
+    def summary(self) -> list[dict]:
+        return [self.channels[name].summary() for name in sorted(self.channels)]
+
+    def clear(self) -> None:
+        for channel in list(self.channels.values()):
+            channel.clear()
+
+    def chrome_trace(self) -> dict:
+        """Kept samples as Chrome trace ``X`` events, with thread names as metadata events."""
+        pid = os.getpid()
+        tids: dict[str, int] = {}
+        events = []
+        for name in sorted(self.channels):
+            for start, duration, thread, label in self.channels[name].samples():
+                tid = tids.setdefault(thread, len(tids) + 1)
+                event = {
+                    "name": label or name,
+                    "cat": name,
+                    "ph": "X",
+                    "ts": round((start - self.origin) * 1e6, 1),
+                    "dur": round(duration * 1e6, 1),
+                    "pid": pid,
+                    "tid": tid,
+                }
+                if label:
+                    event["args"] = {"channel": name}
+                events.append(event)
+        events.sort(key=lambda event: event["ts"])
+        for thread, tid in tids.items():
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": thread},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.origin_wall))},
+        }
+
+    def write_chrome_trace(self, path) -> int:
+        """Write :meth:`chrome_trace` to ``path`` and return the number of events."""
+        trace = self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(trace, handle)
+        return len(trace["traceEvents"])
@@ -0,0 +1,149 @@
+"""Persistent scan index used for instant start-up and incremental refresh."""
+
+import json
+import os
+import sqlite3
+import time
+
+from .scan import ParallelDirectoryWalker, list_directory, sequences_in_directory, walk_directories
+
+
+def user_cache_dir() -> str:
+    cache_root = (
+        os.environ.get("ELEMENT_BROWSER_CACHE")
+        or os.environ.get("LOCALAPPDATA")
+        or os.environ.get("XDG_CACHE_HOME")
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(cache_root, "ElementBrowser")
+
+
+def default_index_path() -> str:
+    return os.path.join(user_cache_dir(), "scan_index.sqlite3")
+
+
+def root_for(path, roots):
+    """The root in ``roots`` that ``path`` lies under (the deepest one if roots nest), or ``None``."""
+    best = None
+    for root in roots:
+        if (path == root or path.startswith(os.path.join(root, ""))) and (best is None or len(root) > len(best)):
+            best = root
+    return best
+
+
+class ScanIndex:
+    """Persistent per-directory scan results, keyed by scan root and directory path.
+
+    Each row stores the directory mtime together with its subdirectories and the
+    sequence records found in it, so an unchanged directory never has to be
+    listed again. Every call opens its own connection, which keeps the index
+    safe to use from both the GUI thread and a scan worker.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS dirs ("
+        " root TEXT NOT NULL,"
+        " path TEXT NOT NULL,"
+        " mtime_ns INTEGER NOT NULL,"
+        " subdirs TEXT NOT NULL,"
+        " records TEXT NOT NULL,"
+        " PRIMARY KEY (root, path))"
+    )
+
+    def __init__(self, db_path=None) -> None:
+        self.db_path = db_path or default_index_path()
+
+    # Bump when the record shape changes; older rows are dropped and rescanned.
+    RECORD_VERSION = 2
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != self.RECORD_VERSION:
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS dirs")
+                conn.execute(self.SCHEMA)
+                conn.execute("PRAGMA user_version = {}".format(self.RECORD_VERSION))
+        else:
+            conn.execute(self.SCHEMA)
+        return conn
+
+    def load(self, root) -> dict:
+        """Return ``{dirpath: (mtime_ns, subdirs, records)}`` for everything indexed under ``root``."""
+        try:
+            conn = self._connect()
+        except sqlite3.Error as exc:
+            print("[Shot Loader] Scan index unavailable: {}".format(exc))
+            return {}
+        try:
+            rows = conn.execute(
+                "SELECT path, mtime_ns, subdirs, records FROM dirs WHERE root = ?", (root,)
+            ).fetchall()
+        except sqlite3.Error as exc:
+            print("[Shot Loader] Scan index read error: {}".format(exc))
+            return {}
+        finally:
+            conn.close()
+        return {path: (mtime_ns, json.loads(subdirs), json.loads(records)) for path, mtime_ns, subdirs, records in rows}
+
+    def save(self, root, changed, removed=()) -> None:
+        """Upsert ``changed`` (same shape as :meth:`load`) and drop ``removed`` paths for ``root``."""
+        if not changed and not removed:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO dirs (root, path, mtime_ns, subdirs, records) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (root, path, mtime_ns, json.dumps(subdirs), json.dumps(records))
+                        for path, (mtime_ns, subdirs, records) in changed.items()
+                    ],
+                )
+                conn.executemany("DELETE FROM dirs WHERE root = ? AND path = ?", [(root, path) for path in removed])
+            conn.close()
+        except sqlite3.Error as exc:
+            print("[Shot Loader] Scan index write error: {}".format(exc))
+
+
+def iter_incremental_scan(folder, cached, should_stop=None, max_depth=None, workers=1, recorder=None):
+    """Walk ``folder`` like :func:`~element_browser.scan.iter_directory_listings`, reusing ``cached`` directories.
+
+    ``cached`` is a :meth:`ScanIndex.load` mapping. A directory whose mtime still
+    matches its cached entry costs one ``stat`` and is not listed or re-parsed.
+    Yields ``(dirpath, mtime_ns, subdirs, records, changed)`` for every
+    directory reached. ``recorder`` (a :class:`~element_browser.diagnostics.Channel`)
+    is given the time spent on each directory that had to be listed.
+    """
+
+    def timed_visit(dirpath):
+        started = time.perf_counter()
+        result = visit(dirpath)
+        if result is not None and result[1][3]:
+            recorder.record(started, time.perf_counter() - started, dirpath)
+        return result
+
+    def visit(dirpath):
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            return None
+
+        entry = cached.get(dirpath)
+        if entry and entry[0] == mtime_ns:
+            _mtime_ns, subdirs, records = entry
+            return subdirs, (mtime_ns, subdirs, records, False)
+
+        listing = list_directory(dirpath)
+        if listing is None:
+            return None
+        subdirs, names = listing
+        return subdirs, (mtime_ns, subdirs, sequences_in_directory(dirpath, names), True)
+
+    visitor = timed_visit if recorder is not None else visit
+    if workers > 1:
+        walk = ParallelDirectoryWalker(workers, max_depth).walk(folder, visitor, should_stop)
+    else:
+        walk = walk_directories(folder, visitor, should_stop, max_depth)
+    for dirpath, (mtime_ns, subdirs, records, changed) in walk:
+        yield dirpath, mtime_ns, subdirs, records, changed
@@ -0,0 +1,124 @@
+"""Sequence manifests: scan results written to JSON or CSV and read back for import.
+
+A manifest holds one scan record per sequence (the dicts produced by
+:func:`~element_browser.scan.sequences_in_directory`) plus the root it was
+found under. JSON keeps records as they are; CSV flattens ``frame_ranges``
+to ``1001-1020 1031-1040`` so it opens cleanly in a spreadsheet.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+
+MANIFEST_VERSION = 1
+FORMAT_JSON = "json"
+FORMAT_CSV = "csv"
+CSV_FIELDS = (
+    "root",
+    "folder",
+    "seq_key",
+    "first_file",
+    "frames",
+    "start_index",
+    "end_index",
+    "extension",
+    "pattern_printf",
+    "pattern_hash",
+    "frame_ranges",
+    "missing",
+)
+INT_FIELDS = ("frames", "start_index", "end_index", "missing")
+PRINTF_PADDING_RE = re.compile(r"%0?(\d*)d")
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def manifest_format(path, requested=None) -> str:
+    if requested:
+        return requested
+    return FORMAT_CSV if str(path).lower().endswith(".csv") else FORMAT_JSON
+
+
+def _format_ranges(runs) -> str:
+    return " ".join("{}-{}".format(start, end) for start, end in runs)
+
+
+def _parse_ranges(text) -> list[list[int]]:
+    runs = []
+    for token in text.split():
+        start, _sep, end = token.partition("-")
+        runs.append([int(start), int(end or start)])
+    return runs
+
+
+def write_manifest(handle, records, roots=(), fmt=FORMAT_JSON) -> None:
+    """Write ``records`` to an open text ``handle`` as JSON or CSV."""
+    records = list(records)
+    if fmt == FORMAT_CSV:
+        writer = csv.DictWriter(handle, fieldnames=CSV_FIELDS, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        for record in records:
+            row = dict(record)
+            row["frame_ranges"] = _format_ranges(record.get("frame_ranges") or [])
+            writer.writerow(row)
+        return
+    json.dump(
+        {
+            "version": MANIFEST_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "roots": list(roots),
+            "sequences": records,
+        },
+        handle,
+        indent=1,
+    )
+    handle.write("\n")
+
+
+def hash_pattern(pattern_printf) -> str:
+    """The ``#`` form of a printf frame pattern: ``%04d`` becomes ``####``."""
+    return PRINTF_PADDING_RE.sub(lambda match: "#" * (int(match.group(1)) if match.group(1) else 1), pattern_printf)
+
+
+def read_manifest(path, fmt=None) -> list[dict]:
+    """Return the sequence records in a JSON or CSV manifest."""
+    fmt = manifest_format(path, fmt)
+    with open(path, newline="" if fmt == FORMAT_CSV else None, encoding="utf-8") as handle:
+        if fmt == FORMAT_CSV:
+            records = []
+            for line, row in enumerate(csv.DictReader(handle), 2):
+                try:
+                    record = {key: row[key] for key in CSV_FIELDS if row.get(key) not in (None, "")}
+                    for key in INT_FIELDS:
+                        if key in record:
+                            record[key] = int(record[key])
+                    record["frame_ranges"] = _parse_ranges(row.get("frame_ranges") or "")
+                except (KeyError, ValueError) as exc:
+                    raise ManifestError("{}:{}: bad row ({})".format(path, line, exc)) from exc
+                records.append(record)
+        else:
+            try:
+                data = json.load(handle)
+            except ValueError as exc:
+                raise ManifestError("{}: not a JSON manifest ({})".format(path, exc)) from exc
+            if not isinstance(data, dict) or not isinstance(data.get("sequences"), list):
+                raise ManifestError("{}: no 'sequences' list".format(path))
+            if data.get("version", MANIFEST_VERSION) > MANIFEST_VERSION:
+                raise ManifestError("{}: manifest version {} is newer than this tool".format(path, data["version"]))
+            records = data["sequences"]
+
+    for record in records:
+        missing = [key for key in ("folder", "seq_key", "first_file", "pattern_printf") if not record.get(key)]
+        if missing:
+            raise ManifestError("{}: record without {}".format(path, ", ".join(missing)))
+        if not record.get("pattern_hash"):
+            record["pattern_hash"] = hash_pattern(record["pattern_printf"])
+        if not record.get("extension"):
+            record["extension"] = os.path.splitext(record["first_file"])[1].lower()
+        if not record.get("frame_ranges") and "start_index" in record and "end_index" in record:
+            record["frame_ranges"] = [[record["start_index"], record["end_index"]]]
+    return records
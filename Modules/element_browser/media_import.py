@@ -0,0 +1,509 @@
+"""Batched Media Pool imports.
+
+Resolve accepts several payload shapes for an image sequence and which one
+works depends on the Resolve version and the file type, so importing used to
+try every shape on every sequence. ``MediaImporter`` remembers the shape that
+worked for each extension and padding style, sends every sequence that shares
+it in one ``ImportMedia`` call, and only imports sequences one at a time when
+the batch did not bring them in.
+
+Imports land in a per-session bin, and a :class:`ClipIndex` maps each
+sequence's source to the clips already in the project, so new clips are found
+without listing the whole pool and sequences imported before can be reused.
+"""
+
+import os
+import re
+import time
+from collections import deque
+
+FORM_PRINTF = "printf"
+FORM_HASH = "hash"
+FORM_FIRST_FILE_LIST = "first_file_list"
+FORM_FIRST_FILE = "first_file"
+PAYLOAD_FORMS = (FORM_PRINTF, FORM_HASH, FORM_FIRST_FILE_LIST, FORM_FIRST_FILE)
+DEFAULT_IMPORT_LOG_SIZE = 500
+DEFAULT_IMPORT_BATCH_SIZE = 25
+# Rough cost of one indexed clip, for memory accounting: its unique id, its source key and the clip handle.
+CLIP_ENTRY_BYTES = 500
+
+REIMPORT_SKIP = "skip"
+REIMPORT_RELINK = "relink"
+REIMPORT_IMPORT = "import"
+REIMPORT_POLICIES = (REIMPORT_SKIP, REIMPORT_RELINK, REIMPORT_IMPORT)
+
+PRINTF_PADDING_RE = re.compile(r"%0?(\d*)d")
+# A frame token as it appears in a pattern or in a clip's File Path:
+# %04d, ####, [1001-1100] or the digits of a single frame.
+FRAME_TOKEN_RE = re.compile(r"(%0?\d*d|#+|\[\d+-\d+\]|\d+)(?=\.[^./]+$)")
+
+
+def source_key(path) -> str:
+    """Normalise a sequence pattern, frame path or clip ``File Path`` to one key per sequence."""
+    path = str(path).replace("\\", "/")
+    key = FRAME_TOKEN_RE.sub("#", path, count=1)
+    return key.lower() if os.name == "nt" else key
+
+
+class ImportItem:
+    """One sequence to import: its path patterns and the frame runs to bring in.
+
+    ``exact`` says the files on disk are exactly the runs, so the first-file
+    forms (where Resolve detects the sequence itself) are safe to use.
+    """
+
+    def __init__(self, name, pattern_printf, pattern_hash, first_file, runs, exact=True) -> None:
+        self.name = name
+        self.pattern_printf = pattern_printf
+        self.pattern_hash = pattern_hash
+        self.first_file = first_file
+        self.runs = [(int(start), int(end)) for start, end in runs]
+        self.exact = bool(exact) and len(self.runs) == 1
+
+        match = PRINTF_PADDING_RE.search(pattern_printf)
+        padding = int(match.group(1) or 1) if match else 1
+        self.style = (os.path.splitext(first_file)[1].lower(), "padded" if padding > 1 else "unpadded")
+        self.source_key = source_key(pattern_printf)
+
+    def entries(self, form):
+        """``ImportMedia`` list entries for ``form``, or ``None`` when the form does not apply."""
+        if form == FORM_PRINTF:
+            return [{"FilePath": self.pattern_printf, "StartIndex": s, "EndIndex": e} for s, e in self.runs]
+        if form == FORM_HASH:
+            return [{"FilePath": self.pattern_hash, "StartIndex": s, "EndIndex": e} for s, e in self.runs]
+        if form in (FORM_FIRST_FILE_LIST, FORM_FIRST_FILE) and self.exact:
+            return [self.first_file]
+        return None
+
+    def payload(self, form):
+        """The single-sequence payload for ``form``; ``first_file`` is a bare path."""
+        entries = self.entries(form)
+        if entries is not None and form == FORM_FIRST_FILE:
+            return entries[0]
+        return entries
+
+    def owns_clip_path(self, clip_path) -> bool:
+        """Whether a clip's ``File Path`` property points at this sequence."""
+        return bool(clip_path) and source_key(clip_path) == self.source_key
+
+
+class ImportAttempt:
+    """One ``ImportMedia`` call in the timing log."""
+
+    def __init__(
+        self, form, style, sequences, entries, clips, seconds, batch, error=None, call="ImportMedia", started=None
+    ) -> None:
+        self.call = call
+        self.started = started
+        self.form = form
+        self.style = style
+        self.sequences = sequences
+        self.entries = entries
+        self.clips = clips
+        self.seconds = seconds
+        self.batch = batch
+        self.error = error
+
+    def describe(self) -> str:
+        text = "{} {} {} x{} ({}): {} clip(s) in {:.1f} ms".format(
+            self.call,
+            "batch" if self.batch else "single",
+            self.form,
+            self.sequences,
+            " ".join(self.style),
+            self.clips,
+            self.seconds * 1000.0,
+        )
+        if self.error:
+            text += " error: {}".format(self.error)
+        return text
+
+
+def _clip_list(result) -> list:
+    if not result:
+        return []
+    if isinstance(result, (list, tuple)):
+        return [clip for clip in result if clip]
+    return [result]
+
+
+def _clip_uid(clip) -> str:
+    try:
+        uid = clip.GetUniqueId()
+        if uid is not None:
+            return str(uid)
+    except Exception:
+        pass
+    return str(id(clip))
+
+
+def _clip_path(clip) -> str:
+    try:
+        return str(clip.GetClipProperty("File Path") or "")
+    except Exception:
+        return ""
+
+
+def _current_folder(media_pool):
+    try:
+        return media_pool.GetCurrentFolder()
+    except Exception:
+        return None
+
+
+def _folder_clips(folder) -> list:
+    try:
+        return list(folder.GetClipList() or [])
+    except Exception:
+        return []
+
+
+def _subfolders(folder) -> list:
+    try:
+        return list(folder.GetSubFolderList() or [])
+    except Exception:
+        return []
+
+
+def ensure_bin(media_pool, name):
+    """Return the root-level bin called ``name``, creating it if needed (``None`` if that fails)."""
+    try:
+        root = media_pool.GetRootFolder()
+    except Exception:
+        return None
+    for folder in _subfolders(root):
+        try:
+            if folder.GetName() == name:
+                return folder
+        except Exception:
+            continue
+    try:
+        return media_pool.AddSubFolder(root, name) or None
+    except Exception:
+        return None
+
+
+def switch_bin(media_pool, folder):
+    """Make ``folder`` the bin imports go to and return the previous one (``None`` if unchanged)."""
+    if folder is None:
+        return None
+    previous = _current_folder(media_pool)
+    try:
+        media_pool.SetCurrentFolder(folder)
+    except Exception:
+        return None
+    return previous
+
+
+class ClipIndex:
+    """Source key to media pool clips for one project.
+
+    The first :meth:`attach` to a project walks every bin once; after that the
+    index is kept current from the clips imports return, so finding or reusing
+    a sequence's clips never lists the pool again. Clips deleted in Resolve
+    are dropped when a lookup finds them no longer answering.
+    """
+
+    def __init__(self) -> None:
+        self.attached = False
+        self.project_key = None
+        self._clips: dict = {}
+        self._ids: set = set()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def approx_bytes(self) -> int:
+        """Rough size of the index, for memory accounting."""
+        return CLIP_ENTRY_BYTES * len(self._ids)
+
+    def attach(self, media_pool, project_key) -> bool:
+        """Bind to ``project_key``, indexing its pool if it is not the project already indexed."""
+        if self.attached and project_key == self.project_key:
+            return False
+        self.attached = True
+        self.project_key = project_key
+        self._clips.clear()
+        self._ids.clear()
+        try:
+            folders = [media_pool.GetRootFolder()]
+        except Exception:
+            folders = []
+        while folders:
+            folder = folders.pop()
+            if folder is None:
+                continue
+            for clip in _folder_clips(folder):
+                self.add_clip(clip)
+            folders.extend(_subfolders(folder))
+        return True
+
+    def add_clip(self, clip) -> None:
+        path = _clip_path(clip)
+        if path:
+            self.add(source_key(path), [clip])
+
+    def add(self, key, clips) -> None:
+        for clip in clips:
+            uid = _clip_uid(clip)
+            if uid in self._ids:
+                continue
+            self._ids.add(uid)
+            self._clips.setdefault(key, []).append(clip)
+
+    def clips_for(self, key) -> list:
+        clips = self._clips.get(key)
+        if not clips:
+            return []
+        alive = [clip for clip in clips if _clip_path(clip)]
+        if len(alive) != len(clips):
+            for clip in clips:
+                if clip not in alive:
+                    self._ids.discard(_clip_uid(clip))
+            if alive:
+                self._clips[key] = alive
+            else:
+                del self._clips[key]
+        return list(alive)
+
+    def claim_from_folder(self, folder, items) -> list:
+        """Clips in ``folder`` (one bin, not recursive) not yet indexed, matched to ``items`` by source."""
+        wanted = {item.source_key: index for index, item in enumerate(items)}
+        found = [[] for _ in items]
+        if folder is None:
+            return found
+        for clip in _folder_clips(folder):
+            if _clip_uid(clip) in self._ids:
+                continue
+            index = wanted.get(source_key(_clip_path(clip)))
+            if index is not None:
+                found[index].append(clip)
+        return found
+
+
+class MediaImporter:
+    """Import sequences through a media pool with as few ``ImportMedia`` calls as possible.
+
+    Sequences are grouped by style (extension plus padded/unpadded frame
+    numbers). A style with no known form is learned by importing its
+    sequences alone, trying each form in ``PAYLOAD_FORMS`` order, until one
+    succeeds; the rest of the group then goes in batches of up to
+    ``batch_size`` sequences per call. Clips from a batch are matched to
+    sequences by position when Resolve returns one clip per entry, otherwise
+    by their ``File Path``; sequences left without a clip are retried one at a
+    time, starting with the learned form, unless the batch also returned clips
+    that could not be matched.
+
+    With a :class:`ClipIndex`, sequences already in the project are handled
+    by ``reimport`` instead: ``skip`` reuses their clips, ``relink`` points
+    those clips at the folder on disk first, and ``import`` brings them in
+    again.
+    """
+
+    def __init__(self, log_size=DEFAULT_IMPORT_LOG_SIZE, on_attempt=None) -> None:
+        self.learned: dict = {}
+        self.log: deque = deque(maxlen=log_size)
+        self.on_attempt = on_attempt
+
+    def forget(self) -> None:
+        self.learned.clear()
+
+    def start(self, media_pool, items, clip_index=None, reimport=REIMPORT_SKIP, batch_size=DEFAULT_IMPORT_BATCH_SIZE):
+        """Return an :class:`ImportRun` for ``items``; nothing is imported until its steps are run."""
+        return ImportRun(self, media_pool, items, clip_index, reimport, batch_size)
+
+    def import_items(self, media_pool, items, progress=None, clip_index=None, reimport=REIMPORT_SKIP):
+        """Import ``items`` and return ``(clips_by_item, unmatched_clips)``.
+
+        ``clips_by_item`` lines up with ``items``; ``unmatched_clips`` holds
+        clips a partial batch returned that could not be tied to a sequence.
+        ``progress(done, total)`` is called as sequences are settled.
+        """
+        run = self.start(media_pool, items, clip_index, reimport)
+        for _step in run.steps():
+            if progress:
+                progress(run.done, run.total)
+        return run.clips_by_item, run.unmatched
+
+    def _relink(self, media_pool, clips, item) -> bool:
+        folder = os.path.dirname(item.pattern_printf)
+        started = time.perf_counter()
+        try:
+            relinked = bool(media_pool.RelinkClips(clips, folder))
+            error = None
+        except Exception as exc:
+            relinked = False
+            error = str(exc) or type(exc).__name__
+        attempt = ImportAttempt(
+            REIMPORT_RELINK, item.style, 1, len(clips), len(clips) if relinked else 0,
+            time.perf_counter() - started, False, error, call="RelinkClips", started=started,
+        )
+        self.log.append(attempt)
+        if self.on_attempt:
+            self.on_attempt(attempt)
+        return relinked
+
+    def _call(self, media_pool, payload, form, style, sequences, entries, batch):
+        started = time.perf_counter()
+        error = None
+        try:
+            clips = _clip_list(media_pool.ImportMedia(payload))
+        except Exception as exc:
+            clips = []
+            error = str(exc) or type(exc).__name__
+        attempt = ImportAttempt(
+            form, style, sequences, entries, len(clips), time.perf_counter() - started, batch, error, started=started
+        )
+        self.log.append(attempt)
+        if self.on_attempt:
+            self.on_attempt(attempt)
+        return clips
+
+    def _import_single(self, media_pool, item) -> list:
+        learned = self.learned.get(item.style)
+        forms = [learned] if learned else []
+        forms += [form for form in PAYLOAD_FORMS if form != learned]
+        for form in forms:
+            payload = item.payload(form)
+            if payload is None:
+                continue
+            entries = len(payload) if isinstance(payload, list) else 1
+            clips = self._call(media_pool, payload, form, item.style, 1, entries, False)
+            if clips:
+                self.learned[item.style] = form
+                return clips
+        return []
+
+    def _import_batch(self, media_pool, form, style, items):
+        payload = []
+        spans = []
+        for item in items:
+            entries = item.entries(form)
+            spans.append(len(entries))
+            payload.extend(entries)
+        clips = self._call(media_pool, payload, form, style, len(items), len(payload), True)
+
+        if len(clips) == len(payload):
+            by_item = []
+            position = 0
+            for span in spans:
+                by_item.append(clips[position:position + span])
+                position += span
+            return by_item, []
+
+        by_item = [[] for _ in items]
+        unmatched = []
+        for clip in clips:
+            path = _clip_path(clip)
+            owner = next((i for i, item in enumerate(items) if path and item.owns_clip_path(path)), None)
+            if owner is None:
+                unmatched.append(clip)
+            else:
+                by_item[owner].append(clip)
+        return by_item, unmatched
+
+
+class ImportRun:
+    """One import, advanced a Resolve call at a time so a caller can slice, pause or stop it.
+
+    :meth:`steps` yields after every call into Resolve. Whatever has been
+    imported when the caller stops iterating stays in ``clips_by_item`` and
+    in the clip index, so a cancelled run still yields usable clips. Batches
+    hold at most ``batch_size`` sequences to keep each step short.
+    """
+
+    def __init__(self, importer, media_pool, items, clip_index=None, reimport=REIMPORT_SKIP,
+                 batch_size=DEFAULT_IMPORT_BATCH_SIZE) -> None:
+        self.importer = importer
+        self.media_pool = media_pool
+        self.items = list(items)
+        self.clip_index = clip_index
+        self.reimport = reimport
+        self.batch_size = max(1, int(batch_size))
+        self.clips_by_item = [[] for _ in self.items]
+        self.unmatched = []
+        self.settled = [False] * len(self.items)
+        self.done = 0
+        self.total = len(self.items)
+        self.reused = 0
+        self.relinked = 0
+        self.finished = False
+
+    def clips(self) -> list:
+        """Clips imported or reused so far, in item order, then any that matched no sequence."""
+        return [clip for clips in self.clips_by_item for clip in clips] + self.unmatched
+
+    def failed(self) -> list:
+        return [item for item, settled, clips in zip(self.items, self.settled, self.clips_by_item)
+                if settled and not clips]
+
+    def _settle(self, index, clips) -> None:
+        self.clips_by_item[index] = clips
+        if not self.settled[index]:
+            self.settled[index] = True
+            self.done += 1
+        if self.clip_index is not None and clips:
+            self.clip_index.add(self.items[index].source_key, clips)
+
+    def steps(self):
+        importer, media_pool, items = self.importer, self.media_pool, self.items
+
+        groups: dict = {}
+        for index, item in enumerate(items):
+            existing = self.clip_index.clips_for(item.source_key) if self.clip_index is not None else []
+            if existing and self.reimport != REIMPORT_IMPORT:
+                if self.reimport == REIMPORT_RELINK and importer._relink(media_pool, existing, item):
+                    self.relinked += 1
+                self._settle(index, existing)
+                self.reused += 1
+                if self.reimport == REIMPORT_RELINK:
+                    yield
+                continue
+            groups.setdefault(item.style, []).append(index)
+        if self.reused:
+            yield
+
+        for style, indexes in groups.items():
+            pending = list(indexes)
+            while pending and style not in importer.learned:
+                first = pending.pop(0)
+                self._settle(first, importer._import_single(media_pool, items[first]))
+                yield
+
+            form = importer.learned.get(style)
+            # A bare path is the one form that cannot share a list; it is only
+            # learned after the list form has failed for the same sequence.
+            batchable = []
+            if form and form != FORM_FIRST_FILE:
+                batchable = [i for i in pending if items[i].entries(form) is not None]
+            for offset in range(0, len(batchable), self.batch_size):
+                chunk = batchable[offset:offset + self.batch_size]
+                if len(chunk) < 2:
+                    break
+                clips, extra = importer._import_batch(media_pool, form, style, [items[i] for i in chunk])
+                self.unmatched.extend(extra)
+                if self.clip_index is not None:
+                    for clip in extra:
+                        self.clip_index.add_clip(clip)
+                for i, item_clips in zip(chunk, clips):
+                    # Clips that could not be matched may belong to any sequence
+                    # still without one; importing those again would duplicate them.
+                    if item_clips or extra:
+                        self._settle(i, item_clips)
+                yield
+
+            for i in pending:
+                if self.settled[i]:
+                    continue
+                self._settle(i, importer._import_single(media_pool, items[i]))
+                yield
+
+        missing = [i for i, clips in enumerate(self.clips_by_item) if not clips]
+        if self.clip_index is not None and missing and not self.unmatched:
+            # ImportMedia can report failure for media it did import; look in
+            # the bin it imports into rather than the whole pool.
+            found = self.clip_index.claim_from_folder(_current_folder(media_pool), [items[i] for i in missing])
+            for i, clips in zip(missing, found):
+                if clips:
+                    self._settle(i, clips)
+        self.finished = True
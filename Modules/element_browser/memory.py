@@ -0,0 +1,121 @@
+"""One memory budget across the panel's caches, and the process's resident size.
+
+Each cache bounds itself, but their limits are set separately and add up, and
+some holders (the sequence store, the pixmap on screen) are not caches at all.
+:class:`MemoryBudget` sums what every member reports and, when the total passes
+the budget, asks the evictable ones to give memory back, in the order they were
+registered, until it fits. Members without a trim callback are still counted:
+what they hold is room the caches do not get. :func:`process_rss` reads the
+resident set size for the status bar and the soak benchmark.
+"""
+
+import os
+import sys
+import threading
+
+DEFAULT_MEMORY_BUDGET_MB = 1536
+
+
+def process_rss() -> int:
+    """Resident set size of this process in bytes; 0 where it cannot be read.
+
+    macOS only exposes the peak through ``getrusage``, so there the value never
+    goes down.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", encoding="ascii") as handle:
+                return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return 0
+    if sys.platform == "win32":
+        return _windows_rss()
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is in bytes on macOS.
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _windows_rss() -> int:
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    try:
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return 0
+    except (AttributeError, OSError):
+        return 0
+    return int(counters.WorkingSetSize)
+
+
+class MemoryBudget:
+    """Byte budget shared by named members.
+
+    ``usage()`` callables must be cheap: they run on every :meth:`enforce`,
+    which caches call after each insertion. ``trim(nbytes)`` asks a member to
+    free at least ``nbytes`` (least recently used first) and returns what it
+    freed; it must not call back into the budget.
+    """
+
+    def __init__(self, budget_bytes) -> None:
+        self.budget_bytes = int(budget_bytes)
+        self.trimmed_bytes = 0
+        self._members: list[tuple] = []
+        self._lock = threading.Lock()
+
+    def register(self, name, usage, trim=None) -> None:
+        """Add a member; evictable ones are trimmed in the order they are registered."""
+        self._members.append((name, usage, trim))
+
+    def usage(self) -> dict[str, int]:
+        return {name: int(usage()) for name, usage, _trim in self._members}
+
+    def used_bytes(self) -> int:
+        return sum(int(usage()) for _name, usage, _trim in self._members)
+
+    def headroom(self) -> int:
+        """Bytes that can still be added before members get trimmed."""
+        return max(0, self.budget_bytes - self.used_bytes())
+
+    def enforce(self) -> int:
+        """Trim evictable members until the total fits the budget; return the bytes freed."""
+        with self._lock:
+            excess = self.used_bytes() - self.budget_bytes
+            freed = 0
+            for _name, _usage, trim in self._members:
+                if freed >= excess:
+                    break
+                if trim is not None:
+                    freed += int(trim(excess - freed))
+            self.trimmed_bytes += freed
+            return freed
+
+    def describe(self) -> str:
+        """``Memory 612/1536 MB``: the members' total against the budget."""
+        return "Memory {:.0f}/{:.0f} MB".format(self.used_bytes() / (1024 * 1024), self.budget_bytes / (1024 * 1024))
+
+    def breakdown(self) -> str:
+        """One ``name: N MB`` line per member, marking those :meth:`enforce` cannot trim."""
+        return "\n".join(
+            "{}: {:.1f} MB{}".format(name, int(usage()) / (1024 * 1024), "" if trim is not None else " (kept)")
+            for name, usage, trim in self._members
+        )
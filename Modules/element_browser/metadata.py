@@ -0,0 +1,524 @@
+"""Technical metadata read from image headers only: resolution, channels, bit depth and compression.
+
+EXR attributes come from :func:`~element_browser.exr.read_exr_header`, PNG from
+its ``IHDR`` chunk and JPEG from the first ``SOF`` marker, so a few kilobytes are
+read per file however large the frame is. :class:`HeaderCache` reads them on a
+small thread pool, keeps the results per file mtime and size, and stores them
+in the scan index database so they survive a restart; only the folders in use
+are loaded back.
+"""
+
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from .exr import COMPRESSION_NAMES, PIXEL_BYTES, PIXEL_TYPES, ExrError, read_exr_header
+from .index import default_index_path
+
+FORMAT_EXR = "exr"
+FORMAT_PNG = "png"
+FORMAT_JPEG = "jpeg"
+HEADER_FORMATS = {".exr": FORMAT_EXR, ".png": FORMAT_PNG, ".jpg": FORMAT_JPEG, ".jpeg": FORMAT_JPEG}
+DEFAULT_HEADER_WORKERS = 4
+DEFAULT_HEADER_CACHE_ENTRIES = 20000
+# Rough cost of one entry held in memory, for memory accounting: its path, stat pair and parsed metadata.
+HEADER_ENTRY_BYTES = 1300
+# A folder held in memory, rows or not; it takes one of ``max_entries`` too, so empty folders are capped.
+HEADER_FOLDER_BYTES = 300
+# Seconds close() waits for each reader thread; one stuck on an unreachable share is left behind.
+CLOSE_WAIT = 2.0
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHANNELS = {0: ["Y"], 2: ["R", "G", "B"], 3: ["P"], 4: ["Y", "A"], 6: ["R", "G", "B", "A"]}
+JPEG_CHANNELS = {1: ["Y"], 3: ["Y", "Cb", "Cr"], 4: ["C", "M", "Y", "K"]}
+# SOF markers 0xC0-0xCF, less DHT (C4), JPG (C8) and DAC (CC), which share the range.
+JPEG_SOF_NAMES = {
+    0xC0: "baseline",
+    0xC1: "extended",
+    0xC2: "progressive",
+    0xC3: "lossless",
+    0xC5: "differential",
+    0xC6: "differential progressive",
+    0xC7: "differential lossless",
+    0xC9: "arithmetic",
+    0xCA: "arithmetic progressive",
+    0xCB: "arithmetic lossless",
+    0xCD: "arithmetic differential",
+    0xCE: "arithmetic differential progressive",
+    0xCF: "arithmetic differential lossless",
+}
+JPEG_STANDALONE = {0x01} | set(range(0xD0, 0xD8))
+JPEG_SCAN_LIMIT = 1024 * 1024
+
+
+class MetadataError(Exception):
+    pass
+
+
+def _metadata(fmt, width, height, channels, bit_depth, sample, compression) -> dict:
+    return {
+        "format": fmt,
+        "width": width,
+        "height": height,
+        "channels": channels,
+        "bit_depth": bit_depth,
+        "sample": sample,
+        "compression": compression,
+    }
+
+
+def read_exr_metadata(path) -> dict:
+    try:
+        header = read_exr_header(path)
+    except ExrError as exc:
+        raise MetadataError(str(exc)) from exc
+    attributes = header["attributes"]
+    channels = attributes.get("channels") or []
+    if not channels or "dataWindow" not in attributes:
+        raise MetadataError("OpenEXR header without channels or dataWindow")
+    x_min, y_min, x_max, y_max = attributes.get("displayWindow") or attributes["dataWindow"]
+    types = sorted({channel["type"] for channel in channels})
+    metadata = _metadata(
+        FORMAT_EXR,
+        x_max - x_min + 1,
+        y_max - y_min + 1,
+        [channel["name"] for channel in channels],
+        max(PIXEL_BYTES.get(pixel_type, 0) for pixel_type in types) * 8,
+        "/".join(PIXEL_TYPES.get(pixel_type, str(pixel_type)) for pixel_type in types),
+        COMPRESSION_NAMES.get(attributes.get("compression"), str(attributes.get("compression"))),
+    )
+    if attributes.get("dataWindow") != attributes.get("displayWindow"):
+        metadata["data_window"] = list(attributes["dataWindow"])
+    if header["tiled"]:
+        metadata["tiled"] = True
+    if header["multipart"]:
+        metadata["multipart"] = True
+    aspect = attributes.get("pixelAspectRatio")
+    if aspect and abs(aspect - 1.0) > 1e-6:
+        metadata["pixel_aspect"] = round(aspect, 6)
+    return metadata
+
+
+def read_png_metadata(path) -> dict:
+    with open(path, "rb") as handle:
+        data = handle.read(33)
+    if len(data) < 33 or not data.startswith(PNG_SIGNATURE) or data[12:16] != b"IHDR":
+        raise MetadataError("not a PNG file")
+    width, height, bit_depth, color_type, _compression, _filter, interlace = struct.unpack(">IIBBBBB", data[16:29])
+    if color_type not in PNG_CHANNELS:
+        raise MetadataError("unknown PNG colour type {}".format(color_type))
+    compression = "deflate, interlaced" if interlace else "deflate"
+    return _metadata(FORMAT_PNG, width, height, PNG_CHANNELS[color_type], bit_depth, "uint", compression)
+
+
+def read_jpeg_metadata(path) -> dict:
+    """Walk the JPEG marker segments up to the first ``SOF``, seeking over everything else."""
+    with open(path, "rb") as handle:
+        if handle.read(2) != b"\xff\xd8":
+            raise MetadataError("not a JPEG file")
+        while handle.tell() < JPEG_SCAN_LIMIT:
+            byte = handle.read(1)
+            if not byte:
+                break
+            if byte != b"\xff":
+                continue
+            marker = handle.read(1)
+            while marker == b"\xff":
+                marker = handle.read(1)
+            if not marker:
+                break
+            code = marker[0]
+            if code in JPEG_STANDALONE or code == 0x00:
+                continue
+            if code in (0xD9, 0xDA):
+                break
+            length_bytes = handle.read(2)
+            if len(length_bytes) < 2:
+                break
+            (length,) = struct.unpack(">H", length_bytes)
+            if code in JPEG_SOF_NAMES:
+                segment = handle.read(6)
+                if len(segment) < 6:
+                    break
+                precision, height, width, components = struct.unpack(">BHHB", segment)
+                channels = JPEG_CHANNELS.get(components, ["C{}".format(index) for index in range(components)])
+                return _metadata(FORMAT_JPEG, width, height, channels, precision, "uint", JPEG_SOF_NAMES[code])
+            handle.seek(length - 2, os.SEEK_CUR)
+    raise MetadataError("no JPEG frame header found")
+
+
+READERS = {FORMAT_EXR: read_exr_metadata, FORMAT_PNG: read_png_metadata, FORMAT_JPEG: read_jpeg_metadata}
+
+
+def header_format(path):
+    """The header format for ``path``'s extension, or ``None`` if no reader handles it."""
+    return HEADER_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def read_image_metadata(path) -> dict:
+    """Read ``path``'s header and return its metadata dict.
+
+    Keys are ``format``, ``width``, ``height`` (the display window for EXR),
+    ``channels`` (names), ``bit_depth`` (bits per channel, the widest for
+    mixed EXR channels), ``sample`` (``uint``, ``half`` or ``float``) and
+    ``compression``. EXR may add ``data_window``, ``tiled``, ``multipart`` and
+    ``pixel_aspect``. Raises :class:`MetadataError` for unsupported or
+    malformed files and ``OSError`` if the file cannot be read.
+    """
+    fmt = header_format(path)
+    if fmt is None:
+        raise MetadataError("no header reader for {}".format(os.path.splitext(path)[1] or path))
+    try:
+        return READERS[fmt](path)
+    except (struct.error, IndexError, ValueError) as exc:
+        raise MetadataError("malformed {} header: {}".format(fmt, exc)) from exc
+
+
+def describe_metadata(metadata) -> list[tuple[str, str]]:
+    """``(label, value)`` pairs for showing ``metadata``; an empty dict means the header was unreadable."""
+    if not metadata:
+        return [("Image", "header unreadable")]
+    rows = [
+        ("Image", "{} x {}".format(metadata["width"], metadata["height"])),
+        ("Channels", "{} ({})".format(len(metadata["channels"]), ", ".join(metadata["channels"]))),
+        ("Depth", "{}-bit {}".format(metadata["bit_depth"], metadata["sample"])),
+        ("Compress", metadata["compression"]),
+    ]
+    if metadata.get("data_window"):
+        rows.append(("Data win", "({}, {}) - ({}, {})".format(*metadata["data_window"])))
+    if metadata.get("pixel_aspect"):
+        rows.append(("Aspect", "{:g}".format(metadata["pixel_aspect"])))
+    layout = [flag for flag in ("tiled", "multipart") if metadata.get(flag)]
+    if layout:
+        rows.append(("Layout", ", ".join(layout)))
+    return rows
+
+
+class HeaderCache:
+    """Header metadata per file, validated against mtime and size and read in the background.
+
+    Entries are written to a ``headers`` table in the scan index database and
+    loaded a folder at a time on the reader threads, the first time a file in
+    that folder is read or preloaded; :meth:`peek`, which the GUI thread calls
+    for every row it paints or sorts, only looks in memory. The database is
+    never queried or written with ``_lock`` held. At most ``max_entries``
+    entries and folders stay in memory, least recently used folders dropping
+    out first, and :meth:`trim` drops more for a memory budget.
+    :meth:`request` replaces the pending work, so a caller that asks for the
+    rows on screen every time the view scrolls never has rows it scrolled past
+    read ahead of the ones now visible. Unreadable files are cached as ``{}``
+    and retried only once they change; files that are gone are deleted from
+    the table, and the rest of their folder is checked once per session.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS headers ("
+        " path TEXT PRIMARY KEY,"
+        " mtime_ns INTEGER NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " metadata TEXT NOT NULL)"
+    )
+
+    def __init__(
+        self, db_path=None, workers=DEFAULT_HEADER_WORKERS, recorder=None, max_entries=DEFAULT_HEADER_CACHE_ENTRIES
+    ) -> None:
+        self.db_path = db_path or default_index_path()
+        self.recorder = recorder
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._folders: OrderedDict[str, dict[str, tuple]] = OrderedDict()
+        self._entry_count = 0
+        # Path to entry, or ``None`` for a row to delete.
+        self._unsaved: dict[str, tuple | None] = {}
+        self._pruned: set[str] = set()
+        self._reported: set[str] = set()
+        self._pending: list[str] = []
+        self._callback = None
+        self._preload = None
+        self._busy = 0
+        self._closed = False
+        # Serializes use of the connection; taken before ``_lock`` when both are needed.
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self._open()
+        self._workers = [
+            threading.Thread(target=self._work, name="header-reader-{}".format(index), daemon=True)
+            for index in range(max(1, int(workers)))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _open(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            self._conn.execute(self.SCHEMA)
+        except (OSError, sqlite3.Error) as exc:
+            print("[Shot Loader] Header cache unavailable: {}".format(exc))
+            self._conn = None
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    def approx_bytes(self) -> int:
+        """Rough size of the entries in memory, including those not flushed yet, for memory accounting."""
+        return HEADER_ENTRY_BYTES * (self._entry_count + len(self._unsaved)) + HEADER_FOLDER_BYTES * len(self._folders)
+
+    def trim(self, nbytes) -> int:
+        """Drop least recently used folders until about ``nbytes`` are freed; return the bytes freed.
+
+        A dropped folder is loaded from the database again the next time one of
+        its files is asked for; entries not flushed yet are merged back then.
+        """
+        freed = 0
+        with self._lock:
+            while freed < nbytes and self._folders:
+                evicted, dropped = self._folders.popitem(last=False)
+                self._entry_count -= len(dropped)
+                self._pruned.discard(evicted)
+                freed += HEADER_ENTRY_BYTES * len(dropped) + HEADER_FOLDER_BYTES
+        return freed
+
+    def _folder(self, path) -> dict:
+        """The entries of ``path``'s folder, loading them from the database first if they are not in memory.
+
+        Call without ``_lock``: the query runs outside it, so :meth:`peek` on
+        the GUI thread never waits on the database.
+        """
+        folder = os.path.dirname(path)
+        with self._lock:
+            entries = self._folders.get(folder)
+            if entries is not None:
+                self._folders.move_to_end(folder)
+                return entries
+        with self._db_lock:
+            rows = self._select(folder)
+            # Still under ``_db_lock``, so a flush cannot take entries out of
+            # ``_unsaved`` between the query and the merge.
+            with self._lock:
+                entries = self._folders.get(folder)
+                if entries is not None:
+                    self._folders.move_to_end(folder)
+                    return entries
+                entries = self._merge(folder, rows)
+                self._folders[folder] = entries
+                self._entry_count += len(entries)
+                self._evict()
+                return entries
+
+    def _evict(self) -> None:
+        """Drop least recently used folders until ``max_entries`` fit, keeping the newest. Call with ``_lock`` held."""
+        while self._entry_count + len(self._folders) > self.max_entries and len(self._folders) > 1:
+            evicted, dropped = self._folders.popitem(last=False)
+            self._entry_count -= len(dropped)
+            self._pruned.discard(evicted)
+
+    def _select(self, folder) -> list:
+        """The database rows of ``folder``'s files. Call with ``_db_lock`` held."""
+        if self._conn is None:
+            return []
+        try:
+            # A range over the primary key: the folder's files sort right after it, whatever the separator.
+            return self._conn.execute(
+                "SELECT path, mtime_ns, size, metadata FROM headers WHERE path > ? AND path < ?",
+                (folder, folder + "\U0010ffff"),
+            ).fetchall()
+        except sqlite3.Error as exc:
+            print("[Shot Loader] Header cache read error: {}".format(exc))
+            return []
+
+    def _merge(self, folder, rows) -> dict:
+        """``rows`` of ``folder`` with the entries not flushed yet applied. Call with ``_lock`` held."""
+        entries: dict[str, tuple] = {}
+        for path, mtime_ns, size, metadata in rows:
+            if os.path.dirname(path) != folder:
+                continue
+            try:
+                entries[path] = (mtime_ns, size, json.loads(metadata))
+            except ValueError:
+                continue
+        for path, entry in self._unsaved.items():
+            if os.path.dirname(path) == folder:
+                if entry is None:
+                    entries.pop(path, None)
+                else:
+                    entries[path] = entry
+        return entries
+
+    def peek(self, path):
+        """The last metadata read for ``path`` if its folder is in memory, else ``None``. No file or database access."""
+        with self._lock:
+            entries = self._folders.get(os.path.dirname(path))
+            entry = entries.get(path) if entries is not None else None
+        return entry[2] if entry is not None else None
+
+    def forget(self, path) -> None:
+        """Drop ``path`` from memory and, at the next flush, from the database."""
+        with self._lock:
+            entries = self._folders.get(os.path.dirname(path))
+            if entries is not None and entries.pop(path, None) is not None:
+                self._entry_count -= 1
+            self._unsaved[path] = None
+
+    def read(self, path):
+        """Metadata for ``path`` at its current mtime, reading the header only if the cache is stale.
+
+        Returns ``None`` when the file cannot be stat'ed; a file that is gone
+        is forgotten.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.forget(path)
+            return None
+        except OSError:
+            return None
+        folder = os.path.dirname(path)
+        entries = self._folder(path)
+        with self._lock:
+            entry = entries.get(path)
+            siblings = [] if folder in self._pruned else [other for other in entries if other != path]
+            self._pruned.add(folder)
+        for other in siblings:
+            if not os.path.exists(other):
+                self.forget(other)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        started = time.perf_counter()
+        try:
+            metadata = read_image_metadata(path)
+        except (OSError, MetadataError) as exc:
+            self._report(path, "Header read failed for {}: {}".format(path, exc))
+            metadata = {}
+        if self.recorder is not None:
+            self.recorder.record(started, time.perf_counter() - started, os.path.basename(path))
+        entry = (stat.st_mtime_ns, stat.st_size, metadata)
+        with self._lock:
+            self._unsaved[path] = entry
+            # A folder dropped meanwhile picks the entry up from ``_unsaved`` when loaded again.
+            entries = self._folders.get(folder)
+            if entries is not None:
+                if path not in entries:
+                    self._entry_count += 1
+                entries[path] = entry
+                self._evict()
+        return metadata
+
+    def _report(self, path, message) -> None:
+        """Print ``message`` for the first failure in ``path``'s folder only, not once per frame of a bad render."""
+        folder = os.path.dirname(path)
+        with self._lock:
+            if folder in self._reported:
+                return
+            self._reported.add(folder)
+        print("[Shot Loader] {} (further header errors in this folder are not logged)".format(message))
+
+    def request(self, paths, callback) -> None:
+        """Read ``paths`` in order in the background, dropping whatever was still pending.
+
+        ``callback(path, metadata)`` runs on a worker thread for every path read.
+        """
+        with self._lock:
+            self._pending = [path for path in reversed(list(dict.fromkeys(paths))) if header_format(path)]
+            self._callback = callback
+            self._wake.notify_all()
+
+    def preload(self, paths, callback) -> None:
+        """Load the folders of ``paths`` from the database in the background, reading no file.
+
+        ``callback(found)`` then runs on a worker thread with ``{path: metadata}``
+        for every path with a cached entry, current or not. Replaces a preload
+        not started yet; reads asked for with :meth:`request` go first.
+        """
+        with self._lock:
+            self._preload = (list(dict.fromkeys(paths)), callback)
+            self._wake.notify_all()
+
+    def _run_preload(self, paths, callback) -> None:
+        found = {}
+        try:
+            for path in paths:
+                entries = self._folder(path)
+                with self._lock:
+                    entry = entries.get(path)
+                if entry is not None:
+                    found[path] = entry[2]
+        except Exception as exc:
+            print("[Shot Loader] Header preload error: {}".format(exc))
+        callback(found)
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and self._preload is None and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                if not self._pending:
+                    preload, self._preload = self._preload, None
+                else:
+                    preload = None
+                    path = self._pending.pop()
+                    callback = self._callback
+                    self._busy += 1
+            if preload is not None:
+                self._run_preload(*preload)
+                continue
+            try:
+                metadata = self.read(path)
+            except Exception as exc:
+                self._report(path, "Header read error for {}: {}".format(path, exc))
+                metadata = None
+            with self._lock:
+                self._busy -= 1
+                idle = not self._pending and not self._busy
+            if metadata is not None and callback is not None:
+                callback(path, metadata)
+            if idle:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write entries read, and delete those forgotten, since the last flush in one transaction.
+
+        Only ``_db_lock`` is held while writing; readers and :meth:`peek` carry on.
+        """
+        with self._db_lock:
+            with self._lock:
+                unsaved, self._unsaved = self._unsaved, {}
+            if not unsaved or self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO headers (path, mtime_ns, size, metadata) VALUES (?, ?, ?, ?)",
+                        [
+                            (path, entry[0], entry[1], json.dumps(entry[2]))
+                            for path, entry in unsaved.items()
+                            if entry is not None
+                        ],
+                    )
+                    self._conn.executemany(
+                        "DELETE FROM headers WHERE path = ?",
+                        [(path,) for path, entry in unsaved.items() if entry is None],
+                    )
+            except sqlite3.Error as exc:
+                print("[Shot Loader] Header cache write error: {}".format(exc))
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._pending = []
+            self._preload = None
+            self._wake.notify_all()
+        for worker in self._workers:
+            worker.join(CLOSE_WAIT)
+        self.flush()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
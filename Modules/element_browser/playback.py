@@ -0,0 +1,341 @@
+"""Read-ahead frame decoding and the playback clock for the in-panel sequence player.
+
+The decoder is toolkit-agnostic: the panel hands in a ``decode(path, size)``
+callable that returns a thread-safe image object (``QImage``) fitted to
+``size`` and a ``size_of(image)`` callable used to keep the cache inside its
+byte budget. The clock only does
+arithmetic on a monotonic time source; the panel's timer asks it when to wake.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import MutableSequence, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+DEFAULT_CACHE_MB = 1024
+DEFAULT_READ_AHEAD = 48
+DEFAULT_DECODE_WORKERS = 3
+MODE_REALTIME = "realtime"
+MODE_EVERY_FRAME = "every_frame"
+PLAYBACK_MODES = (MODE_REALTIME, MODE_EVERY_FRAME)
+NTSC_BASE_RATES = (24, 30, 48, 60, 120)
+ACHIEVED_FPS_WINDOW = 1.0
+
+
+class FrameCache:
+    """Thread-safe LRU of decoded frames bounded by total size in bytes.
+
+    With a ``pool`` (a :class:`~element_browser.memory.MemoryBudget` the
+    cache is registered in) every insertion also enforces the shared budget,
+    which may trim this cache or others below their own limits.
+    """
+
+    def __init__(self, budget_bytes, size_of, pool=None) -> None:
+        self.budget_bytes = int(budget_bytes)
+        self.size_of = size_of
+        self.pool = pool
+        self.used_bytes = 0
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value) -> None:
+        nbytes = int(self.size_of(value))
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.used_bytes -= previous[1]
+            self._items[key] = (value, nbytes)
+            self.used_bytes += nbytes
+            while self.used_bytes > self.budget_bytes and len(self._items) > 1:
+                _key, (_value, evicted) = self._items.popitem(last=False)
+                self.used_bytes -= evicted
+        if self.pool is not None:
+            self.pool.enforce()
+
+    def trim(self, nbytes) -> int:
+        """Evict least recently used entries until ``nbytes`` are freed or none are left; return the bytes freed."""
+        freed = 0
+        with self._lock:
+            while freed < nbytes and self._items:
+                _key, (_value, evicted) = self._items.popitem(last=False)
+                self.used_bytes -= evicted
+                freed += evicted
+        return freed
+
+    def limit_bytes(self) -> int:
+        """What the cache can grow to: its own budget, or less when the shared pool is nearly full."""
+        if self.pool is None:
+            return self.budget_bytes
+        return min(self.budget_bytes, self.used_bytes + self.pool.headroom())
+
+    def average_bytes(self) -> int:
+        with self._lock:
+            return self.used_bytes // len(self._items) if self._items else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.used_bytes = 0
+
+
+class ReadAheadDecoder:
+    """Decodes the frames just ahead of the playhead on a small thread pool.
+
+    :meth:`prefetch` is called whenever the playhead moves (tick, scrub or
+    seek); it cancels queued decodes that fell out of the new window and queues
+    the missing frames nearest-first. The window is capped so it never needs
+    more than the cache can hold, otherwise read-ahead would evict itself.
+
+    Frames are decoded for one display ``size`` at a time and cached under
+    ``(path, size)``: after :meth:`set_size` the window is decoded again at the
+    new size, while frames decoded for earlier sizes stay cached until evicted.
+    """
+
+    def __init__(self, decode, cache, workers=DEFAULT_DECODE_WORKERS, read_ahead=DEFAULT_READ_AHEAD) -> None:
+        self.decode = decode
+        self.cache: FrameCache = cache
+        self.read_ahead = max(1, int(read_ahead))
+        self.workers = max(1, int(workers))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="frame-decode")
+        self._lock = threading.Lock()
+        self._frames = []
+        self._pending: dict = {}
+        self._failed: set[int] = set()
+        self._generation = 0
+        self.size = None
+
+    def set_frames(self, frame_paths) -> None:
+        with self._lock:
+            self._generation += 1
+            for future in self._pending.values():
+                future.cancel()
+            self._pending = {}
+            self._failed = set()
+            # Immutable sequences such as FramePaths are kept as they are, so paths stay lazy.
+            immutable = isinstance(frame_paths, Sequence) and not isinstance(frame_paths, MutableSequence)
+            self._frames = frame_paths if immutable else list(frame_paths)
+
+    def set_size(self, size) -> None:
+        """Decode for display ``size`` from now on, dropping queued decodes for the old one."""
+        with self._lock:
+            if size == self.size:
+                return
+            self._generation += 1
+            for future in self._pending.values():
+                future.cancel()
+            self._pending = {}
+            self._failed = set()
+            self.size = size
+
+    def key(self, index):
+        return self._frames[index], self.size
+
+    def window_size(self) -> int:
+        average = self.cache.average_bytes()
+        if not average:
+            # Frame size unknown until something is decoded; start small so a
+            # tight budget is not overrun by the very first prefetch.
+            return min(self.read_ahead, self.workers)
+        return max(1, min(self.read_ahead, self.cache.limit_bytes() // average - 1))
+
+    def window(self, index, loop=True) -> list[int]:
+        count = len(self._frames)
+        if not count:
+            return []
+        size = min(self.window_size(), count)
+        if loop:
+            return [(index + offset) % count for offset in range(size)]
+        return list(range(index, min(count, index + size)))
+
+    def prefetch(self, index, loop=True) -> None:
+        with self._lock:
+            generation = self._generation
+            window = self.window(index, loop)
+            wanted = set(window)
+            for frame_index, future in list(self._pending.items()):
+                if frame_index not in wanted and future.cancel():
+                    del self._pending[frame_index]
+            for frame_index in window:
+                if frame_index in self._pending or frame_index in self._failed:
+                    continue
+                key = self.key(frame_index)
+                if key in self.cache:
+                    continue
+                self._pending[frame_index] = self._executor.submit(self._decode_into_cache, generation, frame_index, key)
+
+    def _decode_into_cache(self, generation, frame_index, key) -> None:
+        path, size = key
+        try:
+            image = self.decode(path, size)
+        except Exception as exc:
+            print("[Shot Loader] Decode error for {}: {}".format(path, exc))
+            image = None
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pending.pop(frame_index, None)
+            if image is None:
+                self._failed.add(frame_index)
+        if image is not None:
+            self.cache.put(key, image)
+
+    def failed(self, index) -> bool:
+        """True if ``index`` could not be decoded; the player skips such frames instead of waiting on them."""
+        return index in self._failed
+
+    def frame(self, index):
+        """Return the decoded frame at ``index`` if it is buffered, else ``None``."""
+        if not 0 <= index < len(self._frames):
+            return None
+        return self.cache.get(self.key(index))
+
+    def decode_now(self, index):
+        """Decode ``index`` on the calling thread (used for seeks), caching the result."""
+        if not 0 <= index < len(self._frames):
+            return None
+        key = self.key(index)
+        image = self.cache.get(key)
+        if image is None:
+            image = self.decode(*key)
+            if image is not None:
+                self.cache.put(key, image)
+        return image
+
+    def buffered_ahead(self, index, loop=True) -> tuple[int, int]:
+        """Return ``(decoded, window)``: how many of the next window frames are ready, counted from ``index``."""
+        window = self.window(index, loop)
+        ready = 0
+        for frame_index in window:
+            if self.key(frame_index) not in self.cache:
+                break
+            ready += 1
+        return ready, len(window)
+
+    def shutdown(self) -> None:
+        """Drop the queued decodes and wait for those already running, so no worker outlives its owner."""
+        self.set_frames([])
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def exact_rate(fps) -> Fraction:
+    """``fps`` as an exact fraction; NTSC labels such as 23.976 or 29.97 map to 24000/1001 and 30000/1001."""
+    value = float(fps)
+    if value <= 0:
+        raise ValueError("frame rate must be positive: {!r}".format(fps))
+    for base in NTSC_BASE_RATES:
+        ntsc = Fraction(base * 1000, 1001)
+        if abs(value - float(ntsc)) < 0.0015:
+            return ntsc
+    return Fraction(value).limit_denominator(1001)
+
+
+class PlaybackClock:
+    """Maps a monotonic clock onto frame positions at an exact frame rate.
+
+    Positions count frames from where playback was anchored and are not
+    wrapped; the caller maps them onto its frame list. In ``realtime`` mode the
+    target is whatever frame is due now, so a slow decode skips frames instead
+    of slowing the clip down. In ``every_frame`` mode each frame is shown in
+    turn and a late frame re-anchors the clock, so the clip slows down instead.
+    """
+
+    def __init__(self, fps=24, mode=MODE_REALTIME, now=time.perf_counter) -> None:
+        self.now = now
+        self.rate = exact_rate(fps)
+        self.mode = mode if mode in PLAYBACK_MODES else MODE_REALTIME
+        self.origin_time = 0.0
+        self.origin_position = 0
+        self.position = 0
+        self.skipped = 0
+        self._shown: deque = deque()
+
+    @property
+    def fps(self) -> float:
+        return float(self.rate)
+
+    def start(self, position, now=None) -> None:
+        """Anchor ``position`` (already on screen) at ``now``, e.g. on play, resume or seek."""
+        now = self.now() if now is None else now
+        self._anchor(position, now)
+        self.position = position
+        self._shown.clear()
+        self._shown.append(now)
+
+    def _anchor(self, position, now) -> None:
+        self.origin_time = now
+        self.origin_position = position
+
+    def set_rate(self, fps, now=None) -> None:
+        """Change the rate, keeping the frame on screen where it is."""
+        self.rate = exact_rate(fps)
+        self.start(self.position, now)
+
+    def set_mode(self, mode, now=None) -> None:
+        if mode in PLAYBACK_MODES:
+            self.mode = mode
+            self.start(self.position, now)
+
+    def time_of(self, position) -> float:
+        """Clock time at which ``position`` is due."""
+        return self.origin_time + float((position - self.origin_position) / self.rate)
+
+    def due(self, now=None) -> int:
+        """Position that should be on screen at ``now``."""
+        now = self.now() if now is None else now
+        # Exact rational arithmetic keeps 23.976 from drifting; the epsilon
+        # absorbs float noise right on a frame boundary.
+        elapsed = Fraction(now - self.origin_time) + Fraction(1, 10**9)
+        return self.origin_position + math.floor(elapsed * self.rate)
+
+    def target(self, now=None) -> int:
+        """Position to show at ``now``; equal to :attr:`position` when nothing new is due."""
+        due = self.due(now)
+        if due <= self.position:
+            return self.position
+        return due if self.mode == MODE_REALTIME else self.position + 1
+
+    def shown(self, position, now=None) -> None:
+        """Record that ``position`` is now on screen."""
+        now = self.now() if now is None else now
+        if position > self.position + 1:
+            self.skipped += position - self.position - 1
+        self.position = position
+        if self.mode == MODE_EVERY_FRAME and self.due(now) > position:
+            # Late in every-frame mode: slow down rather than catch up in a burst.
+            self._anchor(position, now)
+        self._shown.append(now)
+        while len(self._shown) > 2 and now - self._shown[0] > ACHIEVED_FPS_WINDOW:
+            self._shown.popleft()
+
+    def next_deadline(self, now=None) -> float:
+        """Seconds until the timer should next wake: the next frame boundary after the shown or due frame."""
+        now = self.now() if now is None else now
+        waiting = max(self.position, self.due(now)) + 1
+        return max(0.0, self.time_of(waiting) - now)
+
+    def achieved_fps(self, now=None) -> float:
+        """Frames actually shown per second over the last second or so."""
+        if len(self._shown) < 2:
+            return 0.0
+        now = self.now() if now is None else now
+        span = self._shown[-1] - self._shown[0]
+        if span <= 0 or now - self._shown[-1] > ACHIEVED_FPS_WINDOW:
+            return 0.0
+        return (len(self._shown) - 1) / span
@@ -0,0 +1,351 @@
+"""Poster and low-res playback proxies for image sequences.
+
+Proxies are small JPEGs rendered from the original frames. They live either in
+a central, size-bounded cache directory (default) or beside the frames using
+the ``.thumb_<name>.jpg`` naming the panel has always used for posters. A
+manifest records the source mtime and size each proxy was rendered from, so an
+overwritten frame invalidates its proxy.
+
+Rendering is toolkit-specific and injected: ``render(source, target, max_size)``
+must write a JPEG to ``target`` and return ``True`` on success.
+"""
+
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .index import user_cache_dir
+
+POSTER = "poster"
+PROXY = "proxy"
+PROXY_SIZES = {POSTER: 480, PROXY: 1024}
+LOCATION_CENTRAL = "central"
+LOCATION_BESIDE = "beside"
+DEFAULT_PROXY_CACHE_MB = 4096
+DEFAULT_PROXY_WORKERS = 2
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+# Rough cost of a manifest row or queued request held in memory, for memory accounting.
+PROXY_ENTRY_BYTES = 400
+# Seconds close() waits for each worker to finish the proxy it is rendering.
+CLOSE_WAIT = 2.0
+
+
+def thumb_path(first_file) -> str:
+    return os.path.join(os.path.dirname(first_file), ".thumb_{}.jpg".format(os.path.basename(first_file)))
+
+
+def beside_proxy_path(source_path, kind) -> str:
+    if kind == POSTER:
+        return thumb_path(source_path)
+    return os.path.join(os.path.dirname(source_path), ".proxy_{}.jpg".format(os.path.basename(source_path)))
+
+
+class ProxyStore:
+    """Lookup, background generation and LRU eviction of proxy JPEGs.
+
+    The manifest is mirrored in memory and written through to SQLite; it is
+    only touched under ``_lock`` so lookups from decode threads and writes from
+    generator threads can share one connection. Generation runs on a small
+    priority pool: frames of the sequence being played are rendered before the
+    posters queued for every listed sequence.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS proxies ("
+        " proxy TEXT PRIMARY KEY,"
+        " source TEXT NOT NULL,"
+        " mtime_ns INTEGER NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " bytes INTEGER NOT NULL,"
+        " used REAL NOT NULL)"
+    )
+
+    def __init__(
+        self,
+        render,
+        location=LOCATION_CENTRAL,
+        cache_dir=None,
+        budget_bytes=DEFAULT_PROXY_CACHE_MB * 1024 * 1024,
+        workers=DEFAULT_PROXY_WORKERS,
+    ) -> None:
+        self.render = render
+        self.location = location
+        self.cache_dir = cache_dir or os.path.join(user_cache_dir(), "proxies")
+        self.budget_bytes = int(budget_bytes)
+        self._lock = threading.Lock()
+        self._entries: dict[str, list] = {}
+        self._total_bytes = 0
+        self._conn = None
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._queued: set[tuple[str, str]] = set()
+        self._counter = 0
+        self._generation = 0
+        self._superseded: set[tuple[str, str]] = set()
+        self._workers = [
+            threading.Thread(target=self._work, name="proxy-worker-{}".format(index), daemon=True)
+            for index in range(max(1, int(workers)))
+        ]
+        self._open_manifest()
+        for worker in self._workers:
+            worker.start()
+
+    def _open_manifest(self) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(
+                os.path.join(self.cache_dir, "manifest.sqlite3"), timeout=10, check_same_thread=False
+            )
+            self._conn.execute(self.SCHEMA)
+            rows = self._conn.execute("SELECT proxy, mtime_ns, size, bytes, used FROM proxies").fetchall()
+        except (OSError, sqlite3.Error) as exc:
+            print("[Shot Loader] Proxy manifest unavailable: {}".format(exc))
+            self._conn = None
+            return
+        for proxy, mtime_ns, size, nbytes, used in rows:
+            self._entries[proxy] = [mtime_ns, size, nbytes, used]
+            self._total_bytes += nbytes
+
+    def approx_bytes(self) -> int:
+        """Rough size of the manifest mirror and the queued requests, for memory accounting.
+
+        Requests a superseding call dropped stay in the queue until a worker
+        skips them, so they are counted until then.
+        """
+        return PROXY_ENTRY_BYTES * (len(self._entries) + self._queue.qsize())
+
+    def proxy_path(self, source_path, kind) -> str:
+        if self.location == LOCATION_BESIDE:
+            return beside_proxy_path(source_path, kind)
+        digest = hashlib.sha1(os.path.normcase(os.path.abspath(source_path)).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, kind, digest[:2], "{}.jpg".format(digest))
+
+    def lookup(self, source_path, kind, source_stat=None):
+        """Return the proxy path for ``source_path`` if one exists for its current mtime and size."""
+        if source_stat is None:
+            try:
+                source_stat = os.stat(source_path)
+            except OSError:
+                return None
+        proxy = self.proxy_path(source_path, kind)
+        with self._lock:
+            entry = self._entries.get(proxy)
+            if not entry or entry[0] != source_stat.st_mtime_ns or entry[1] != source_stat.st_size:
+                return None
+            entry[3] = time.time()
+        return proxy
+
+    def ensure(self, source_path, kind):
+        """Render the proxy for ``source_path`` unless a valid one exists; return its path or ``None``."""
+        try:
+            source_stat = os.stat(source_path)
+        except OSError:
+            return None
+        proxy = self.lookup(source_path, kind, source_stat)
+        if proxy:
+            return proxy
+
+        proxy = self.proxy_path(source_path, kind)
+        partial = "{}.{}.part".format(proxy, threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(proxy), exist_ok=True)
+            if not self.render(source_path, partial, PROXY_SIZES[kind]):
+                return None
+            os.replace(partial, proxy)
+            nbytes = os.path.getsize(proxy)
+        except OSError as exc:
+            print("[Shot Loader] Proxy write failed for {}: {}".format(source_path, exc))
+            return None
+        finally:
+            if os.path.exists(partial):
+                try:
+                    os.remove(partial)
+                except OSError:
+                    pass
+
+        self._record(proxy, source_path, source_stat, nbytes)
+        if self.location == LOCATION_CENTRAL:
+            self.evict()
+        return proxy
+
+    def _record(self, proxy, source_path, source_stat, nbytes) -> None:
+        used = time.time()
+        with self._lock:
+            previous = self._entries.get(proxy)
+            if previous:
+                self._total_bytes -= previous[2]
+            self._entries[proxy] = [source_stat.st_mtime_ns, source_stat.st_size, nbytes, used]
+            self._total_bytes += nbytes
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO proxies (proxy, source, mtime_ns, size, bytes, used)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (proxy, source_path, source_stat.st_mtime_ns, source_stat.st_size, nbytes, used),
+                    )
+            except sqlite3.Error as exc:
+                print("[Shot Loader] Proxy manifest write error: {}".format(exc))
+
+    def evict(self) -> None:
+        """Delete least recently used central proxies until the cache is back under 90% of its budget."""
+        with self._lock:
+            if self._total_bytes <= self.budget_bytes:
+                return
+            target = self.budget_bytes * 0.9
+            victims = []
+            for proxy, entry in sorted(self._entries.items(), key=lambda item: item[1][3]):
+                if self._total_bytes <= target:
+                    break
+                victims.append(proxy)
+                self._total_bytes -= entry[2]
+                del self._entries[proxy]
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.executemany("DELETE FROM proxies WHERE proxy = ?", [(proxy,) for proxy in victims])
+                except sqlite3.Error as exc:
+                    print("[Shot Loader] Proxy manifest write error: {}".format(exc))
+        for proxy in victims:
+            try:
+                os.remove(proxy)
+            except OSError:
+                pass
+
+    def flush(self) -> None:
+        """Persist last-used times so LRU order survives a restart."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE proxies SET used = ? WHERE proxy = ?",
+                        [(entry[3], proxy) for proxy, entry in self._entries.items()],
+                    )
+            except sqlite3.Error as exc:
+                print("[Shot Loader] Proxy manifest write error: {}".format(exc))
+
+    def queue(self, source_paths, kind, priority=PRIORITY_BACKGROUND, callback=None, supersede=False) -> None:
+        """Queue background generation; ``callback(source, kind, proxy)`` runs on a worker thread when done.
+
+        With ``supersede`` the paths replace those of the previous superseding
+        call: its entries still waiting are skipped, so moving on to another
+        sequence does not leave thousands of its frames queued ahead of the
+        new one. Its paths are queued even when a background request is
+        already waiting for them, so ``callback`` hears about every one.
+        """
+        with self._lock:
+            generation = None
+            if supersede:
+                self._generation += 1
+                generation = self._generation
+                self._queued -= self._superseded
+                self._superseded = set()
+            for source_path in source_paths:
+                key = (source_path, kind)
+                if supersede:
+                    if key in self._superseded:
+                        continue
+                    self._superseded.add(key)
+                elif key in self._queued and key not in self._superseded:
+                    continue
+                else:
+                    # Asked for outside the superseding calls, so a later one must not drop it.
+                    self._superseded.discard(key)
+                self._queued.add(key)
+                self._counter += 1
+                self._queue.put((priority, self._counter, source_path, kind, callback, generation))
+
+    def _work(self) -> None:
+        while True:
+            _priority, _order, source_path, kind, callback, generation = self._queue.get()
+            if source_path is None:
+                return
+            with self._lock:
+                if generation is not None and generation != self._generation:
+                    continue
+                self._queued.discard((source_path, kind))
+                self._superseded.discard((source_path, kind))
+            try:
+                proxy = self.ensure(source_path, kind)
+            except Exception as exc:
+                print("[Shot Loader] Proxy generation error for {}: {}".format(source_path, exc))
+                proxy = None
+            if proxy and callback:
+                callback(source_path, kind, proxy)
+
+    def close(self) -> None:
+        """Stop the workers once they finish the proxy in hand, then persist the manifest and close it."""
+        with self._lock:
+            for _worker in self._workers:
+                # Ahead of every request still queued, so closing does not wait for the backlog.
+                self._counter += 1
+                self._queue.put((PRIORITY_INTERACTIVE - 1, self._counter, None, None, None, None))
+        for worker in self._workers:
+            worker.join(CLOSE_WAIT)
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PlaybackProxies:
+    """The valid proxies of one frame list, looked up as the player first decodes each frame.
+
+    A frame's source is stat'ed once, on its first decode, and the answer is
+    kept per frame index in one byte, so looping and scrubbing never stat
+    again and nothing is held per frame as a path. With ``generate`` a frame
+    decoded from its source is queued for rendering in the background and
+    marked once its proxy exists: only frames actually played are rendered,
+    never a whole sequence because its row was clicked.
+    """
+
+    UNKNOWN = 0
+    VALID = 1
+    MISSING = 2
+
+    def __init__(self, store, frames, kind=PROXY, generate=True) -> None:
+        self.store = store
+        self.frames = frames
+        self.kind = kind
+        self.generate = generate
+        self._state = bytearray(len(frames))
+
+    def _index(self, source_path):
+        try:
+            return self.frames.index(source_path)
+        except ValueError:
+            return None
+
+    def get(self, source_path):
+        """The proxy to decode instead of ``source_path``, or ``None``. Runs on decoder threads."""
+        index = self._index(source_path)
+        if index is None:
+            return None
+        state = self._state[index]
+        if state == self.VALID:
+            return self.store.proxy_path(source_path, self.kind)
+        if state == self.MISSING:
+            return None
+        proxy = self.store.lookup(source_path, self.kind)
+        # One byte store; decoder threads racing on the same frame write the same answer.
+        self._state[index] = self.VALID if proxy else self.MISSING
+        if not proxy and self.generate:
+            self.store.queue([source_path], self.kind, PRIORITY_BACKGROUND, callback=self.ready)
+        return proxy
+
+    def ready(self, source_path, _kind, _proxy) -> None:
+        """Queue callback: ``source_path``'s proxy was rendered or found valid."""
+        index = self._index(source_path)
+        if index is not None:
+            self._state[index] = self.VALID
+
+    def approx_bytes(self) -> int:
+        """Bytes held for the frame list, for memory accounting: one per frame."""
+        return len(self._state)
@@ -0,0 +1,117 @@
+"""Connection to a running DaVinci Resolve and the media pool steps shared by the panel and the CLI."""
+
+import os
+import sys
+
+from .media_import import ensure_bin
+from .timeline import TimelineAssembly
+
+RESOLVE_MODULE_DIRS = {
+    "win32": r"C:\ProgramData\Blackmagic Design\DaVinci Resolve\Support\Developer\Scripting\Modules",
+    "darwin": "/Library/Application Support/Blackmagic Design/DaVinci Resolve/Developer/Scripting/Modules",
+    "linux": "/opt/resolve/Developer/Scripting/Modules",
+}
+
+
+def _import_resolve_script():
+    try:
+        import DaVinciResolveScript
+    except ImportError:
+        # Outside Resolve the module is only found through RESOLVE_SCRIPT_API
+        # or the install's default location.
+        candidates = []
+        if os.environ.get("RESOLVE_SCRIPT_API"):
+            candidates.append(os.path.join(os.environ["RESOLVE_SCRIPT_API"], "Modules"))
+        platform = "linux" if sys.platform.startswith("linux") else sys.platform
+        if platform in RESOLVE_MODULE_DIRS:
+            candidates.append(RESOLVE_MODULE_DIRS[platform])
+        for candidate in candidates:
+            if os.path.isdir(candidate) and candidate not in sys.path:
+                sys.path.append(candidate)
+        import DaVinciResolveScript
+    return DaVinciResolveScript
+
+
+def get_resolve(fusion=None):
+    """Return the Resolve scripting object, or raise ``RuntimeError``.
+
+    ``fusion`` is the ``fu`` global Resolve injects into scripts it runs,
+    used when ``DaVinciResolveScript`` cannot connect.
+    """
+    try:
+        resolve = _import_resolve_script().scriptapp("Resolve")
+        if resolve:
+            return resolve
+    except Exception:
+        pass
+
+    if fusion is not None:
+        try:
+            resolve = fusion.GetResolve()
+            if resolve:
+                return resolve
+        except Exception:
+            pass
+
+    raise RuntimeError("Cannot connect to DaVinci Resolve.")
+
+
+class ResolveConnection:
+    """Lazily connected Resolve session.
+
+    Nothing connects until :meth:`media_pool` is first called. The project is
+    looked up on every call, so a long-lived caller follows project switches,
+    and a connection to a Resolve that has quit is dropped and made again.
+    """
+
+    def __init__(self, fusion=None) -> None:
+        self.fusion = fusion
+        self.resolve = None
+        self.project = None
+
+    def media_pool(self):
+        for _attempt in range(2):
+            try:
+                if self.resolve is None:
+                    self.resolve = get_resolve(self.fusion)
+                self.project = self.resolve.GetProjectManager().GetCurrentProject()
+                return self.project.GetMediaPool() if self.project else None
+            except Exception:
+                self.resolve = None
+                self.project = None
+        return None
+
+    def project_key(self):
+        if not self.project:
+            return None
+        for getter in ("GetUniqueId", "GetName"):
+            try:
+                key = getattr(self.project, getter)()
+            except Exception:
+                continue
+            if key:
+                return key
+        return id(self.project)
+
+
+def prepare_import(media_pool, clip_index, project_key, bin_name):
+    """Index the project's clips if ``clip_index`` is not bound to it yet and return the import bin.
+
+    Returns ``(import_bin, indexed)``; ``import_bin`` is ``None`` when the bin
+    could not be created and imports go to the current bin instead.
+    """
+    indexed = clip_index.attach(media_pool, project_key) if clip_index is not None else False
+    return ensure_bin(media_pool, bin_name), indexed
+
+
+def create_timeline(media_pool, base_name, clips, project=None):
+    """Create a timeline named ``base_name`` (or ``base_name_2``, ...) holding ``clips``.
+
+    Returns ``(name, appended)``; ``name`` is ``None`` if no timeline could be
+    created. ``project`` lets the free name be found from one listing of its
+    timelines instead of by trial.
+    """
+    plans = TimelineAssembly(media_pool, project).build([(base_name, clips)])
+    if not plans or plans[0].timeline is None:
+        return None, False
+    return plans[0].name, plans[0].appended > 0
@@ -0,0 +1,305 @@
+"""Directory traversal and image-sequence detection.
+
+Nothing in here imports Qt, so the same code runs inside the Resolve panel,
+in benchmarks and in batch tools.
+"""
+
+import os
+import queue
+import re
+import threading
+from array import array
+from collections import deque
+from pathlib import Path
+
+SEQ_EXTENSIONS: set[str] = {".exr", ".png", ".jpg", ".jpeg"}
+FRAME_RE = re.compile(r"(.+?)([._-]?)(\d{3,})(\.[^.]+)$")
+DEFAULT_SCAN_WORKERS = 8
+IDLE_WAIT = 0.05
+
+
+def list_directory(dirpath):
+    """Return ``(subdirs, file_names)`` for one directory, or ``None`` if it cannot be read.
+
+    Mirrors ``os.walk`` defaults: symlinked directories are listed as neither
+    files nor subdirectories to descend into.
+    """
+    subdirs: list[str] = []
+    names: list[str] = []
+    try:
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    names.append(entry.name)
+                    continue
+                try:
+                    is_link = entry.is_symlink()
+                except OSError:
+                    is_link = False
+                if not is_link:
+                    subdirs.append(entry.path)
+    except OSError:
+        return None
+    return subdirs, names
+
+
+def walk_directories(folder, visit=list_directory, should_stop=None, max_depth=None):
+    """Serial top-down walk yielding ``(dirpath, payload)`` for every directory ``visit`` accepts.
+
+    ``visit(dirpath)`` returns ``(subdirs, payload)`` or ``None`` to skip the
+    directory. ``max_depth`` limits descent (``0`` visits ``folder`` only).
+    ``should_stop`` is polled once per directory.
+    """
+    stack = [(folder, 0)]
+    while stack:
+        if should_stop and should_stop():
+            return
+        dirpath, depth = stack.pop()
+        result = visit(dirpath)
+        if result is None:
+            continue
+        subdirs, payload = result
+        yield dirpath, payload
+        if max_depth is None or depth < max_depth:
+            stack.extend((subdir, depth + 1) for subdir in reversed(subdirs))
+
+
+class _WalkFailure:
+    def __init__(self, exc) -> None:
+        self.exc = exc
+
+
+_WALK_DONE = object()
+
+
+class ParallelDirectoryWalker:
+    """Work-stealing directory traversal served by a pool of ``os.scandir`` threads.
+
+    Each worker pushes the subdirectories it discovers onto its own deque and
+    pops from the same end, so it keeps descending into warm parts of the tree;
+    an idle worker steals the oldest entry from another worker's deque. On
+    high-latency storage this keeps ``workers`` directory listings in flight at
+    once, where a serial walk pays every round trip in turn.
+
+    :meth:`walk` accepts the same ``visit`` callbacks as :func:`walk_directories`
+    and yields the same ``(dirpath, payload)`` pairs, in completion order.
+    """
+
+    def __init__(self, workers=DEFAULT_SCAN_WORKERS, max_depth=None) -> None:
+        self.workers = max(1, int(workers))
+        self.max_depth = max_depth
+
+    def walk(self, folder, visit=list_directory, should_stop=None):
+        if self.workers == 1:
+            yield from walk_directories(folder, visit, should_stop, self.max_depth)
+            return
+
+        max_depth = self.max_depth
+        deques = [deque() for _ in range(self.workers)]
+        results: queue.SimpleQueue = queue.SimpleQueue()
+        stop_event = threading.Event()
+        cond = threading.Condition()
+        state = {"pending": 1, "done": False}
+        deques[0].append((folder, 0))
+
+        def take(own_index):
+            try:
+                return deques[own_index].pop()
+            except IndexError:
+                pass
+            for offset in range(1, self.workers):
+                try:
+                    return deques[(own_index + offset) % self.workers].popleft()
+                except IndexError:
+                    continue
+            return None
+
+        def work(own_index) -> None:
+            own = deques[own_index]
+            while True:
+                item = take(own_index)
+                if item is None:
+                    with cond:
+                        if state["done"]:
+                            return
+                        cond.wait(IDLE_WAIT)
+                    continue
+
+                dirpath, depth = item
+                children = []
+                if not stop_event.is_set():
+                    try:
+                        result = visit(dirpath)
+                    except Exception as exc:
+                        result = None
+                        stop_event.set()
+                        results.put(_WalkFailure(exc))
+                    if result is not None:
+                        subdirs, payload = result
+                        results.put((dirpath, payload))
+                        if max_depth is None or depth < max_depth:
+                            children = [(subdir, depth + 1) for subdir in reversed(subdirs)]
+
+                with cond:
+                    if children:
+                        state["pending"] += len(children)
+                        own.extend(children)
+                        cond.notify_all()
+                    state["pending"] -= 1
+                    if state["pending"] == 0:
+                        state["done"] = True
+                        results.put(_WALK_DONE)
+                        cond.notify_all()
+
+        threads = [
+            threading.Thread(target=work, args=(index,), name="scan-worker-{}".format(index), daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                if should_stop and should_stop():
+                    return
+                try:
+                    item = results.get(timeout=IDLE_WAIT)
+                except queue.Empty:
+                    continue
+                if item is _WALK_DONE:
+                    return
+                if isinstance(item, _WalkFailure):
+                    raise item.exc
+                yield item
+        finally:
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+
+def iter_directory_listings(folder, should_stop=None, max_depth=None, workers=1):
+    """Walk ``folder`` top-down with ``os.scandir`` and yield ``(dirpath, file_names)``.
+
+    Unreadable directories are skipped. With ``workers > 1`` the walk runs on a
+    :class:`ParallelDirectoryWalker` and directories arrive in completion order.
+    """
+    if workers > 1:
+        return ParallelDirectoryWalker(workers, max_depth).walk(folder, list_directory, should_stop)
+    return walk_directories(folder, list_directory, should_stop, max_depth)
+
+
+def frame_runs(frames) -> list[list[int]]:
+    """Collapse sorted, unique frame numbers into inclusive ``[start, end]`` runs."""
+    runs: list[list[int]] = []
+    for frame in frames:
+        if runs and frame == runs[-1][1] + 1:
+            runs[-1][1] = frame
+        else:
+            runs.append([frame, frame])
+    return runs
+
+
+def missing_runs(runs) -> list[list[int]]:
+    """Inclusive ``[start, end]`` gaps between consecutive frame runs."""
+    return [[previous[1] + 1, following[0] - 1] for previous, following in zip(runs, runs[1:])]
+
+
+def format_runs(runs, limit=None) -> str:
+    """Format runs as ``1001-1050, 1052``; with ``limit``, list at most that many and summarise the rest."""
+    shown = runs if limit is None else runs[:limit]
+    text = ", ".join(str(start) if start == end else "{}-{}".format(start, end) for start, end in shown)
+    if len(shown) < len(runs):
+        text += " (+{} more)".format(len(runs) - len(shown))
+    return text
+
+
+def sequences_in_directory(dirpath, names) -> list[dict]:
+    """Group ``names`` into image-sequence records.
+
+    Each name is matched once; a sequence keeps only an array of frame
+    numbers while grouping and ends up as run-length ``frame_ranges``, so the
+    record's size depends on the number of gaps, not the number of frames.
+    Frames are ordered numerically, so ``999`` sorts before ``1000`` even when
+    padding widths differ.
+    """
+    groups: dict[str, list] = {}
+    for name in names:
+        # Hidden files are never frames: AppleDouble ``._`` copies, ``.thumb_`` posters, proxies.
+        if name.startswith("."):
+            continue
+        if os.path.splitext(name)[1].lower() not in SEQ_EXTENSIONS:
+            continue
+
+        match: re.Match[str] | None = FRAME_RE.match(name)
+        if not match:
+            continue
+
+        prefix, separator, digits, extension = match.groups()
+        frame = int(digits)
+        seq_key: str = prefix + separator + extension
+        group = groups.get(seq_key)
+        if group is None:
+            groups[seq_key] = [array("q", (frame,)), name, frame, len(digits)]
+            continue
+        group[0].append(frame)
+        if frame < group[2]:
+            group[1] = name
+            group[2] = frame
+        if len(digits) < group[3]:
+            group[3] = len(digits)
+
+    records: list[dict] = []
+    for seq_key, (frames, first_name, start_index, padding) in groups.items():
+        unique = sorted(set(frames))
+        # Two names for one frame (a.1.exr and a.0001.exr) are still a single file.
+        if len(unique) < 2:
+            continue
+        runs = frame_runs(unique)
+        end_index: int = unique[-1]
+        extension = os.path.splitext(first_name)[1]
+        stem = seq_key[: len(seq_key) - len(extension)]
+        pattern_printf: str = os.path.join(dirpath, "{}%0{}d{}".format(stem, padding, extension))
+        pattern_hash: str = os.path.join(dirpath, "{}{}{}".format(stem, "#" * padding, extension))
+
+        records.append({
+            "seq_key": seq_key,
+            "folder": dirpath,
+            "folder_name": Path(dirpath).name or dirpath,
+            "first_file": os.path.join(dirpath, first_name),
+            "frames": len(unique),
+            "start_index": start_index,
+            "end_index": end_index,
+            "extension": extension.lower(),
+            "pattern_printf": pattern_printf,
+            "pattern_hash": pattern_hash,
+            "frame_ranges": runs,
+            "missing": end_index - start_index + 1 - len(unique),
+        })
+    return records
+
+
+def visit_sequences(dirpath):
+    """``visit`` callback that lists a directory and parses its sequences in the walking thread."""
+    listing = list_directory(dirpath)
+    if listing is None:
+        return None
+    subdirs, names = listing
+    return subdirs, sequences_in_directory(dirpath, names)
+
+
+def detect_sequences(folder, should_stop=None, max_depth=None, workers=1):
+    """Yield a record dict for every image sequence under ``folder``.
+
+    ``workers > 1`` produces the same records as the serial walk, in
+    completion order rather than walk order.
+    """
+    if workers > 1:
+        walk = ParallelDirectoryWalker(workers, max_depth).walk(folder, visit_sequences, should_stop)
+    else:
+        walk = walk_directories(folder, visit_sequences, should_stop, max_depth)
+    for _dirpath, records in walk:
+        yield from records
@@ -0,0 +1,267 @@
+"""In-memory substring search over listed sequences, backed by a trigram index.
+
+The name filter matches a case-insensitive substring of ``folder/seq_key``.
+Checking every row costs a string search per sequence on each keystroke, so
+:class:`SearchIndex` splits those paths into alphanumeric tokens (``sh0420``,
+``lighting``, ``v012``, ``exr``), which repeat across thousands of rows, and
+indexes the distinct tokens by trigram. A query finds the tokens holding each
+alphanumeric run it contains and takes the rows posted under them; only when
+the query spans several runs are those candidates checked against their full
+path.
+"""
+
+import os
+import re
+import sys
+from array import array
+
+GRAM = 3
+TOKEN_RE = re.compile(r"[^\W_]+")
+SEPARATOR_RE = re.compile(r"[\\/]")
+# Stale posting entries tolerated, as a fraction of all entries, before the postings are rebuilt.
+COMPACT_RATIO = 0.25
+# Below this fraction of the index, checking candidate rows one by one beats a lookup.
+CHECK_RATIO = 1 / 64
+# Below this fraction of the candidates, sorting the hits into display order beats scanning the candidates for them.
+SORT_RATIO = 1 / 8
+# Rough costs for memory accounting: a token with its string, dict entry and postings array, and a folder's entries.
+TOKEN_BYTES = 300
+FOLDER_BYTES = 100
+
+
+def trigrams(text) -> set[str]:
+    return {text[index:index + GRAM] for index in range(len(text) - GRAM + 1)}
+
+
+def is_instant(text) -> bool:
+    """Whether a name filter for ``text`` narrows through trigrams, cheaply enough to apply on every keystroke.
+
+    That takes an alphanumeric run of at least :data:`GRAM` characters; an
+    empty filter is instant too.
+    """
+    needle = text.strip()
+    return not needle or any(len(run) >= GRAM for run in TOKEN_RE.findall(needle))
+
+
+def tokens(text) -> set[str]:
+    """The distinct alphanumeric runs of lower-cased ``text``."""
+    return set(TOKEN_RE.findall(text))
+
+
+class SearchIndex:
+    """Trigram index from the tokens of lower-cased ``folder/seq_key`` paths to the slots holding them.
+
+    Every slot is posted under each token of its folder and key, in one
+    ``array`` per token. Removing a slot only records its entries as stale;
+    lookups subtract them until enough pile up to rebuild the postings.
+    Updated incrementally by :class:`~element_browser.store.SequenceStore` as
+    rows are added, changed and removed.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._tokens: list[str] = []
+        self._token_ids: dict[str, int] = {}
+        self._grams: dict[str, array] = {}
+        self._postings: list[array] = []
+        self._stale: dict[int, set[int]] = {}
+        self._stale_count = 0
+        self._posted = 0
+        self._gram_entries = 0
+        self._folder_bytes = 0
+        self._folder_ids: dict[str, int] = {}
+        self._folder_text: list[str] = []
+        self._folder_tokens: list[tuple] = []
+        self._slot_folder = array("i")
+        self._slot_key: list = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _token(self, text) -> int:
+        token_id = self._token_ids.get(text)
+        if token_id is None:
+            token_id = len(self._tokens)
+            self._tokens.append(text)
+            self._token_ids[text] = token_id
+            self._postings.append(array("i"))
+            for gram in trigrams(text):
+                grams = self._grams.get(gram)
+                if grams is None:
+                    self._grams[gram] = array("i", (token_id,))
+                else:
+                    grams.append(token_id)
+                self._gram_entries += 1
+        return token_id
+
+    def _folder(self, folder) -> int:
+        folder_id = self._folder_ids.get(folder)
+        if folder_id is None:
+            folder_id = len(self._folder_text)
+            # ``os.path.join(folder, "")`` appends the separator the name filter sees before the key.
+            text = os.path.join(folder, "").lower()
+            self._folder_ids[folder] = folder_id
+            self._folder_text.append(text)
+            self._folder_tokens.append(tuple(self._token(token) for token in tokens(text)))
+            self._folder_bytes += FOLDER_BYTES + sys.getsizeof(text) + sys.getsizeof(self._folder_tokens[-1])
+        return folder_id
+
+    def _slot_tokens(self, slot) -> set[int]:
+        key_tokens = (self._token(token) for token in tokens(self._slot_key[slot]))
+        return set(self._folder_tokens[self._slot_folder[slot]]).union(key_tokens)
+
+    def add(self, slot, folder, key) -> None:
+        """Index ``slot`` as ``key`` in ``folder``; a slot already indexed is replaced."""
+        if slot < len(self._slot_folder) and self._slot_folder[slot] >= 0:
+            self.remove(slot)
+        while len(self._slot_folder) <= slot:
+            self._slot_folder.append(-1)
+            self._slot_key.append(None)
+        self._slot_folder[slot] = self._folder(folder)
+        # Keys are interned by the store, so an already lower-case key costs nothing extra.
+        self._slot_key[slot] = sys.intern(key.lower())
+        self._count += 1
+        for token_id in self._slot_tokens(slot):
+            stale = self._stale.get(token_id)
+            if stale is not None and slot in stale:
+                # The entry left by an earlier removal is live again.
+                stale.discard(slot)
+                self._stale_count -= 1
+                continue
+            self._postings[token_id].append(slot)
+            self._posted += 1
+
+    def remove(self, slot) -> None:
+        if slot >= len(self._slot_folder) or self._slot_folder[slot] < 0:
+            return
+        for token_id in self._slot_tokens(slot):
+            self._stale.setdefault(token_id, set()).add(slot)
+            self._stale_count += 1
+        self._slot_folder[slot] = -1
+        self._slot_key[slot] = None
+        self._count -= 1
+        if self._stale_count > self._posted * COMPACT_RATIO:
+            self._compact()
+
+    def _compact(self) -> None:
+        for token_id, stale in self._stale.items():
+            postings = self._postings[token_id]
+            kept = array("i", (slot for slot in postings if slot not in stale))
+            self._posted -= len(postings) - len(kept)
+            self._postings[token_id] = kept
+        self._stale = {}
+        self._stale_count = 0
+
+    def approx_bytes(self) -> int:
+        """Rough size of the index in bytes, kept up to date as it changes rather than measured."""
+        return (
+            4 * (self._posted + self._gram_entries + len(self._slot_folder))
+            + 8 * len(self._slot_key)
+            + TOKEN_BYTES * len(self._tokens)
+            + self._folder_bytes
+        )
+
+    def text(self, slot) -> str:
+        """The lower-cased ``folder/seq_key`` the filter matches against."""
+        return self._folder_text[self._slot_folder[slot]] + self._slot_key[slot]
+
+    def containing(self, slots, needle) -> list[int]:
+        """The slots from ``slots`` whose text contains ``needle`` (lower-case), in order."""
+        folder_text = self._folder_text
+        slot_folder = self._slot_folder
+        slot_key = self._slot_key
+        if SEPARATOR_RE.search(needle) is None:
+            # Only a needle holding a separator can span the folder and the key.
+            return [slot for slot in slots if needle in slot_key[slot] or needle in folder_text[slot_folder[slot]]]
+        return [
+            slot for slot in slots
+            if needle in folder_text[slot_folder[slot]] or needle in folder_text[slot_folder[slot]] + slot_key[slot]
+        ]
+
+    def tokens_containing(self, fragment) -> list[int]:
+        """Ids of the tokens that contain ``fragment`` (a lower-case alphanumeric run)."""
+        if len(fragment) < GRAM:
+            return [token_id for token_id, text in enumerate(self._tokens) if fragment in text]
+        grams = []
+        for gram in trigrams(fragment):
+            ids = self._grams.get(gram)
+            if ids is None:
+                return []
+            grams.append(ids)
+        grams.sort(key=len)
+        candidates = set(grams[0])
+        for ids in grams[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+        return [token_id for token_id in candidates if fragment in self._tokens[token_id]]
+
+    def _posted_under(self, token_ids) -> set[int]:
+        stale = self._stale
+        return set().union(*(
+            self._postings[token_id] if not stale.get(token_id) else set(self._postings[token_id]) - stale[token_id]
+            for token_id in token_ids
+        ))
+
+    def search(self, text, within=None) -> set[int]:
+        """Slots whose lower-cased ``folder/seq_key`` contains ``text`` (case-insensitive).
+
+        ``within`` limits the result to those slots, which saves checking full
+        paths outside it.
+        """
+        needle = text.lower()
+        runs = sorted(set(TOKEN_RE.findall(needle)), key=len, reverse=True)
+        if not runs:
+            if within is None:
+                within = [slot for slot, folder_id in enumerate(self._slot_folder) if folder_id >= 0]
+            return set(self.containing(within, needle))
+        found = self._posted_under(self.tokens_containing(runs[0]))
+        for run in runs[1:]:
+            if not found or len(run) < GRAM:
+                break
+            found.intersection_update(self._posted_under(self.tokens_containing(run)))
+        if runs[0] != needle:
+            if within is not None:
+                found.intersection_update(within)
+            found = set(self.containing(found, needle))
+        return found
+
+    def matcher(self, text):
+        return SearchMatch(self, text.lower())
+
+
+class SearchMatch:
+    """Name filter predicate: one string check per slot, or :meth:`select` for a whole list through the index."""
+
+    __slots__ = ("index", "needle")
+
+    def __init__(self, index, needle) -> None:
+        self.index = index
+        self.needle = needle
+
+    def __call__(self, slot) -> bool:
+        return self.needle in self.index.text(slot)
+
+    def refines(self, other) -> bool:
+        """Whether everything this accepts was accepted by ``other``, so its rows can be filtered instead of all."""
+        return isinstance(other, SearchMatch) and other.index is self.index and other.needle in self.needle
+
+    def select(self, slots, order=None):
+        """The slots from ``slots`` that match, in order.
+
+        ``slots`` must hold every indexed slot that matches: all of them, or
+        the rows kept by a query this one :meth:`refines`. ``order`` maps
+        those slots to their positions; with it a few hits are sorted into
+        place instead of scanning ``slots`` for them.
+        """
+        if len(slots) < len(self.index) * CHECK_RATIO:
+            return self.index.containing(slots, self.needle)
+        found = self.index.search(self.needle, slots if len(slots) < len(self.index) else None)
+        if len(found) == len(slots):
+            return slots
+        if order is not None and len(found) < len(slots) * SORT_RATIO:
+            return sorted(found, key=order.__getitem__)
+        return filter(found.__contains__, slots)
@@ -0,0 +1,157 @@
+"""Frame lists and import items derived from sequence records, without touching disk."""
+
+import os
+from bisect import bisect_right
+from collections.abc import Sequence
+
+from .media_import import ImportItem
+from .scan import FRAME_RE, frame_runs
+
+
+def sequence_file_pattern(first_file):
+    """``(prefix, separator, padding, extension)`` of a frame file name, or ``None``."""
+    match = FRAME_RE.match(os.path.basename(first_file))
+    if not match:
+        return None
+    prefix, separator, digits, extension = match.groups()
+    return prefix, separator, len(digits), extension
+
+
+def sequence_frames(seq) -> list[tuple[int, str]]:
+    """``(frame, path)`` for every frame the scan found, built from the record's runs."""
+    pattern = sequence_file_pattern(seq["first_file"])
+    if not pattern:
+        return []
+
+    prefix, separator, padding, extension = pattern
+    folder = seq["folder"]
+    runs = seq.get("frame_ranges") or [[seq["start_index"], seq["end_index"]]]
+    return [
+        (frame, os.path.join(folder, "{}{}{:0{}d}{}".format(prefix, separator, frame, padding, extension)))
+        for start, end in runs
+        for frame in range(int(start), int(end) + 1)
+    ]
+
+
+class FramePaths(Sequence):
+    """A sequence's frame paths in order, each built from the pattern when it is asked for.
+
+    Holding a 10,000-frame sequence as path strings costs over a megabyte;
+    this keeps the folder, the name pattern and the runs of frame numbers
+    instead. It reads like a list of ``str``: indexing, slicing, iteration,
+    ``in``, :meth:`index` and ``==`` against another list of paths.
+    """
+
+    __slots__ = ("folder", "prefix", "separator", "padding", "extension", "runs", "_offsets")
+
+    def __init__(self, folder, pattern, runs) -> None:
+        self.folder = folder
+        self.prefix, self.separator, self.padding, self.extension = pattern
+        self.runs = tuple((int(start), int(end)) for start, end in runs)
+        offsets = [0]
+        for start, end in self.runs:
+            offsets.append(offsets[-1] + end - start + 1)
+        self._offsets = tuple(offsets)
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def frame(self, index) -> int:
+        """The frame number at ``index``."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("frame index out of range")
+        run = bisect_right(self._offsets, index) - 1
+        return self.runs[run][0] + index - self._offsets[run]
+
+    def path(self, frame) -> str:
+        name = "{}{}{:0{}d}{}".format(self.prefix, self.separator, frame, self.padding, self.extension)
+        return os.path.join(self.folder, name)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.path(self.frame(position)) for position in range(*index.indices(len(self)))]
+        return self.path(self.frame(index))
+
+    def __iter__(self):
+        for start, end in self.runs:
+            for frame in range(start, end + 1):
+                yield self.path(frame)
+
+    def index(self, path, start=0, stop=None) -> int:
+        if not isinstance(path, str):
+            raise ValueError("{!r} is not in the frame list".format(path))
+        head = os.path.join(self.folder, self.prefix + self.separator)
+        digits = path[len(head):len(path) - len(self.extension)]
+        if path.startswith(head) and path.endswith(self.extension) and digits.isdigit():
+            frame = int(digits)
+            run = bisect_right(self.runs, (frame, float("inf"))) - 1
+            if run >= 0 and frame <= self.runs[run][1] and self.path(frame) == path:
+                position = self._offsets[run] + frame - self.runs[run][0]
+                if start <= position and (stop is None or position < stop):
+                    return position
+        raise ValueError("{!r} is not in the frame list".format(path))
+
+    def __contains__(self, path) -> bool:
+        try:
+            self.index(path)
+        except ValueError:
+            return False
+        return True
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FramePaths):
+            return (self.folder, self.prefix, self.separator, self.padding, self.extension, self.runs) == (
+                other.folder, other.prefix, other.separator, other.padding, other.extension, other.runs
+            )
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(path == given for path, given in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        first = self.path(self.runs[0][0]) if self.runs else self.folder
+        return "FramePaths({!r}, {} frame(s))".format(first, len(self))
+
+
+def sequence_frame_paths(seq, bad_frames=None):
+    """Frame paths in order, leaving out ``bad_frames`` (a container of frame numbers), as :class:`FramePaths`."""
+    pattern = sequence_file_pattern(seq["first_file"])
+    if not pattern:
+        return []
+    runs = seq.get("frame_ranges") or [[seq["start_index"], seq["end_index"]]]
+    if bad_frames:
+        runs = frame_runs(
+            frame for start, end in runs for frame in range(int(start), int(end) + 1) if frame not in bad_frames
+        )
+    return FramePaths(seq["folder"], pattern, runs)
+
+
+def norm_path(path) -> str:
+    return str(path).replace("\\", "/")
+
+
+def sequence_import_item(seq, bad_frames=None):
+    """An :class:`ImportItem` with one run per stretch of present, good frames, or ``None`` if none are left."""
+    if not sequence_file_pattern(seq["first_file"]):
+        return None
+    runs = seq.get("frame_ranges") or [[seq["start_index"], seq["end_index"]]]
+    if bad_frames:
+        good_runs = frame_runs(
+            frame for start, end in runs for frame in range(int(start), int(end) + 1) if frame not in bad_frames
+        )
+    else:
+        good_runs = [[int(start), int(end)] for start, end in runs]
+    if not good_runs:
+        return None
+    return ImportItem(
+        seq["seq_key"],
+        norm_path(seq["pattern_printf"]),
+        norm_path(seq["pattern_hash"]),
+        norm_path(seq["first_file"]),
+        good_runs,
+        # Resolve's own sequence detection would pull excluded frames back in.
+        exact=not bad_frames,
+    )
@@ -0,0 +1,473 @@
+"""Compact columnar storage for the listed sequences.
+
+A dict of string-keyed dicts per row costs well over a kilobyte per sequence
+and has to be walked in Python for every bulk operation. The store instead
+keeps one typed array (or list of interned strings) per field, addressed by a
+stable integer slot, and rebuilds the familiar record dict only when a caller
+asks for a single row. Check state lives in a :class:`BitSet` indexed by slot.
+"""
+
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+
+from .scan import FRAME_RE
+from .search import SearchIndex
+
+FIELD_NAME = "name"
+FIELD_FRAMES = "frames"
+FIELD_RANGE = "range"
+FIELD_EXTENSION = "extension"
+FIELD_MISSING = "missing"
+FIELD_VERIFIED = "verified"
+FIELD_RESOLUTION = "resolution"
+FIELD_CHANNELS = "channels"
+FIELD_DEPTH = "depth"
+FIELD_COMPRESSION = "compression"
+FIELDS = (
+    FIELD_NAME,
+    FIELD_FRAMES,
+    FIELD_RANGE,
+    FIELD_EXTENSION,
+    FIELD_MISSING,
+    FIELD_VERIFIED,
+    FIELD_RESOLUTION,
+    FIELD_CHANNELS,
+    FIELD_DEPTH,
+    FIELD_COMPRESSION,
+)
+HEADER_FIELDS = (FIELD_RESOLUTION, FIELD_CHANNELS, FIELD_DEPTH, FIELD_COMPRESSION)
+
+RECORD_KEYS = {
+    "seq_key",
+    "folder",
+    "folder_name",
+    "first_file",
+    "frames",
+    "start_index",
+    "end_index",
+    "extension",
+    "pattern_printf",
+    "pattern_hash",
+    "frame_ranges",
+    "missing",
+}
+# Rough costs for memory accounting: a record kept verbatim, a header, verification or frame-run entry, and a
+# folder's lookup entries.
+RECORD_BYTES = 1200
+ENTRY_BYTES = 400
+FOLDER_BYTES = 300
+BOUNDS_RE = re.compile(r"^(?:(<=|>=|<|>)\s*(\d+)|(\d+)(?:\s*-\s*(\d+))?)$")
+
+
+class BitSet:
+    """Growable set of non-negative integers packed eight to a byte."""
+
+    def __init__(self) -> None:
+        self._bits = bytearray()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, index) -> bool:
+        byte = index >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (index & 7)))
+
+    def __iter__(self):
+        for byte_index, byte in enumerate(self._bits):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield (byte_index << 3) | bit
+
+    def add(self, index) -> bool:
+        """Set ``index``; return ``True`` if it was not set before."""
+        byte = index >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        mask = 1 << (index & 7)
+        if self._bits[byte] & mask:
+            return False
+        self._bits[byte] |= mask
+        self._count += 1
+        return True
+
+    def discard(self, index) -> bool:
+        """Clear ``index``; return ``True`` if it was set before."""
+        byte = index >> 3
+        mask = 1 << (index & 7)
+        if byte >= len(self._bits) or not self._bits[byte] & mask:
+            return False
+        self._bits[byte] &= ~mask & 0xFF
+        self._count -= 1
+        return True
+
+    def clear(self) -> None:
+        self._bits = bytearray()
+        self._count = 0
+
+
+def parse_bounds(text):
+    """Parse ``N``, ``A-B``, ``>N``, ``>=N``, ``<N`` or ``<=N`` into inclusive ``(low, high)``; ``None`` if invalid."""
+    match = BOUNDS_RE.match(text.strip())
+    if not match:
+        return None
+    operator, operand, low, high = match.groups()
+    if operator:
+        value = int(operand)
+        return {
+            "<": (None, value - 1),
+            "<=": (None, value),
+            ">": (value + 1, None),
+            ">=": (value, None),
+        }[operator]
+    low = int(low)
+    return low, int(high) if high is not None else low
+
+
+def select_slots(match, slots, order=None) -> array:
+    """The slots in ``slots`` accepted by a :meth:`SequenceStore.matcher` predicate, in order.
+
+    ``order`` maps slots to their positions, for predicates that can place
+    their hits directly (see :meth:`~element_browser.search.SearchMatch.select`).
+    """
+    select = getattr(match, "select", None)
+    return array("i", select(slots, order) if select is not None else filter(match, slots))
+
+
+class SequenceStore:
+    """Sequence records stored column-wise and addressed by slot.
+
+    Folder paths and extensions are stored once in lookup tables, sequence
+    keys are interned, and the first file name and both patterns are derived
+    from the key, start frame and padding. Frame runs are only stored for
+    sequences with gaps, flattened into one array each; a gapless sequence is
+    fully described by its start and end. Records whose first file does not
+    follow from those fields are kept verbatim. Slots of removed rows are
+    reused.
+
+    Verification results are kept beside the records: ``verified`` marks the
+    slots that have been checked and only failing frames are stored. Changing
+    or removing a record drops its results. Header metadata of each row's
+    first file (see :mod:`~element_browser.metadata`) is kept the same way and
+    survives a change that leaves the first file in place.
+    """
+
+    def __init__(self) -> None:
+        self.checked = BitSet()
+        self.verified = BitSet()
+        self.search = SearchIndex()
+        self.clear()
+
+    def clear(self) -> None:
+        self._folders: list[str] = []
+        self._folder_names: list[str] = []
+        self._folder_ids: dict[str, int] = {}
+        self._extensions: list[str] = []
+        self._extension_ids: dict[str, int] = {}
+        self._folder = array("I")
+        self._key: list[str] = []
+        self._frames = array("q")
+        self._start = array("q")
+        self._end = array("q")
+        self._padding = array("B")
+        self._extension = array("H")
+        self._runs: dict[int, array] = {}
+        self._bad: dict[int, dict[int, str]] = {}
+        self._headers: dict[int, dict] = {}
+        self._irregular: dict[int, dict] = {}
+        self._by_folder: dict[int, dict[str, int]] = {}
+        self._alive = BitSet()
+        self._free: list[int] = []
+        self._text_bytes = 0
+        self.checked.clear()
+        self.verified.clear()
+        self.search.clear()
+
+    def __len__(self) -> int:
+        return len(self._alive)
+
+    def __contains__(self, slot) -> bool:
+        return slot in self._alive
+
+    def slots(self):
+        return iter(self._alive)
+
+    def _intern_folder(self, dirpath) -> int:
+        folder_id = self._folder_ids.get(dirpath)
+        if folder_id is None:
+            folder_id = len(self._folders)
+            self._folders.append(dirpath)
+            self._folder_names.append(Path(dirpath).name or dirpath)
+            self._folder_ids[dirpath] = folder_id
+            self._text_bytes += FOLDER_BYTES + sys.getsizeof(dirpath) + sys.getsizeof(self._folder_names[-1])
+        return folder_id
+
+    def _intern_extension(self, extension) -> int:
+        extension_id = self._extension_ids.get(extension)
+        if extension_id is None:
+            extension_id = len(self._extensions)
+            self._extensions.append(extension)
+            self._extension_ids[extension] = extension_id
+        return extension_id
+
+    def _write(self, slot, seq) -> None:
+        folder_id = self._intern_folder(seq["folder"])
+        key = sys.intern(seq["seq_key"])
+        self._text_bytes += sys.getsizeof(key) - (sys.getsizeof(self._key[slot]) if slot < len(self._key) else 0)
+        first_name = os.path.basename(seq["first_file"])
+        match = FRAME_RE.match(first_name)
+        padding = len(match.group(3)) if match else 0
+        values = (
+            (self._folder, folder_id),
+            (self._key, key),
+            (self._frames, int(seq["frames"])),
+            (self._start, int(seq["start_index"])),
+            (self._end, int(seq["end_index"])),
+            (self._padding, min(padding, 255)),
+            (self._extension, self._intern_extension(seq["extension"])),
+        )
+        for column, value in values:
+            if slot == len(column):
+                column.append(value)
+            else:
+                column[slot] = value
+        self._by_folder.setdefault(folder_id, {})[key] = slot
+        self._irregular.pop(slot, None)
+        runs = seq.get("frame_ranges") or [[self._start[slot], self._end[slot]]]
+        if len(runs) > 1:
+            self._runs[slot] = array("q", [frame for run in runs for frame in run])
+        else:
+            self._runs.pop(slot, None)
+        # Scanner records derive the first file and both patterns from one name
+        # match, so checking the first file name is enough to trust the rebuild.
+        stem, extension = self._stem(slot)
+        regular = (
+            match is not None
+            and padding < 256
+            and first_name == "{}{:0{}d}{}".format(stem, self._start[slot], padding, extension)
+            and seq.keys() == RECORD_KEYS
+            and runs[0][0] == self._start[slot]
+            and runs[-1][1] == self._end[slot]
+            and seq["missing"] == self.missing(slot)
+        )
+        if not regular:
+            self._irregular[slot] = dict(seq)
+        self.search.add(slot, self._folders[folder_id], key)
+
+    def add(self, seq) -> int:
+        slot = self._free.pop() if self._free else len(self._key)
+        self._write(slot, seq)
+        self._alive.add(slot)
+        return slot
+
+    def update(self, slot, seq) -> None:
+        folder_slots = self._by_folder.get(self._folder[slot])
+        if folder_slots is not None and folder_slots.get(self._key[slot]) == slot:
+            del folder_slots[self._key[slot]]
+        first_file = self.first_file(slot)
+        self._write(slot, seq)
+        self.clear_verification(slot)
+        if self.first_file(slot) != first_file:
+            self._headers.pop(slot, None)
+
+    def remove(self, slot) -> None:
+        if not self._alive.discard(slot):
+            return
+        folder_id = self._folder[slot]
+        folder_slots = self._by_folder.get(folder_id, {})
+        if folder_slots.get(self._key[slot]) == slot:
+            del folder_slots[self._key[slot]]
+            if not folder_slots:
+                del self._by_folder[folder_id]
+        self._irregular.pop(slot, None)
+        self._runs.pop(slot, None)
+        self._headers.pop(slot, None)
+        self.search.remove(slot)
+        self.clear_verification(slot)
+        self.checked.discard(slot)
+        self._free.append(slot)
+
+    def approx_bytes(self) -> int:
+        """Rough size of the store and its search index in bytes, for memory accounting.
+
+        Kept from counters rather than measured, so it is cheap enough to ask
+        on every cache insertion.
+        """
+        columns = (self._folder, self._frames, self._start, self._end, self._padding, self._extension)
+        per_slot = sum(column.itemsize for column in columns) + 8
+        entries = len(self._headers) + len(self._bad) + len(self._runs)
+        return (
+            per_slot * len(self._key)
+            + self._text_bytes
+            + RECORD_BYTES * len(self._irregular)
+            + ENTRY_BYTES * entries
+            + self.search.approx_bytes()
+        )
+
+    def slot_of(self, dirpath, seq_key):
+        """Return the slot listing ``seq_key`` in ``dirpath``, or ``None``."""
+        folder_id = self._folder_ids.get(dirpath)
+        if folder_id is None:
+            return None
+        return self._by_folder.get(folder_id, {}).get(seq_key)
+
+    def set_verification(self, slot, bad_frames) -> None:
+        """Record a finished verification: ``bad_frames`` maps frame number to failure status."""
+        self.verified.add(slot)
+        if bad_frames:
+            self._bad[slot] = dict(bad_frames)
+        else:
+            self._bad.pop(slot, None)
+
+    def clear_verification(self, slot) -> None:
+        self.verified.discard(slot)
+        self._bad.pop(slot, None)
+
+    def bad_frames(self, slot) -> dict[int, str]:
+        """Frames that failed verification, ``{}`` if none failed or the slot was never verified."""
+        return self._bad.get(slot, {})
+
+    def bad_count(self, slot) -> int:
+        """Number of failed frames, or ``-1`` if the slot has not been verified."""
+        if slot not in self.verified:
+            return -1
+        return len(self._bad.get(slot, ()))
+
+    def set_header(self, slot, metadata) -> None:
+        """Attach the header ``metadata`` of the row's first file; ``{}`` marks an unreadable header."""
+        self._headers[slot] = metadata
+
+    def header(self, slot):
+        """Header metadata of the row's first file, or ``None`` if it has not been read."""
+        return self._headers.get(slot)
+
+    def folder_slots(self, dirpath) -> dict[str, int]:
+        """Return a copy of ``{seq_key: slot}`` for the rows listed from ``dirpath``."""
+        folder_id = self._folder_ids.get(dirpath)
+        if folder_id is None:
+            return {}
+        return dict(self._by_folder.get(folder_id, {}))
+
+    def _stem(self, slot) -> tuple[str, str]:
+        key = self._key[slot]
+        extension_length = len(self._extensions[self._extension[slot]])
+        return key[: len(key) - extension_length], key[len(key) - extension_length :]
+
+    def _build(self, slot) -> dict:
+        folder = self._folders[self._folder[slot]]
+        stem, extension = self._stem(slot)
+        padding = self._padding[slot]
+        return {
+            "seq_key": self._key[slot],
+            "folder": folder,
+            "folder_name": self._folder_names[self._folder[slot]],
+            "first_file": os.path.join(folder, "{}{:0{}d}{}".format(stem, self._start[slot], padding, extension)),
+            "frames": self._frames[slot],
+            "start_index": self._start[slot],
+            "end_index": self._end[slot],
+            "extension": self._extensions[self._extension[slot]],
+            "pattern_printf": os.path.join(folder, "{}%0{}d{}".format(stem, padding, extension)),
+            "pattern_hash": os.path.join(folder, "{}{}{}".format(stem, "#" * padding, extension)),
+            "frame_ranges": self.frame_runs(slot),
+            "missing": self.missing(slot),
+        }
+
+    def get(self, slot):
+        """Return the record dict for ``slot`` (a fresh copy), or ``None`` if the slot is empty."""
+        if slot is None or slot not in self._alive:
+            return None
+        irregular = self._irregular.get(slot)
+        return dict(irregular) if irregular is not None else self._build(slot)
+
+    def display_name(self, slot) -> str:
+        return "{} / {}".format(self._folder_names[self._folder[slot]], self._key[slot])
+
+    def first_file(self, slot) -> str:
+        irregular = self._irregular.get(slot)
+        if irregular is not None:
+            return irregular["first_file"]
+        stem, extension = self._stem(slot)
+        name = "{}{:0{}d}{}".format(stem, self._start[slot], self._padding[slot], extension)
+        return os.path.join(self._folders[self._folder[slot]], name)
+
+    def frames(self, slot) -> int:
+        return self._frames[slot]
+
+    def frame_range(self, slot) -> tuple[int, int]:
+        return self._start[slot], self._end[slot]
+
+    def extension(self, slot) -> str:
+        return self._extensions[self._extension[slot]]
+
+    def frame_runs(self, slot) -> list[list[int]]:
+        runs = self._runs.get(slot)
+        if runs is None:
+            return [[self._start[slot], self._end[slot]]]
+        return [[runs[index], runs[index + 1]] for index in range(0, len(runs), 2)]
+
+    def missing(self, slot) -> int:
+        """Frames absent between the first and last frame."""
+        return self._end[slot] - self._start[slot] + 1 - self._frames[slot]
+
+    def sort_key(self, field):
+        """Return a ``key(slot)`` function ordering rows by ``field``, ties broken by name."""
+        if field == FIELD_FRAMES:
+            return lambda slot: (self._frames[slot], self.display_name(slot).lower())
+        if field == FIELD_RANGE:
+            return lambda slot: (self._start[slot], self._end[slot], self.display_name(slot).lower())
+        if field == FIELD_EXTENSION:
+            return lambda slot: (self.extension(slot), self.display_name(slot).lower())
+        if field == FIELD_MISSING:
+            return lambda slot: (self.missing(slot), self.display_name(slot).lower())
+        if field == FIELD_VERIFIED:
+            return lambda slot: (self.bad_count(slot), self.display_name(slot).lower())
+        if field in HEADER_FIELDS:
+            header_key = self._header_key(field)
+            return lambda slot: (header_key(self._headers.get(slot)), self.display_name(slot).lower())
+        return lambda slot: self.display_name(slot).lower()
+
+    @staticmethod
+    def _header_key(field):
+        # Rows whose header has not been read sort before every read one.
+        if field == FIELD_RESOLUTION:
+            return lambda header: (header["width"] * header["height"], header["width"]) if header else (-1, -1)
+        if field == FIELD_CHANNELS:
+            return lambda header: len(header["channels"]) if header else -1
+        if field == FIELD_DEPTH:
+            return lambda header: (header["bit_depth"], header["sample"]) if header else (-1, "")
+        return lambda header: header["compression"] if header else ""
+
+    def matcher(self, field, text):
+        """Return a ``match(slot)`` predicate for filter ``text`` on ``field``, or ``None`` to accept everything.
+
+        Name matches a case-insensitive substring of the folder path plus
+        sequence key, looked up in the :class:`~element_browser.search.SearchIndex`;
+        extension matches a substring too. Frames accepts a
+        count or bounds (``100``, ``10-50``, ``>=24``); range accepts a frame
+        number or span and matches sequences that overlap it; missing takes
+        bounds on the number of missing frames.
+        """
+        text = text.strip()
+        if not text:
+            return None
+        if field == FIELD_NAME:
+            return self.search.matcher(text)
+        if field == FIELD_EXTENSION:
+            needle = text.lower().lstrip(".")
+            return lambda slot: needle in self.extension(slot)
+        bounds = parse_bounds(text)
+        if bounds is None:
+            return lambda slot: False
+        low, high = bounds
+        low = float("-inf") if low is None else low
+        high = float("inf") if high is None else high
+        if field == FIELD_FRAMES:
+            return lambda slot: low <= self._frames[slot] <= high
+        if field == FIELD_MISSING:
+            return lambda slot: low <= self.missing(slot) <= high
+        return lambda slot: self._start[slot] <= high and self._end[slot] >= low
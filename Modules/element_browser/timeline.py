@@ -0,0 +1,268 @@
+"""Timeline assembly for imported clips: one lookup of the project's names, then batched appends.
+
+Probing ``CreateEmptyTimeline`` until a name is free costs a Resolve call per
+taken name, and a single ``AppendToTimeline`` with every clip leaves Resolve to
+place them. :class:`TimelineAssembly` lists the project's timeline names once,
+picks free names locally, and appends clip-info lists in batches with explicit
+record frames, so each clip lands where the plan says. Clips go into one
+combined timeline or one timeline per shot folder, and the time spent creating
+and appending is kept per stage.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from .index import root_for
+from .media_import import _clip_uid
+
+MODE_COMBINED = "combined"
+MODE_PER_SHOT = "per_shot"
+TIMELINE_MODES = (MODE_COMBINED, MODE_PER_SHOT)
+STAGE_IMPORT = "import"
+STAGE_CREATE = "create"
+STAGE_APPEND = "append"
+STAGES = (STAGE_IMPORT, STAGE_CREATE, STAGE_APPEND)
+DEFAULT_APPEND_BATCH_SIZE = 100
+# Resolve's default timeline start, 01:00:00:00 at 24 fps, used when a timeline cannot report its own.
+DEFAULT_START_FRAME = 86400
+# ``CreateEmptyTimeline`` retries when a name turns out to be taken after all (a timeline added since the lookup).
+NAME_ATTEMPTS = 100
+
+
+def shot_folder(folder, roots=()) -> str:
+    """The shot a sequence folder belongs to: its first folder below the shot root holding it.
+
+    A folder directly in a root is its own shot, as is one under no root.
+    """
+    root = root_for(folder, roots)
+    if root is None:
+        return folder
+    relative = os.path.relpath(folder, root)
+    if relative in (os.curdir, ""):
+        return root
+    return os.path.join(root, relative.split(os.sep, 1)[0])
+
+
+def unique_name(base, taken) -> str:
+    """``base``, or the first of ``base_2``, ``base_3``, ... not in ``taken``."""
+    name = base
+    suffix = 1
+    while name in taken:
+        suffix += 1
+        name = "{}_{}".format(base, suffix)
+    return name
+
+
+def clip_frames(clip):
+    """A media pool clip's length in frames from its ``Frames`` or ``Start``/``End`` properties; ``None`` if unknown."""
+    try:
+        frames = clip.GetClipProperty("Frames")
+        if frames not in (None, ""):
+            return max(1, int(frames))
+    except Exception:
+        pass
+    try:
+        start = int(clip.GetClipProperty("Start"))
+        end = int(clip.GetClipProperty("End"))
+    except Exception:
+        return None
+    return end - start + 1 if end >= start else None
+
+
+def timeline_groups(entries, base_name, mode=MODE_COMBINED, roots=()) -> list[tuple]:
+    """``(name, clips)`` per timeline to build from ``(folder, clips)`` entries, in entry order.
+
+    :data:`MODE_COMBINED` puts every clip in one timeline called ``base_name``;
+    :data:`MODE_PER_SHOT` makes one per :func:`shot_folder`, named after it.
+    Shots are told apart by their full path, so ``sh010`` under two roots
+    makes two timelines of the same name, which
+    :meth:`TimelineAssembly.plan` then gives free names. Entries without a
+    folder join the ``base_name`` timeline. A clip shared by several entries
+    is placed once per timeline.
+    """
+    groups: dict = {}
+    for folder, clips in entries:
+        shot = shot_folder(folder, roots).rstrip("\\/") if mode == MODE_PER_SHOT and folder else ""
+        name = os.path.basename(shot)
+        # Keyed by the shot's path; ``None`` is the base_name timeline.
+        name, group, uids = groups.setdefault(shot if name else None, (name or base_name, [], set()))
+        for clip in clips:
+            uid = _clip_uid(clip)
+            if uid not in uids:
+                uids.add(uid)
+                group.append(clip)
+    return [(name, clips) for name, clips, _uids in groups.values() if clips]
+
+
+class TimelinePlan:
+    """One timeline to build: its free name, its clips, and what building it achieved."""
+
+    def __init__(self, base_name, name, clips) -> None:
+        self.base_name = base_name
+        self.name = name
+        self.clips = clips
+        self.timeline = None
+        self.record_start = DEFAULT_START_FRAME
+        self.appended = 0
+
+    def placements(self, length=clip_frames) -> tuple[list, list]:
+        """``(placed, unplaced)``: ``(clip, record_offset, frames)`` back to back, then clips of unknown length."""
+        placed = []
+        unplaced = []
+        offset = 0
+        for clip in self.clips:
+            frames = length(clip)
+            if frames is None:
+                unplaced.append(clip)
+                continue
+            placed.append((clip, offset, frames))
+            offset += frames
+        return placed, unplaced
+
+    def describe(self) -> str:
+        return "'{}' {} of {} clip(s)".format(self.name, self.appended, len(self.clips))
+
+
+def clip_info(clip, record_frame, frames, track_index=1) -> dict:
+    """An ``AppendToTimeline`` clip-info entry placing all of ``clip`` at ``record_frame``."""
+    return {
+        "mediaPoolItem": clip,
+        "startFrame": 0,
+        "endFrame": frames - 1,
+        "trackIndex": track_index,
+        "recordFrame": record_frame,
+    }
+
+
+class TimelineAssembly:
+    """Builds :class:`TimelinePlan` timelines in a media pool with a fixed number of Resolve calls per timeline.
+
+    ``project`` supplies the existing timeline names; without it names are
+    only found taken when ``CreateEmptyTimeline`` refuses them. A
+    ``dry_run`` assembly plans names and record frames but never creates or
+    appends. Built plans collect in :attr:`plans`; seconds spent per stage
+    accumulate in :attr:`stages` and, with a ``recorder`` (a diagnostics
+    channel), as one sample per stage call.
+    """
+
+    def __init__(self, media_pool, project=None, batch_size=DEFAULT_APPEND_BATCH_SIZE, dry_run=False,
+                 recorder=None, length=clip_frames) -> None:
+        self.media_pool = media_pool
+        self.project = project
+        self.batch_size = max(1, int(batch_size))
+        self.dry_run = dry_run
+        self.recorder = recorder
+        self.length = length
+        self.stages: dict[str, float] = {}
+        self.plans: list[TimelinePlan] = []
+        self._taken = None
+
+    @contextmanager
+    def stage(self, name, label=None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            if self.recorder is not None:
+                self.recorder.record(started, elapsed, label or name)
+
+    def add_stage(self, name, seconds) -> None:
+        """Count ``seconds`` spent elsewhere (such as the import itself) under stage ``name``."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def taken_names(self) -> set[str]:
+        """The project's timeline names, listed once per assembly."""
+        if self._taken is None:
+            self._taken = set()
+            project = self.project
+            try:
+                count = int(project.GetTimelineCount()) if project is not None else 0
+            except Exception:
+                count = 0
+            # Timeline indices are 1-based.
+            for index in range(1, count + 1):
+                try:
+                    timeline = project.GetTimelineByIndex(index)
+                    if timeline:
+                        self._taken.add(timeline.GetName())
+                except Exception:
+                    continue
+        return self._taken
+
+    def plan(self, groups) -> list[TimelinePlan]:
+        """A plan per ``(base_name, clips)`` group, each given a name free in the project and among the others."""
+        taken = self.taken_names()
+        plans = []
+        for base_name, clips in groups:
+            name = unique_name(base_name, taken)
+            taken.add(name)
+            plans.append(TimelinePlan(base_name, name, list(clips)))
+        return plans
+
+    def build(self, groups) -> list[TimelinePlan]:
+        """Plan ``groups``, then create and fill each timeline; a plan whose timeline failed keeps ``timeline=None``."""
+        with self.stage(STAGE_CREATE, "names"):
+            plans = self.plan(groups)
+        self.plans.extend(plans)
+        if self.dry_run:
+            return plans
+        for plan in plans:
+            with self.stage(STAGE_CREATE, plan.name):
+                plan.timeline = self._create(plan)
+            if plan.timeline is None:
+                print("[Shot Loader] Could not create timeline '{}'".format(plan.base_name))
+                continue
+            with self.stage(STAGE_APPEND, plan.name):
+                self._append(plan)
+        return plans
+
+    def _create(self, plan):
+        taken = self.taken_names()
+        for _attempt in range(NAME_ATTEMPTS):
+            try:
+                timeline = self.media_pool.CreateEmptyTimeline(plan.name)
+            except Exception:
+                timeline = None
+            if timeline:
+                break
+            taken.add(plan.name)
+            plan.name = unique_name(plan.base_name, taken)
+        else:
+            return None
+        taken.add(plan.name)
+        if self.project is not None:
+            try:
+                self.project.SetCurrentTimeline(timeline)
+            except Exception:
+                pass
+        try:
+            plan.record_start = int(timeline.GetStartFrame())
+        except Exception:
+            plan.record_start = DEFAULT_START_FRAME
+        return timeline
+
+    def _append(self, plan) -> None:
+        placed, unplaced = plan.placements(self.length)
+        infos = [clip_info(clip, plan.record_start + offset, frames) for clip, offset, frames in placed]
+        for start in range(0, len(infos), self.batch_size):
+            plan.appended += self._append_call(infos[start:start + self.batch_size])
+        if unplaced:
+            # Without a known length a clip cannot be given a record frame; Resolve places it after the rest.
+            plan.appended += self._append_call(unplaced)
+
+    def _append_call(self, batch) -> int:
+        try:
+            result = self.media_pool.AppendToTimeline(batch)
+        except Exception as exc:
+            print("[Shot Loader] AppendToTimeline error: {}".format(exc))
+            return 0
+        if isinstance(result, (list, tuple)):
+            return len([item for item in result if item])
+        return len(batch) if result else 0
+
+    def describe_stages(self) -> str:
+        """Seconds per stage in :data:`STAGES` order, such as ``import 1.20s, create 0.01s, append 0.03s``."""
+        return ", ".join("{} {:.2f}s".format(name, self.stages[name]) for name in STAGES if name in self.stages)
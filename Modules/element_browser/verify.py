@@ -0,0 +1,86 @@
+"""Background verification of sequence frames.
+
+Listing a directory proves a frame's name exists, not that the render
+finished. A verification pass stats every frame and checks the end of the file
+for the format's terminator, so partial renders can be kept out of playback
+and import. It is optional and runs on a thread pool because on network
+storage every check is a round trip.
+"""
+
+import os
+import struct
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .exr import ExrError, exr_chunks_complete
+
+FRAME_OK = "ok"
+FRAME_MISSING = "missing"
+FRAME_EMPTY = "empty"
+FRAME_TRUNCATED = "truncated"
+DEFAULT_VERIFY_WORKERS = 8
+
+PNG_TRAILER = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+JPEG_EOI = b"\xff\xd9"
+TAIL_BYTES = 64
+
+
+def _read_tail(path, size) -> bytes:
+    with open(path, "rb") as handle:
+        handle.seek(max(0, size - TAIL_BYTES))
+        return handle.read()
+
+
+def check_frame(path) -> str:
+    """Classify one frame as ``ok``, ``missing``, ``empty`` or ``truncated``."""
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return FRAME_MISSING
+    if size == 0:
+        return FRAME_EMPTY
+
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".exr":
+            return FRAME_OK if exr_chunks_complete(path) else FRAME_TRUNCATED
+        if extension == ".png":
+            return FRAME_OK if _read_tail(path, size).endswith(PNG_TRAILER) else FRAME_TRUNCATED
+        if extension in (".jpg", ".jpeg"):
+            # Some writers pad after the end-of-image marker.
+            return FRAME_OK if _read_tail(path, size).rstrip(b"\x00").endswith(JPEG_EOI) else FRAME_TRUNCATED
+    except FileNotFoundError:
+        return FRAME_MISSING
+    except (OSError, ExrError, ValueError, struct.error):
+        return FRAME_TRUNCATED
+    return FRAME_OK
+
+
+def verify_frames(frames, workers=DEFAULT_VERIFY_WORKERS, should_stop=None):
+    """Check ``(frame, path)`` pairs in parallel and yield ``(frame, status)`` for each, in completion order.
+
+    At most ``2 * workers`` checks are in flight, so a huge sequence does not
+    queue one future per frame up front. ``should_stop`` is polled between
+    completions; queued checks are dropped when it returns true.
+    """
+    frames = iter(frames)
+    workers = max(1, int(workers))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-verify") as pool:
+        pending = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * workers:
+                try:
+                    frame, path = next(frames)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[pool.submit(check_frame, path)] = frame
+            if not pending:
+                return
+            done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+            if should_stop and should_stop():
+                for future in pending:
+                    future.cancel()
+                return
@@ -0,0 +1,326 @@
+"""Directory watching for renders that land while the panel is open.
+
+Backends report *dirty directories*; nothing here parses sequences. The panel
+coalesces dirty directories, re-lists just those after a debounce with
+:func:`rescan_directories`, and patches the list in place.
+
+``inotify`` (Linux, via ``ctypes``) and polling of directory mtimes are
+implemented here. On other platforms the panel uses ``QFileSystemWatcher``.
+Network mounts rarely deliver change notifications, so paths on them are
+polled, and directories a notifying backend refuses (watch limits) fall back
+to polling too.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+
+from .scan import list_directory, sequences_in_directory
+
+BACKEND_AUTO = "auto"
+BACKEND_INOTIFY = "inotify"
+BACKEND_QT = "qt"
+BACKEND_POLL = "poll"
+DEFAULT_POLL_INTERVAL = 5.0
+
+NETWORK_FS_TYPES = {
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p", "ceph", "glusterfs", "lustre", "gpfs", "beegfs",
+    "fuse.sshfs", "fuse.glusterfs", "fuse.cephfs", "fuse.rclone",
+}
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class DirtySet:
+    """Thread-safe set of dirty directories that signals only when it stops being empty.
+
+    A render writing a hundred frames a second marks the same directory dirty
+    a hundred times; the callback fires once and the consumer takes the whole
+    set when it is ready.
+    """
+
+    def __init__(self, on_dirty=None) -> None:
+        self.on_dirty = on_dirty
+        self._paths: set = set()
+        self._lock = threading.Lock()
+
+    def add(self, paths) -> None:
+        with self._lock:
+            was_empty = not self._paths
+            self._paths.update(paths)
+            notify = was_empty and bool(self._paths)
+        if notify and self.on_dirty:
+            self.on_dirty()
+
+    def take(self) -> set:
+        with self._lock:
+            paths, self._paths = self._paths, set()
+        return paths
+
+
+def _mount_table():
+    try:
+        with open("/proc/self/mounts", encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                fields = line.split()
+                if len(fields) >= 3:
+                    yield fields[1].replace("\\040", " "), fields[2]
+    except OSError:
+        return
+
+
+def is_network_path(path) -> bool:
+    """Best-effort check for paths on network storage, where change notifications are unreliable."""
+    path = os.path.abspath(path)
+    if path.startswith(("\\\\", "//")):
+        return True
+    if sys.platform == "win32":
+        drive = os.path.splitdrive(path)[0]
+        if drive:
+            try:
+                return ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == 4  # DRIVE_REMOTE
+            except Exception:
+                return False
+        return False
+    best, fs_type = "", ""
+    for mount_point, mount_type in _mount_table():
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, fs_type = mount_point, mount_type
+    return fs_type in NETWORK_FS_TYPES
+
+
+def choose_backend(root, requested=BACKEND_AUTO) -> str:
+    """Pick the backend for watching ``root``: the requested one, or inotify/Qt locally and polling on network mounts."""
+    if requested in (BACKEND_INOTIFY, BACKEND_QT, BACKEND_POLL):
+        if requested == BACKEND_INOTIFY and not sys.platform.startswith("linux"):
+            return BACKEND_QT
+        return requested
+    if is_network_path(root):
+        return BACKEND_POLL
+    return BACKEND_INOTIFY if sys.platform.startswith("linux") else BACKEND_QT
+
+
+class PollingWatcher:
+    """Stat every watched directory each ``interval`` seconds and report those whose mtime changed."""
+
+    def __init__(self, dirty, interval=DEFAULT_POLL_INTERVAL) -> None:
+        self.dirty = dirty
+        self.interval = float(interval)
+        self._mtimes: dict = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="watch-poll", daemon=True)
+        self._thread.start()
+
+    def add(self, paths) -> list:
+        with self._lock:
+            for path in paths:
+                if path not in self._mtimes:
+                    self._mtimes[path] = self._mtime(path)
+        return []
+
+    def remove(self, paths) -> None:
+        with self._lock:
+            for path in paths:
+                self._mtimes.pop(path, None)
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def __len__(self) -> int:
+        return len(self._mtimes)
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                paths = list(self._mtimes)
+            changed = []
+            for path in paths:
+                if self._stop.is_set():
+                    return
+                mtime = self._mtime(path)
+                with self._lock:
+                    if path in self._mtimes and self._mtimes[path] != mtime:
+                        self._mtimes[path] = mtime
+                        changed.append(path)
+            if changed:
+                self.dirty.add(changed)
+
+
+class InotifyWatcher:
+    """Linux inotify on a reader thread; one watch per directory, not recursive.
+
+    ``add`` returns the paths the kernel refused (usually
+    ``fs.inotify.max_user_watches``) so the caller can poll them instead.
+    """
+
+    def __init__(self, dirty) -> None:
+        self.dirty = dirty
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: dict = {}
+        self._watches: dict = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="watch-inotify", daemon=True)
+        self._thread.start()
+
+    def add(self, paths) -> list:
+        refused = []
+        with self._lock:
+            for path in paths:
+                if path in self._watches:
+                    continue
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+                if wd < 0:
+                    if ctypes.get_errno() != errno.ENOENT:
+                        refused.append(path)
+                    continue
+                self._paths[wd] = path
+                self._watches[path] = wd
+        return refused
+
+    def remove(self, paths) -> None:
+        with self._lock:
+            for path in paths:
+                wd = self._watches.pop(path, None)
+                if wd is not None:
+                    self._paths.pop(wd, None)
+                    self._libc.inotify_rm_watch(self._fd, wd)
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                readable, _w, _x = select.select([self._fd], [], [], 0.5)
+                if not readable:
+                    continue
+                try:
+                    data = os.read(self._fd, 65536)
+                except BlockingIOError:
+                    continue
+                self.dirty.add(self._parse(data))
+        finally:
+            os.close(self._fd)
+
+    def _parse(self, data) -> set:
+        dirty = set()
+        offset = 0
+        with self._lock:
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + name_len
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; every watched directory may have changed.
+                    dirty.update(self._watches)
+                    continue
+                path = self._paths.get(wd)
+                if path is None:
+                    continue
+                if mask & IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    self._watches.pop(path, None)
+                dirty.add(path)
+        return dirty
+
+
+class DirectoryWatcher:
+    """A notifying backend plus a polling fallback, both feeding one :class:`DirtySet`.
+
+    ``primary`` is any object with ``add(paths) -> refused``, ``remove`` and
+    ``close``; ``None`` polls everything.
+    """
+
+    def __init__(self, dirty, primary=None, poll_interval=DEFAULT_POLL_INTERVAL) -> None:
+        self.dirty = dirty
+        self.primary = primary
+        self.poller = PollingWatcher(dirty, poll_interval)
+
+    def add(self, paths, poll=False) -> None:
+        """Watch ``paths`` with the primary backend, or poll them if ``poll`` is set or it refuses them."""
+        paths = list(paths)
+        refused = self.primary.add(paths) if self.primary is not None and not poll else paths
+        if refused:
+            self.poller.add(refused)
+
+    def remove(self, paths) -> None:
+        paths = list(paths)
+        if self.primary is not None:
+            self.primary.remove(paths)
+        self.poller.remove(paths)
+
+    def close(self) -> None:
+        if self.primary is not None:
+            self.primary.close()
+        self.poller.close()
+
+    def counts(self) -> tuple:
+        """``(notified, polled)`` directory counts."""
+        return (len(self.primary) if self.primary is not None else 0), len(self.poller)
+
+
+def rescan_directories(dirpaths, known, should_stop=None, max_depth=None, root=None):
+    """Re-list dirty directories and walk any new subdirectories below them.
+
+    Yields ``(dirpath, mtime_ns, subdirs, records)``; a directory that can no
+    longer be listed yields ``(dirpath, None, None, None)``. ``known`` holds
+    the directories already listed, so only new ones are descended into.
+    """
+    stack = list(dirpaths)
+    seen = set()
+    while stack:
+        if should_stop and should_stop():
+            return
+        dirpath = stack.pop()
+        if dirpath in seen:
+            continue
+        seen.add(dirpath)
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        listing = list_directory(dirpath) if mtime_ns is not None else None
+        if listing is None:
+            yield dirpath, None, None, None
+            continue
+        subdirs, names = listing
+        yield dirpath, mtime_ns, subdirs, sequences_in_directory(dirpath, names)
+        for subdir in subdirs:
+            if subdir in known:
+                continue
+            if max_depth is not None and root is not None:
+                depth = os.path.relpath(subdir, root).count(os.sep) + 1
+                if depth > max_depth:
+                    continue
+            stack.append(subdir)
@@ -1,80 +1,729 @@
+import bisect
+import getpass
+import math
 import os
-import re
 import sys
+import threading
+import time
+from array import array
 from pathlib import Path
-from typing import List
 
-# Resolve API
-sys.path.append(r"C:\ProgramData\Blackmagic Design\DaVinci Resolve\Support\Developer\Scripting\Modules")
+# Single instance: a resident panel keeps its scan, caches and Resolve
+# connection, so a re-launch only asks it to show itself. This runs before
+# the heavy imports below so the hand-off costs milliseconds.
+RESIDENT = os.environ.get("ELEMENT_BROWSER_RESIDENT", "1") != "0"
+RESIDENT_CONNECT_MS = 250
+RESIDENT_SHOW = "show"
+RESIDENT_QUIT = "quit"
 try:
-    import DaVinciResolveScript as dvr
+    _user = getpass.getuser()
 except Exception:
-    dvr = None
+    _user = "user"
+SERVER_NAME = os.environ.get("ELEMENT_BROWSER_SERVER") or "ElementBrowser-{}".format(_user)
+
+
+def notify_resident_panel(command) -> bool:
+    from PySide6.QtNetwork import QLocalSocket
+
+    socket = QLocalSocket()
+    socket.connectToServer(SERVER_NAME)
+    if not socket.waitForConnected(RESIDENT_CONNECT_MS):
+        return False
+    socket.write((command + "\n").encode())
+    socket.waitForBytesWritten(RESIDENT_CONNECT_MS)
+    socket.disconnectFromServer()
+    return True
+
+
+if "--quit" in sys.argv[1:]:
+    notify_resident_panel(RESIDENT_QUIT)
+    sys.exit(0)
+if RESIDENT and notify_resident_panel(RESIDENT_SHOW):
+    sys.exit(0)
+
+try:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Modules"))
+except NameError:
+    pass
+
+from element_browser.diagnostics import (
+    CHANNEL_DECODE,
+    CHANNEL_FILTER,
+    CHANNEL_HEADER,
+    CHANNEL_IMPORT,
+    CHANNEL_PLAYBACK_DROPPED,
+    CHANNEL_PLAYBACK_TICK,
+    CHANNEL_SCALE,
+    CHANNEL_SCAN_DIRECTORY,
+    CHANNEL_TIMELINE,
+    DEFAULT_SAMPLES,
+    PERCENTILES,
+    Diagnostics,
+)
+from element_browser.exr import DEFAULT_EXR_CACHE_MB, PREVIEWS_AVAILABLE, ExrPreviewReader
+from element_browser.index import ScanIndex, iter_incremental_scan, root_for
+from element_browser.memory import DEFAULT_MEMORY_BUDGET_MB, MemoryBudget, process_rss
+from element_browser.media_import import (
+    REIMPORT_POLICIES,
+    REIMPORT_SKIP,
+    ClipIndex,
+    MediaImporter,
+    source_key,
+    switch_bin,
+)
+from element_browser.metadata import DEFAULT_HEADER_WORKERS, HeaderCache, describe_metadata
+from element_browser.playback import (
+    DEFAULT_CACHE_MB,
+    DEFAULT_DECODE_WORKERS,
+    DEFAULT_READ_AHEAD,
+    MODE_EVERY_FRAME,
+    MODE_REALTIME,
+    PLAYBACK_MODES,
+    FrameCache,
+    PlaybackClock,
+    ReadAheadDecoder,
+)
+from element_browser.proxies import (
+    DEFAULT_PROXY_CACHE_MB,
+    DEFAULT_PROXY_WORKERS,
+    LOCATION_BESIDE,
+    LOCATION_CENTRAL,
+    POSTER,
+    PRIORITY_INTERACTIVE,
+    PROXY,
+    PlaybackProxies,
+    ProxyStore,
+    beside_proxy_path,
+)
+from element_browser.resolve_api import ResolveConnection, prepare_import
+from element_browser.scan import (
+    DEFAULT_SCAN_WORKERS,
+    detect_sequences,
+    format_runs,
+    frame_runs,
+    missing_runs,
+)
+from element_browser.search import is_instant
+from element_browser.sequences import norm_path, sequence_frame_paths, sequence_frames, sequence_import_item
+from element_browser.store import (
+    FIELD_CHANNELS,
+    FIELD_COMPRESSION,
+    FIELD_DEPTH,
+    FIELD_EXTENSION,
+    FIELD_FRAMES,
+    FIELD_MISSING,
+    FIELD_NAME,
+    FIELD_RANGE,
+    FIELD_RESOLUTION,
+    FIELD_VERIFIED,
+    FIELDS,
+    HEADER_FIELDS,
+    SequenceStore,
+    select_slots,
+)
+from element_browser.timeline import (
+    MODE_COMBINED,
+    MODE_PER_SHOT,
+    STAGE_IMPORT,
+    TIMELINE_MODES,
+    TimelineAssembly,
+    timeline_groups,
+)
+from element_browser.verify import DEFAULT_VERIFY_WORKERS, FRAME_OK, verify_frames
+from element_browser.watch import (
+    BACKEND_AUTO,
+    BACKEND_INOTIFY,
+    BACKEND_POLL,
+    BACKEND_QT,
+    DEFAULT_POLL_INTERVAL,
+    DirectoryWatcher,
+    DirtySet,
+    InotifyWatcher,
+    choose_backend,
+    rescan_directories,
+)
 
 # Qt
-from PySide6.QtCore import QCoreApplication, Qt, QTimer
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QCoreApplication,
+    QFileSystemWatcher,
+    QItemSelectionModel,
+    QModelIndex,
+    QObject,
+    QPoint,
+    QThread,
+    Qt,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+from PySide6.QtNetwork import QLocalServer
 from PySide6.QtWidgets import (
     QApplication,
+    QCheckBox,
+    QComboBox,
     QFileDialog,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QPushButton,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QTextEdit,
     QVBoxLayout,
     QWidget,
     QProgressBar,
     QDialog,  # Added
+    QDoubleSpinBox,
     QSpinBox,
+    QSlider,
+    QTableWidget,
+    QTableWidgetItem,
+    QTabWidget,
 )
 
 
 DEFAULT_ROOT = r"D:\Projects"
-SEQ_EXTENSIONS: set[str] = {".exr", ".png", ".jpg", ".jpeg"}
+# Shot roots listed side by side, separated by os.pathsep; DEFAULT_ROOT when unset.
+START_ROOTS = [
+    root for root in os.environ.get("ELEMENT_BROWSER_ROOTS", DEFAULT_ROOT).split(os.pathsep) if os.path.isdir(root)
+]
+SCAN_BATCH_SIZE = 200
+SCAN_BATCH_INTERVAL = 0.25
+SCAN_PROGRESS_INTERVAL = 0.1
+SCAN_WORKERS = int(os.environ.get("ELEMENT_BROWSER_SCAN_WORKERS", DEFAULT_SCAN_WORKERS))
+PLAYBACK_CACHE_MB = int(os.environ.get("ELEMENT_BROWSER_PLAYBACK_CACHE_MB", DEFAULT_CACHE_MB))
+PLAYBACK_READ_AHEAD = DEFAULT_READ_AHEAD
+PLAYBACK_DECODE_WORKERS = DEFAULT_DECODE_WORKERS
+PLAYBACK_MODE = os.environ.get("ELEMENT_BROWSER_PLAYBACK_MODE", MODE_REALTIME)
+if PLAYBACK_MODE not in PLAYBACK_MODES:
+    PLAYBACK_MODE = MODE_REALTIME
+PLAYBACK_MODE_CHOICES = [("Realtime", MODE_REALTIME), ("Every frame", MODE_EVERY_FRAME)]
+# Frames searched back from the due one for something already decoded.
+PLAYBACK_CATCH_UP_SEARCH = 8
+PROXY_LOCATION = os.environ.get("ELEMENT_BROWSER_PROXY_LOCATION", LOCATION_CENTRAL)
+PROXY_CACHE_MB = int(os.environ.get("ELEMENT_BROWSER_PROXY_CACHE_MB", DEFAULT_PROXY_CACHE_MB))
+PROXY_JPEG_QUALITY = 85
+AUTO_POSTERS = os.environ.get("ELEMENT_BROWSER_AUTO_POSTERS", "1") != "0"
+EXR_PREVIEW_MAX_SIZE = 1024
+RESIZE_DEBOUNCE_MS = 150
+SEQUENCE_COLUMNS = [
+    "Sequence", "Frames", "Range", "Ext", "Missing", "Verified", "Resolution", "Channels", "Depth", "Compression"
+]
+VERIFIED_COLUMN = FIELDS.index(FIELD_VERIFIED)
+HEADER_COLUMNS = [FIELDS.index(field) for field in HEADER_FIELDS]
+# Channel lists up to this long show as letters ("RGBA"), longer ones as a count.
+HEADER_CHANNEL_LETTERS = 4
+HEADER_WORKERS = int(os.environ.get("ELEMENT_BROWSER_HEADER_WORKERS", DEFAULT_HEADER_WORKERS))
+HEADER_DEBOUNCE_MS = 100
+HEADER_REPAINT_MS = 50
+FILTER_CHOICES = [
+    ("Name", FIELD_NAME),
+    ("Frames", FIELD_FRAMES),
+    ("Range", FIELD_RANGE),
+    ("Ext", FIELD_EXTENSION),
+    ("Missing", FIELD_MISSING),
+]
+MISSING_TOOLTIP_RUNS = 20
+VERIFY_WORKERS = int(os.environ.get("ELEMENT_BROWSER_VERIFY_WORKERS", DEFAULT_VERIFY_WORKERS))
+VERIFY_PROGRESS_INTERVAL = 0.1
+SLOT_ROLE = Qt.UserRole
+SORTED_INSERT_LIMIT = 64
+FILTER_DEBOUNCE_MS = 150
+IMPORT_BIN_NAME = os.environ.get("ELEMENT_BROWSER_IMPORT_BIN") or time.strftime("Element Browser %Y-%m-%d")
+REIMPORT_POLICY = os.environ.get("ELEMENT_BROWSER_REIMPORT", REIMPORT_SKIP)
+if REIMPORT_POLICY not in REIMPORT_POLICIES:
+    REIMPORT_POLICY = REIMPORT_SKIP
+IMPORT_SLICE_MS = 40
+TIMELINE_MODE = os.environ.get("ELEMENT_BROWSER_TIMELINE_MODE", MODE_COMBINED)
+if TIMELINE_MODE not in TIMELINE_MODES:
+    TIMELINE_MODE = MODE_COMBINED
+TIMELINE_MODE_CHOICES = [("One timeline", MODE_COMBINED), ("Timeline per shot", MODE_PER_SHOT)]
+WATCH_ON_START = os.environ.get("ELEMENT_BROWSER_WATCH", "0") == "1"
+WATCH_BACKEND = os.environ.get("ELEMENT_BROWSER_WATCH_BACKEND", BACKEND_AUTO)
+WATCH_POLL_INTERVAL = float(os.environ.get("ELEMENT_BROWSER_WATCH_POLL_SECONDS", DEFAULT_POLL_INTERVAL))
+WATCH_DEBOUNCE_MS = 500
+MEMORY_BUDGET_MB = int(os.environ.get("ELEMENT_BROWSER_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET_MB))
+MEMORY_STATUS_MS = 1000
+# Decoded frames, EXR previews, the sequence list and the pixmap on screen share this budget.
+MEMORY = MemoryBudget(MEMORY_BUDGET_MB * 1024 * 1024)
+EXR_READER = ExrPreviewReader(DEFAULT_EXR_CACHE_MB * 1024 * 1024, pool=MEMORY) if PREVIEWS_AVAILABLE else None
+SCAN_MAX_DEPTH: int | None = (
+    int(os.environ["ELEMENT_BROWSER_SCAN_MAX_DEPTH"]) if os.environ.get("ELEMENT_BROWSER_SCAN_MAX_DEPTH") else None
+)
+DIAGNOSTICS = Diagnostics(
+    int(os.environ.get("ELEMENT_BROWSER_DIAGNOSTICS_SAMPLES", DEFAULT_SAMPLES)),
+    enabled=os.environ.get("ELEMENT_BROWSER_DIAGNOSTICS", "1") != "0",
+)
+DIAGNOSTICS_COLUMNS = ["Channel", "Count"] + ["p{} ms".format(pct) for pct in PERCENTILES] + ["Max ms", "Mean ms"]
+DIAGNOSTICS_REFRESH_MS = 1000
+
+
+# Connected on first use rather than at import, so launching the panel never
+# waits on Resolve. ``fu`` is injected when Resolve runs the script itself.
+RESOLVE = ResolveConnection(fusion=globals().get("fu"))
+
+
+def decode_exr(frame_path, max_size):
+    # Qt has no EXR reader by default; decode a subsampled RGB32 preview with NumPy instead.
+    if EXR_READER is None or not frame_path.lower().endswith(".exr"):
+        return None
+    pixels = EXR_READER.read_rgb32(frame_path, max_size)
+    if pixels is None:
+        return None
+    height, width = pixels.shape
+    return QImage(pixels.data, width, height, 4 * width, QImage.Format_RGB32).copy()
+
+
+def read_scaled(frame_path, width, height) -> QImage:
+    """Decode ``frame_path`` to fit ``width`` x ``height``, reading no more than the format needs.
+
+    EXR uses the subsampled preview read; for other formats the reader scales
+    while decoding (JPEG decodes at reduced DCT size), so full-resolution
+    pixels are never held.
+    """
+    image = decode_exr(frame_path, max(width, height))
+    if image is not None:
+        return image
+    reader = QImageReader(frame_path)
+    size = reader.size()
+    if size.isValid() and (size.width() > width or size.height() > height):
+        reader.setScaledSize(size.scaled(width, height, Qt.KeepAspectRatio))
+    return reader.read()
+
+
+def decode_frame(frame_path, size=None):
+    """Decode for display inside ``size`` (``(width, height)``, default the EXR preview size)."""
+    # QImage (unlike QPixmap) may be created off the GUI thread, so decode workers build these.
+    width, height = size or (EXR_PREVIEW_MAX_SIZE, EXR_PREVIEW_MAX_SIZE)
+    with DIAGNOSTICS.span(CHANNEL_DECODE, os.path.basename(frame_path)):
+        image = read_scaled(frame_path, width, height)
+    return None if image.isNull() else image
+
+
+def qimage_bytes(image) -> int:
+    return image.sizeInBytes()
+
+
+def render_proxy(source_path, target_path, max_size) -> bool:
+    image = read_scaled(source_path, max_size, max_size)
+    if image.isNull():
+        return False
+    if image.width() > max_size or image.height() > max_size:
+        image = image.scaled(max_size, max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image.save(target_path, "JPG", PROXY_JPEG_QUALITY)
+
+
+class SequenceScanWorker(QThread):
+    """Scans root folders off the GUI thread and streams per-directory results back in batches.
+
+    With an index, the last known state of the roots in ``emit_cached`` is
+    emitted first and each walk then only re-lists directories whose mtime
+    changed. Roots are walked one after another, with one running count of
+    directories and sequences across them. Every signal carries the
+    ``scan_id`` the worker was started with so the panel can drop late batches
+    from a scan it has already replaced.
+    """
+
+    dirs_ready = Signal(int, list)
+    dirs_removed = Signal(int, list)
+    progress = Signal(int, int, int, int, float)
+    scan_finished = Signal(int, int, int, int, bool)
+
+    def __init__(self, scan_id, roots, index=None, emit_cached=(), parent=None) -> None:
+        super().__init__(parent)
+        self.scan_id = scan_id
+        self.roots = list(roots)
+        self.index: ScanIndex | None = index
+        self.emit_cached = set(emit_cached)
+        self._cancel_event = threading.Event()
+        self.started = 0.0
+        self.dir_count = 0
+        self.rescanned = 0
+        self.seq_count = 0
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _emit_cached(self, cached) -> None:
+        batch: list[tuple[str, list[dict]]] = []
+        pending = 0
+        for dirpath, (_mtime_ns, _subdirs, records) in cached.items():
+            if not records:
+                continue
+            batch.append((dirpath, records))
+            pending += len(records)
+            if pending >= SCAN_BATCH_SIZE:
+                self.dirs_ready.emit(self.scan_id, batch)
+                batch = []
+                pending = 0
+        if batch:
+            self.dirs_ready.emit(self.scan_id, batch)
+
+    def _emit_progress(self) -> None:
+        self.progress.emit(
+            self.scan_id, self.dir_count, self.rescanned, self.seq_count, time.monotonic() - self.started
+        )
+
+    def run(self) -> None:
+        self.started = time.monotonic()
+        cached = {root: self.index.load(root) if self.index else {} for root in self.roots}
+        for root in self.roots:
+            if root in self.emit_cached and cached[root]:
+                self._emit_cached(cached[root])
+        for root in self.roots:
+            if self.is_cancelled():
+                break
+            self._scan_root(root, cached[root])
+        self._emit_progress()
+        self.scan_finished.emit(self.scan_id, self.dir_count, self.rescanned, self.seq_count, self.is_cancelled())
+
+    def _scan_root(self, root, cached) -> None:
+        last_batch = time.monotonic()
+        last_progress = last_batch
+        visited: set[str] = set()
+        changed: dict = {}
+        batch: list[tuple[str, list[dict]]] = []
+        pending = 0
+
+        for dirpath, mtime_ns, subdirs, records, is_changed in iter_incremental_scan(
+            root, cached, self.is_cancelled, SCAN_MAX_DEPTH, SCAN_WORKERS,
+            DIAGNOSTICS.channel(CHANNEL_SCAN_DIRECTORY),
+        ):
+            self.dir_count += 1
+            self.seq_count += len(records)
+            visited.add(dirpath)
+            if is_changed:
+                self.rescanned += 1
+                changed[dirpath] = (mtime_ns, subdirs, records)
+                previous = cached.get(dirpath)
+                if records or (previous and previous[2]):
+                    batch.append((dirpath, records))
+                    pending += len(records) or 1
+
+            now = time.monotonic()
+            if batch and (pending >= SCAN_BATCH_SIZE or now - last_batch >= SCAN_BATCH_INTERVAL):
+                self.dirs_ready.emit(self.scan_id, batch)
+                batch = []
+                pending = 0
+                last_batch = now
+            if now - last_progress >= SCAN_PROGRESS_INTERVAL:
+                self._emit_progress()
+                last_progress = now
+
+        if batch:
+            self.dirs_ready.emit(self.scan_id, batch)
+
+        removed: list[str] = []
+        if not self.is_cancelled():
+            removed = [path for path in cached if path not in visited]
+            gone = [path for path in removed if cached[path][2]]
+            if gone:
+                self.dirs_removed.emit(self.scan_id, gone)
+        if self.index:
+            self.index.save(root, changed, removed)
+
+
+class QtDirectoryWatcher:
+    """``QFileSystemWatcher`` backend for :class:`DirectoryWatcher` where inotify is unavailable."""
+
+    def __init__(self, dirty, parent=None) -> None:
+        self.dirty = dirty
+        self.watcher = QFileSystemWatcher(parent)
+        self.watcher.directoryChanged.connect(lambda path: self.dirty.add([path]))
+
+    def add(self, paths) -> list:
+        return list(self.watcher.addPaths(list(paths)))
+
+    def remove(self, paths) -> None:
+        if paths:
+            self.watcher.removePaths(list(paths))
+
+    def close(self) -> None:
+        directories = self.watcher.directories()
+        if directories:
+            self.watcher.removePaths(directories)
+
+    def __len__(self) -> int:
+        return len(self.watcher.directories())
+
+
+class WatchRescanWorker(QThread):
+    """Re-lists the directories a watcher reported, off the GUI thread."""
+
+    dirs_changed = Signal(int, list)
+
+    def __init__(self, watch_id, roots, dirpaths, known, parent=None) -> None:
+        super().__init__(parent)
+        self.watch_id = watch_id
+        self.roots = list(roots)
+        self.dirpaths = list(dirpaths)
+        self.known = known
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        # Depth limits count from the root each directory belongs to.
+        by_root: dict = {}
+        for dirpath in self.dirpaths:
+            by_root.setdefault(root_for(dirpath, self.roots), []).append(dirpath)
+        results = []
+        for root, dirpaths in by_root.items():
+            results.extend(rescan_directories(
+                dirpaths, self.known, self._cancel_event.is_set, SCAN_MAX_DEPTH, root
+            ))
+        if not self._cancel_event.is_set():
+            self.dirs_changed.emit(self.watch_id, results)
+
+
+def describe_bad_frames(bad_frames, limit=None) -> str:
+    """``truncated 1003, 1010-1011; empty 1020`` for a ``{frame: status}`` map."""
+    by_status: dict[str, list[int]] = {}
+    for frame, status in bad_frames.items():
+        by_status.setdefault(status, []).append(frame)
+    return "; ".join(
+        "{} {}".format(status, format_runs(frame_runs(sorted(frames)), limit))
+        for status, frames in sorted(by_status.items())
+    )
+
+
+def header_cell(header, field) -> str:
+    """Tree cell text for one header ``field``; blank until the header is read, ``?`` if it was unreadable."""
+    if header is None:
+        return ""
+    if not header:
+        return "?" if field == FIELD_RESOLUTION else ""
+    if field == FIELD_RESOLUTION:
+        return "{}x{}".format(header["width"], header["height"])
+    if field == FIELD_CHANNELS:
+        channels = header["channels"]
+        if set(channels) <= set("RGBA"):
+            # EXR lists channels alphabetically; show them in the usual order.
+            return "".join(name for name in "RGBA" if name in channels)
+        if len(channels) <= HEADER_CHANNEL_LETTERS and all(len(name) == 1 for name in channels):
+            return "".join(channels)
+        return "{} ch".format(len(channels))
+    if field == FIELD_DEPTH:
+        return "{}-bit".format(header["bit_depth"]) if header["sample"] == "uint" else header["sample"]
+    if field == FIELD_COMPRESSION:
+        return header["compression"]
+    return ""
+
+
+class FrameVerifyWorker(QThread):
+    """Checks the frames of a batch of sequences off the GUI thread.
+
+    ``jobs`` is a list of ``(folder, seq_key, [(frame, path), ...])``. Results
+    are emitted per sequence, keyed by folder and sequence key, so a row that
+    was rescanned in the meantime is matched by name rather than by position.
+    """
+
+    sequence_verified = Signal(int, str, str, object)
+    progress = Signal(int, int, int)
+    verify_finished = Signal(int, int, int, bool)
+
+    def __init__(self, verify_id, jobs, parent=None) -> None:
+        super().__init__(parent)
+        self.verify_id = verify_id
+        self.jobs = jobs
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self) -> None:
+        total = sum(len(frames) for _folder, _seq_key, frames in self.jobs)
+        checked = 0
+        bad_total = 0
+        verified = 0
+        last_progress = 0.0
+        for folder, seq_key, frames in self.jobs:
+            bad: dict[int, str] = {}
+            for frame, status in verify_frames(frames, VERIFY_WORKERS, self.is_cancelled):
+                checked += 1
+                if status != FRAME_OK:
+                    bad[frame] = status
+                now = time.monotonic()
+                if now - last_progress >= VERIFY_PROGRESS_INTERVAL:
+                    self.progress.emit(self.verify_id, checked, total)
+                    last_progress = now
+            if self.is_cancelled():
+                break
+            verified += 1
+            bad_total += len(bad)
+            self.sequence_verified.emit(self.verify_id, folder, seq_key, bad)
+        self.progress.emit(self.verify_id, checked, total)
+        self.verify_finished.emit(self.verify_id, verified, bad_total, self.is_cancelled())
 
 
-def get_resolve():
-    try:
-        resolve = dvr.scriptapp("Resolve")
-        if resolve:
-            return resolve
-    except Exception:
-        pass
+def format_fps(fps) -> str:
+    return "{:.3f}".format(fps).rstrip("0").rstrip(".")
 
-    try:
-        resolve = fu.GetResolve()  # noqa: F821
-        if resolve:
-            return resolve
-    except Exception:
-        pass
 
-    raise RuntimeError("Cannot connect to DaVinci Resolve.")
+def format_duration(seconds) -> str:
+    seconds = int(round(max(0.0, seconds)))
+    return "{}:{:02d}".format(seconds // 60, seconds % 60)
 
 
-try:
-    resolve = get_resolve()
-except Exception:
-    resolve = None
-project = None
-media_pool = None
+class ImportJob(QObject):
+    """Drives an :class:`ImportRun` from the GUI thread in short time slices.
 
-try:
-    project = resolve.GetProjectManager().GetCurrentProject()
-    if project:
-        media_pool = project.GetMediaPool()
-except Exception:
-    project = None
-    media_pool = None
+    Resolve's scripting API is called from the thread that owns the
+    connection, so instead of a worker thread the run is stepped from a
+    zero-interval timer: each tick performs Resolve calls until ``slice_ms``
+    has passed, then returns to the event loop. The session bin is made
+    current for the slice and the user's bin restored after it. An error
+    escaping the run ends the job as ``failed`` with the clips imported so
+    far, so the dialog and the import button are never left waiting.
+    """
+
+    progress = Signal(int, int, float, float)
+    import_finished = Signal(str)
+
+    RUNNING = "running"
+    PAUSED = "paused"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+    DONE = "done"
+
+    def __init__(self, run, media_pool, import_bin, slice_ms=IMPORT_SLICE_MS, parent=None) -> None:
+        super().__init__(parent)
+        self.run = run
+        self.media_pool = media_pool
+        self.import_bin = import_bin
+        self.slice_seconds = slice_ms / 1000.0
+        self.state = self.PAUSED
+        self.error = ""
+        self._steps = run.steps()
+        self._active_seconds = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self) -> None:
+        self.resume()
+
+    def pause(self) -> None:
+        if self.state == self.RUNNING:
+            self.state = self.PAUSED
+            self._timer.stop()
+
+    def resume(self) -> None:
+        if self.state == self.PAUSED:
+            self.state = self.RUNNING
+            self._timer.start()
+
+    def cancel(self) -> None:
+        if self.state in (self.RUNNING, self.PAUSED):
+            self._timer.stop()
+            self._steps.close()
+            self._finish(self.CANCELLED)
+
+    def active_seconds(self) -> float:
+        """Seconds spent importing, not counting pauses or the event loop between slices."""
+        return self._active_seconds
+
+    def rate(self) -> float:
+        return self.run.done / self._active_seconds if self._active_seconds else 0.0
+
+    def eta(self) -> float:
+        rate = self.rate()
+        return (self.run.total - self.run.done) / rate if rate else -1.0
+
+    def _tick(self) -> None:
+        if self.state != self.RUNNING:
+            return
+        started = time.perf_counter()
+        deadline = started + self.slice_seconds
+        previous_bin = None
+        try:
+            previous_bin = switch_bin(self.media_pool, self.import_bin)
+            while True:
+                next(self._steps)
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            self.state = self.DONE
+        except Exception as exc:
+            # Resolve calls outside ImportRun's own guards (clip lookups, a
+            # project closed mid-import) end the run; keep what it imported.
+            self.error = str(exc) or type(exc).__name__
+            self.state = self.FAILED
+            print("[Shot Loader] Import stopped after {} of {} sequence(s): {}".format(
+                self.run.done, self.run.total, self.error
+            ))
+        finally:
+            try:
+                switch_bin(self.media_pool, previous_bin)
+            except Exception as exc:
+                print("[Shot Loader] Could not restore the media pool bin: {}".format(exc))
+            self._active_seconds += time.perf_counter() - started
+        self.progress.emit(self.run.done, self.run.total, self.rate(), self.eta())
+        if self.state in (self.DONE, self.FAILED):
+            self._finish(self.state)
+        elif self.state == self.RUNNING:
+            self._timer.start()
+
+    def _finish(self, state) -> None:
+        self.state = state
+        self.import_finished.emit(state)
+
+
+class ResidentServer(QObject):
+    """Listens on ``SERVER_NAME`` for commands from later launches of the script.
+
+    Commands are newline-terminated words: ``show`` raises the panel and
+    ``quit`` closes it for good.
+    """
+
+    def __init__(self, panel) -> None:
+        super().__init__(panel)
+        self.panel = panel
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+
+    def listen(self) -> bool:
+        if self.server.listen(SERVER_NAME):
+            return True
+        # Nothing answered the launch handshake, so the socket is left over
+        # from a panel that did not exit cleanly.
+        QLocalServer.removeServer(SERVER_NAME)
+        if self.server.listen(SERVER_NAME):
+            return True
+        print("[Shot Loader] Single-instance server unavailable: {}".format(self.server.errorString()))
+        return False
+
+    def _on_new_connection(self) -> None:
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self._read(socket))
+            socket.disconnected.connect(socket.deleteLater)
+            if socket.bytesAvailable():
+                self._read(socket)
+
+    def _read(self, socket) -> None:
+        while socket.canReadLine():
+            command = bytes(socket.readLine()).decode(errors="replace").strip()
+            if command == RESIDENT_SHOW:
+                self.panel.show_resident()
+            elif command == RESIDENT_QUIT:
+                self.panel.quit_resident()
 
 
 class ProgressDialog(QDialog):
     def __init__(self, maximum, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Importing Sequences...")
-        self.setModal(True)
-        self.setFixedSize(400, 80)
+        self.setFixedSize(400, 120)
         layout = QVBoxLayout(self)
         self.progress = QProgressBar(self)
         self.progress.setMinimum(0)
@@ -82,30 +731,482 @@ class ProgressDialog(QDialog):
         self.progress.setValue(0)
         self.progress.setTextVisible(True)
         layout.addWidget(self.progress)
+        self.rate_label = QLabel("Starting...", self)
+        layout.addWidget(self.rate_label)
+        buttons = QHBoxLayout()
+        self.pause_btn = QPushButton("Pause", self)
+        self.pause_btn.setCheckable(True)
+        self.cancel_btn = QPushButton("Cancel", self)
+        buttons.addStretch(1)
+        buttons.addWidget(self.pause_btn)
+        buttons.addWidget(self.cancel_btn)
+        layout.addLayout(buttons)
         self.setLayout(layout)
 
     def setValue(self, value) -> None:
         self.progress.setValue(value)
-        QApplication.processEvents()
+
+    def update_progress(self, done, total, rate, eta) -> None:
+        self.progress.setMaximum(total)
+        self.progress.setValue(done)
+        if self.pause_btn.isChecked():
+            self.rate_label.setText("Paused at {} of {}".format(done, total))
+        elif rate:
+            self.rate_label.setText("{:.1f} sequence(s)/s, about {} left".format(rate, format_duration(eta)))
+
+    def set_paused(self, paused) -> None:
+        self.pause_btn.setText("Resume" if paused else "Pause")
+        if paused:
+            self.rate_label.setText("Paused at {} of {}".format(self.progress.value(), self.progress.maximum()))
+
+
+class SequenceListModel(QAbstractTableModel):
+    """Flat sequence table over a :class:`SequenceStore`, one row per store slot.
+
+    Every slot is kept in an array in ascending sort-key order; a descending
+    sort reads it back to front. A few rows arriving from an incremental
+    refresh are placed with one bisect each, but every single-row insert costs
+    the view O(rows), so large scan batches are appended unsorted and
+    :meth:`resort` puts them in place once the scan is done. Cell text is only
+    built for the rows the view asks about, and check state is read from the
+    store's bitset. Header columns fall back to what ``header_cache`` holds
+    in memory for a row's first file, without touching the file or the
+    database, until the panel's background read confirms it.
+
+    Filtering happens here rather than in a ``QSortFilterProxyModel``, which
+    would call back into Python once per row on every keystroke. While a
+    filter is set the rows are a second array holding the matching slots in
+    the same order, selected in one pass (through the search index for name
+    filters); rows that arrive later are matched one at a time. A name filter
+    that only narrows the previous one selects from the rows that one left.
+    """
+
+    headers_preloaded = Signal(object)
+
+    def __init__(self, store, parent=None, header_cache=None) -> None:
+        super().__init__(parent)
+        self.store: SequenceStore = store
+        self.header_cache: HeaderCache | None = header_cache
+        self.headers_preloaded.connect(self._on_headers_preloaded)
+        self._slots = array("i")
+        # Position of every slot in ``_slots``, built when a name filter needs it.
+        self._order: dict[int, int] | None = None
+        self._match = None
+        self._shown = None
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._sort_key = None
+        self._descending = False
+        self._tail_unsorted = False
+
+    @property
+    def _rows(self) -> array:
+        return self._slots if self._shown is None else self._shown
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(SEQUENCE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return SEQUENCE_COLUMNS[section]
+        return None
+
+    def slot_at(self, row) -> int:
+        rows = self._rows
+        return rows[len(rows) - 1 - row] if self._descending else rows[row]
+
+    def ordered_slots(self):
+        """Every slot in display order, including rows the filter hides."""
+        return reversed(self._slots) if self._descending else iter(self._slots)
+
+    def visible_slots(self) -> list[int]:
+        """Slots of the rows passing the filter, in display order."""
+        return list(reversed(self._rows)) if self._descending else list(self._rows)
+
+    def _row_at(self, position) -> int:
+        return len(self._rows) - 1 - position if self._descending else position
+
+    def row_of(self, slot) -> int:
+        """The row showing ``slot``, or ``-1`` if it is filtered out or not listed."""
+        try:
+            return self._row_at(self._rows.index(slot))
+        except ValueError:
+            return -1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        slot = self.slot_at(index.row())
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self.store.display_name(slot)
+            if column == 1:
+                return str(self.store.frames(slot))
+            if column == 2:
+                return "{}-{}".format(*self.store.frame_range(slot))
+            if column == 3:
+                return self.store.extension(slot)
+            if column == 4:
+                missing = self.store.missing(slot)
+                return str(missing) if missing else ""
+            if column == VERIFIED_COLUMN:
+                bad_count = self.store.bad_count(slot)
+                if bad_count < 0:
+                    return ""
+                return "{} bad".format(bad_count) if bad_count else "OK"
+            return header_cell(self.header(slot), FIELDS[column])
+        if role == Qt.ToolTipRole and column in HEADER_COLUMNS:
+            header = self.header(slot)
+            if header is None:
+                return None
+            return "\n".join("{}: {}".format(label, value) for label, value in describe_metadata(header))
+        if role == Qt.ToolTipRole and column in (2, 4) and self.store.missing(slot):
+            gaps = missing_runs(self.store.frame_runs(slot))
+            return "Missing frames: {}".format(format_runs(gaps, MISSING_TOOLTIP_RUNS))
+        if role == Qt.ToolTipRole and column == VERIFIED_COLUMN and self.store.bad_frames(slot):
+            return "Excluded frames: {}".format(describe_bad_frames(self.store.bad_frames(slot), MISSING_TOOLTIP_RUNS))
+        if role == Qt.CheckStateRole and column == 0:
+            return Qt.Checked if slot in self.store.checked else Qt.Unchecked
+        if role == SLOT_ROLE:
+            return slot
+        return None
+
+    def header(self, slot):
+        header = self.store.header(slot)
+        if header is None and self.header_cache is not None:
+            header = self.header_cache.peek(self.store.first_file(slot))
+            if header is not None:
+                self.store.set_header(slot, header)
+        return header
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        slot = self.slot_at(index.row())
+        if Qt.CheckState(value) == Qt.Checked:
+            self.store.checked.add(slot)
+        else:
+            self.store.checked.discard(slot)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def set_checked(self, slots, checked) -> int:
+        """Check or uncheck ``slots`` with one repaint signal; returns how many changed."""
+        toggle = self.store.checked.add if checked else self.store.checked.discard
+        changed = sum(1 for slot in slots if toggle(slot))
+        if changed and self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, 0), [Qt.CheckStateRole])
+        return changed
+
+    def checked_slots(self) -> list[int]:
+        """Checked slots in display order."""
+        checked = self.store.checked
+        if not len(checked):
+            return []
+        return [slot for slot in self.ordered_slots() if slot in checked]
+
+    def sort(self, column, order=Qt.AscendingOrder, preload=True) -> None:
+        self._sort_column = column
+        self._sort_order = order
+        self._tail_unsorted = False
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        kept = [(self.slot_at(index.row()), index.column()) for index in persistent]
+        if self._sorts_by_header() and preload:
+            self._preload_headers()
+        self._sort_key = self.store.sort_key(FIELDS[column]) if 0 <= column < len(FIELDS) else None
+        self._descending = self._sort_key is not None and order == Qt.DescendingOrder
+        if self._sort_key is not None:
+            self._slots = array("i", sorted(self._slots, key=self._sort_key))
+            self._order = None
+            if self._shown is not None:
+                self._shown = array("i", sorted(self._shown, key=self._sort_key))
+        if persistent:
+            positions = {slot: position for position, slot in enumerate(self._rows)}
+            self.changePersistentIndexList(
+                persistent, [self.index(self._row_at(positions[slot]), column) for slot, column in kept]
+            )
+        self.layoutChanged.emit()
+
+    def _sorts_by_header(self) -> bool:
+        return 0 <= self._sort_column < len(FIELDS) and FIELDS[self._sort_column] in HEADER_FIELDS
+
+    def _preload_headers(self) -> None:
+        """Have the header cache load, off the GUI thread, the last known header of rows never scrolled into view."""
+        if self.header_cache is None:
+            return
+        slots = {self.store.first_file(slot): slot for slot in self._slots if self.header(slot) is None}
+        if slots:
+            self.header_cache.preload(list(slots), lambda found: self.headers_preloaded.emit((slots, found)))
+
+    def _on_headers_preloaded(self, result) -> None:
+        slots, found = result
+        changed = False
+        for path, metadata in found.items():
+            slot = slots.get(path)
+            if slot is None or slot not in self.store or self.store.first_file(slot) != path:
+                continue
+            if self.store.header(slot) is None:
+                self.store.set_header(slot, metadata)
+                changed = True
+        if changed and self._sorts_by_header():
+            # Rows still without a header were just asked for; do not ask again.
+            self.sort(self._sort_column, self._sort_order, preload=False)
+
+    def set_filter(self, match) -> None:
+        """Show only the slots ``match`` accepts (a :meth:`SequenceStore.matcher` predicate); ``None`` shows all."""
+        candidates = self._slots
+        refines = getattr(match, "refines", None)
+        if self._shown is not None and refines is not None and refines(self._match):
+            candidates = self._shown
+        order = None
+        if refines is not None:
+            if self._order is None:
+                self._order = dict(zip(self._slots, range(len(self._slots))))
+            order = self._order
+        self.beginResetModel()
+        self._match = match
+        self._shown = None if match is None else select_slots(match, candidates, order)
+        self.endResetModel()
+
+    def resort(self) -> None:
+        """Sort rows appended in bulk since the last sort into place."""
+        if self._tail_unsorted:
+            self.sort(self._sort_column, self._sort_order)
+
+    def _position(self, slots, slot) -> int:
+        if self._sort_key is None or self._tail_unsorted:
+            return len(slots)
+        return bisect.bisect_right(slots, self._sort_key(slot), key=self._sort_key)
+
+    def _insert_slot(self, slot) -> None:
+        self._order = None
+        rows = self._slots
+        position = self._position(rows, slot)
+        if self._shown is not None:
+            rows.insert(position, slot)
+            if not self._match(slot):
+                return
+            rows = self._shown
+            position = self._position(rows, slot)
+        row = len(rows) - position if self._descending else position
+        self.beginInsertRows(QModelIndex(), row, row)
+        rows.insert(position, slot)
+        self.endInsertRows()
+
+    def add_records(self, records) -> list[int]:
+        if not records:
+            return []
+        if self._sort_key is not None and not self._tail_unsorted and len(records) <= SORTED_INSERT_LIMIT:
+            slots = []
+            for seq in records:
+                slot = self.store.add(seq)
+                self._insert_slot(slot)
+                slots.append(slot)
+            return slots
+        if self._sort_key is not None:
+            self._tail_unsorted = True
+        slots = [self.store.add(seq) for seq in records]
+        self._order = None
+        shown = slots
+        if self._shown is not None:
+            self._slots.extend(slots)
+            shown = [slot for slot in slots if self._match(slot)]
+        if shown:
+            rows = self._rows
+            first = 0 if self._descending else len(rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(shown) - 1)
+            rows.extend(shown)
+            self.endInsertRows()
+        return slots
+
+    def _take_slot(self, slot) -> None:
+        """Drop ``slot`` from the rows, signalling the view if it was shown."""
+        self._order = None
+        if self._shown is not None:
+            del self._slots[self._slots.index(slot)]
+            try:
+                position = self._shown.index(slot)
+            except ValueError:
+                return
+        else:
+            position = self._slots.index(slot)
+        row = self._row_at(position)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[position]
+        self.endRemoveRows()
+
+    def remove_slot(self, slot) -> None:
+        self._take_slot(slot)
+        self.store.remove(slot)
+
+    def update_record(self, slot, seq) -> None:
+        if self.store.get(slot) == seq:
+            return
+        # Re-place the row rather than emit dataChanged, so it moves to its
+        # sort position and is matched against the filter again.
+        self._take_slot(slot)
+        self.store.update(slot, seq)
+        self._insert_slot(slot)
+
+    def replace_directory(self, dirpath, records) -> list[int]:
+        """Make the rows listed for ``dirpath`` match ``records``; return the slots of new rows.
+
+        Rows are matched by sequence key, so surviving rows keep their slot and
+        check state.
+        """
+        previous = self.store.folder_slots(dirpath)
+        added = []
+        for seq in records:
+            slot = previous.pop(seq["seq_key"], None)
+            if slot is None:
+                added.append(seq)
+            else:
+                self.update_record(slot, seq)
+        for slot in previous.values():
+            self.remove_slot(slot)
+        return self.add_records(added)
+
+    def set_verification(self, slot, bad_frames) -> None:
+        self.store.set_verification(slot, bad_frames)
+        row = self.row_of(slot)
+        if row < 0:
+            return
+        self.dataChanged.emit(self.index(row, VERIFIED_COLUMN), self.index(row, VERIFIED_COLUMN))
+
+    def headers_changed(self) -> None:
+        """Repaint the header columns; the view only asks again for the rows on screen."""
+        if self._rows:
+            self.dataChanged.emit(
+                self.index(0, HEADER_COLUMNS[0]), self.index(len(self._rows) - 1, HEADER_COLUMNS[-1])
+            )
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._slots = array("i")
+        self._order = None
+        if self._shown is not None:
+            self._shown = array("i")
+        self._tail_unsorted = False
+        self.store.clear()
+        self.endResetModel()
 
 
 class ShotLoaderPanel(QWidget):
+    # Emitted from watcher threads; the queued connection brings it to the GUI thread.
+    watch_dirty = Signal()
+    # Emitted from header reader threads with (path, metadata).
+    header_read = Signal(str, object)
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Shot Loader")
         self.resize(980, 620)
-        self.root_path: str = DEFAULT_ROOT if os.path.isdir(DEFAULT_ROOT) else ""
-        self.row_data = {}
-        self.row_counter = 0
+        self.roots: list[str] = list(START_ROOTS)
+        self.store = SequenceStore()
+        self.header_cache = HeaderCache(workers=HEADER_WORKERS, recorder=DIAGNOSTICS.channel(CHANNEL_HEADER))
+        self.header_slots: dict[str, int] = {}
+        self.model = SequenceListModel(self.store, self, self.header_cache)
+        # Roots with rows in the tree, and those a finished scan fully listed.
+        self.shown_roots: set[str] = set()
+        self.listed_roots: set[str] = set()
         self.playback_files: list[str] = []
+        # Proxies of the playing sequence, looked up as each frame is first decoded.
+        self.playback_proxies: PlaybackProxies | None = None
         self.playback_index = 0
-        self.playback_fps = 24
+        self.playback_fps = 24.0
+        self.dropped_frames = 0
+        self.playback_clock = PlaybackClock(self.playback_fps, PLAYBACK_MODE)
+        self.playing = False
+        self.tick_due = 0.0
+        self.frame_cache = FrameCache(PLAYBACK_CACHE_MB * 1024 * 1024, qimage_bytes, MEMORY)
+        self.proxy_store = ProxyStore(
+            render_proxy, PROXY_LOCATION, budget_bytes=PROXY_CACHE_MB * 1024 * 1024, workers=DEFAULT_PROXY_WORKERS
+        )
+        self.decoder = ReadAheadDecoder(
+            self.decode_playback_frame, self.frame_cache, PLAYBACK_DECODE_WORKERS, PLAYBACK_READ_AHEAD
+        )
         self.current_frame_path = ""
+        self.current_image = None
         self.current_sequence = None
+        # What the preview pixmap was made from, so showing the same frame again reuses it.
+        self.pixmap_key = None
+        self.pixmap_bytes = 0
+        self.scan_worker: SequenceScanWorker | None = None
+        self.verify_worker: FrameVerifyWorker | None = None
+        self.verify_id = 0
+        self.scan_id = 0
+        self.scan_index = ScanIndex()
+        self.importer = MediaImporter(on_attempt=self._log_import_attempt)
+        self.clip_index = ClipIndex()
+        self.import_job: ImportJob | None = None
+        self.import_folders: dict[str, str] = {}
+        self.watcher: DirectoryWatcher | None = None
+        self.watch_roots: tuple[str, ...] = ()
+        self.watch_poll_roots: set[str] = set()
+        self.watch_backend = ""
+        self.watch_known: set[str] = set()
+        self.watch_worker: WatchRescanWorker | None = None
+        self.watch_id = 0
+        self.watch_dirty_set = DirtySet(self.watch_dirty.emit)
+        self.watch_dirty.connect(self._on_watch_dirty)
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self.watch_timer.timeout.connect(self._rescan_watched)
+        # Trimmed in this order when over budget: EXR previews are only re-read for posters and stills, and
+        # dropped headers are loaded back from the index database. The rest is counted but kept.
+        if EXR_READER is not None:
+            MEMORY.register("EXR previews", lambda: EXR_READER.cache.used_bytes, EXR_READER.cache.trim)
+        MEMORY.register("Decoded frames", lambda: self.frame_cache.used_bytes, self.frame_cache.trim)
+        MEMORY.register("Header cache", self.header_cache.approx_bytes, self.header_cache.trim)
+        MEMORY.register("Sequence list", self.store.approx_bytes)
+        MEMORY.register("Proxy manifest", self.proxy_store.approx_bytes)
+        MEMORY.register("Playback proxies", self._playback_proxy_bytes)
+        MEMORY.register("Media pool index", lambda: self.clip_index.approx_bytes())
+        MEMORY.register("Preview pixmap", lambda: self.pixmap_bytes)
+        self.resident = False
+        self.import_dialog: ProgressDialog | None = None
+        # Single-shot and re-aimed at the next frame boundary on every tick, so
+        # timer granularity never accumulates into drift.
         self.play_timer = QTimer(self)
+        self.play_timer.setSingleShot(True)
+        self.play_timer.setTimerType(Qt.PreciseTimer)
         self.play_timer.timeout.connect(self._advance_frame)
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self._on_resize_settled)
+        self.header_read.connect(self._on_header_read)
+        self.header_timer = QTimer(self)
+        self.header_timer.setSingleShot(True)
+        self.header_timer.setInterval(HEADER_DEBOUNCE_MS)
+        self.header_timer.timeout.connect(self.request_visible_headers)
+        self.header_repaint_timer = QTimer(self)
+        self.header_repaint_timer.setSingleShot(True)
+        self.header_repaint_timer.setInterval(HEADER_REPAINT_MS)
+        self.header_repaint_timer.timeout.connect(self.model.headers_changed)
         self._build_ui()
-        if self.root_path:
+        self.memory_timer = QTimer(self)
+        self.memory_timer.setInterval(MEMORY_STATUS_MS)
+        self.memory_timer.timeout.connect(self._update_memory_status)
+        self.memory_timer.start()
+        self._update_memory_status()
+        self.view_size = self.viewport_size()
+        self.decoder.set_size(self.view_size)
+        if self.roots:
             self.populate_tree()
 
     def _build_ui(self) -> None:
@@ -114,29 +1215,102 @@ class ShotLoaderPanel(QWidget):
 
         self.browse_btn = QPushButton("Select Folder")
         self.browse_btn.clicked.connect(self.select_folder)
+        self.add_root_btn = QPushButton("Add Folder")
+        self.add_root_btn.setToolTip("List another shot root alongside the current ones")
+        self.add_root_btn.clicked.connect(self.add_folder)
         self.refresh_btn = QPushButton("Refresh")
         self.refresh_btn.clicked.connect(self.populate_tree)
+        self.cancel_scan_btn = QPushButton("Cancel Scan")
+        self.cancel_scan_btn.clicked.connect(self.cancel_scan)
+        self.cancel_scan_btn.setEnabled(False)
+        self.proxy_btn = QPushButton("Build Proxies")
+        self.proxy_btn.setToolTip("Render posters and low-res playback proxies for the checked sequences")
+        self.proxy_btn.clicked.connect(self.build_checked_proxies)
+        self.verify_btn = QPushButton("Verify Frames")
+        self.verify_btn.setToolTip(
+            "Check the checked (or selected) sequences for missing, empty or truncated frames;"
+            " failing frames are left out of playback and import"
+        )
+        self.verify_btn.clicked.connect(self.verify_sequences)
+        self.watch_check = QCheckBox("Watch")
+        self.watch_check.setToolTip(
+            "Follow renders as they land: new frames and sequences appear without Refresh,"
+            " and a playing sequence grows in place"
+        )
+        self.watch_check.setChecked(WATCH_ON_START)
+        self.watch_check.toggled.connect(self.set_watching)
         self.import_btn = QPushButton("Import Checked Sequences && Create Timeline")
         self.import_btn.clicked.connect(self.import_all_and_create_timeline)
-        self.path_label = QLabel(self.root_path or "No folder selected")
+        self.timeline_mode_combo = QComboBox()
+        for label, mode in TIMELINE_MODE_CHOICES:
+            self.timeline_mode_combo.addItem(label, mode)
+        self.timeline_mode_combo.setCurrentIndex(self.timeline_mode_combo.findData(TIMELINE_MODE))
+        self.timeline_mode_combo.setToolTip("Put the imported clips in one timeline, or in one per shot folder")
+        self.path_label = QLabel()
         self.path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._update_path_label()
 
         toolbar.addWidget(self.browse_btn)
+        toolbar.addWidget(self.add_root_btn)
         toolbar.addWidget(self.refresh_btn)
+        toolbar.addWidget(self.cancel_scan_btn)
+        toolbar.addWidget(self.watch_check)
+        toolbar.addWidget(self.proxy_btn)
+        toolbar.addWidget(self.verify_btn)
         toolbar.addWidget(self.import_btn)
+        toolbar.addWidget(self.timeline_mode_combo)
         toolbar.addWidget(self.path_label, 1)
 
+        filter_row = QHBoxLayout()
+        self.filter_field = QComboBox()
+        for label, field in FILTER_CHOICES:
+            self.filter_field.addItem(label, field)
+        self.filter_field.currentIndexChanged.connect(self.apply_filter)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter (name, ext, or frames/range like 100, 10-50, >=24)")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self._on_filter_text_changed)
+        self.check_all_btn = QPushButton("Check Listed")
+        self.check_all_btn.clicked.connect(lambda: self.set_listed_checked(True))
+        self.uncheck_all_btn = QPushButton("Uncheck Listed")
+        self.uncheck_all_btn.clicked.connect(lambda: self.set_listed_checked(False))
+        filter_row.addWidget(self.filter_field)
+        filter_row.addWidget(self.filter_edit, 1)
+        filter_row.addWidget(self.check_all_btn)
+        filter_row.addWidget(self.uncheck_all_btn)
+
         content = QHBoxLayout()
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Sequence", "Frames", "Range", "Ext"])
+        tree_col = QVBoxLayout()
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)
         self.tree.setAlternatingRowColors(True)
-        self.tree.setSelectionMode(QTreeWidget.ExtendedSelection)
-        self.tree.itemSelectionChanged.connect(self.on_tree_selection)
-        self.tree.itemClicked.connect(self.on_tree_item_clicked)
+        self.tree.setSelectionMode(QTreeView.ExtendedSelection)
+        self.tree.setSelectionBehavior(QTreeView.SelectRows)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(0, Qt.AscendingOrder)
+        self.tree.selectionModel().selectionChanged.connect(self.on_tree_selection)
+        self.tree.clicked.connect(self.on_tree_item_clicked)
         self.tree.setColumnWidth(0, 420)
         self.tree.setColumnWidth(1, 80)
         self.tree.setColumnWidth(2, 120)
         self.tree.setColumnWidth(3, 60)
+        self.tree.setColumnWidth(4, 70)
+        self.tree.setColumnWidth(5, 80)
+        self.tree.setColumnWidth(6, 90)
+        self.tree.setColumnWidth(7, 70)
+        self.tree.setColumnWidth(8, 60)
+        self.tree.setColumnWidth(9, 90)
+        # Headers are read for the rows on screen once the list stops moving.
+        self.tree.verticalScrollBar().valueChanged.connect(self.header_timer.start)
+        self.model.rowsInserted.connect(self.header_timer.start)
+        self.model.layoutChanged.connect(self.header_timer.start)
+        self.model.modelReset.connect(self.header_timer.start)
 
         right_col = QVBoxLayout()
         self.preview = QLabel("Select a sequence")
@@ -155,46 +1329,150 @@ class ShotLoaderPanel(QWidget):
         self.stop_btn = QPushButton("Stop")
         self.stop_btn.clicked.connect(self.stop_playback)
         self.fps_label = QLabel("FPS")
-        self.fps_spin = QSpinBox()
-        self.fps_spin.setRange(1, 60)
+        self.fps_spin = QDoubleSpinBox()
+        self.fps_spin.setDecimals(3)
+        self.fps_spin.setRange(1.0, 120.0)
         self.fps_spin.setValue(self.playback_fps)
+        self.fps_spin.setToolTip("Playback rate; 23.976, 29.97 and 59.94 play at the exact NTSC rates")
         self.fps_spin.valueChanged.connect(self.set_playback_fps)
+        self.mode_combo = QComboBox()
+        for label, mode in PLAYBACK_MODE_CHOICES:
+            self.mode_combo.addItem(label, mode)
+        self.mode_combo.setCurrentIndex(self.mode_combo.findData(PLAYBACK_MODE))
+        self.mode_combo.setToolTip(
+            "Realtime skips frames that are not decoded in time to hold the clip's speed;"
+            " Every frame shows each frame and lets the clip slow down"
+        )
+        self.mode_combo.currentIndexChanged.connect(self.set_playback_mode)
+        self.loop_check = QCheckBox("Loop")
+        self.loop_check.setChecked(True)
+        self.loop_check.toggled.connect(self.set_playback_loop)
 
         controls.addWidget(self.play_btn)
         controls.addWidget(self.pause_btn)
         controls.addWidget(self.stop_btn)
         controls.addWidget(self.fps_label)
         controls.addWidget(self.fps_spin)
+        controls.addWidget(self.mode_combo)
+        controls.addWidget(self.loop_check)
+
+        self.scrub_slider = QSlider(Qt.Horizontal)
+        self.scrub_slider.setRange(0, 0)
+        self.scrub_slider.valueChanged.connect(self.seek_frame)
 
+        status_row = QHBoxLayout()
         self.status = QLabel("Ready")
+        self.playback_status = QLabel("")
+        self.playback_status.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.progress = None
+        self.memory_status = QLabel("")
+        self.memory_status.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        status_row.addWidget(self.status, 1)
+        status_row.addWidget(self.playback_status)
+        status_row.addWidget(self.memory_status)
 
         right_col.addWidget(self.preview)
+        right_col.addWidget(self.scrub_slider)
         right_col.addLayout(controls)
-        right_col.addWidget(self.meta, 1)
-        right_col.addWidget(self.status)
-
-        content.addWidget(self.tree, 3)
+        self.info_tabs = QTabWidget()
+        self.info_tabs.addTab(self.meta, "Metadata")
+        self.info_tabs.addTab(self._build_diagnostics_tab(), "Diagnostics")
+        self.info_tabs.currentChanged.connect(self._on_info_tab_changed)
+        right_col.addWidget(self.info_tabs, 1)
+        right_col.addLayout(status_row)
+
+        tree_col.addLayout(filter_row)
+        tree_col.addWidget(self.tree, 1)
+        content.addLayout(tree_col, 3)
         content.addLayout(right_col, 2)
 
         root_layout.addLayout(toolbar)
         root_layout.addLayout(content, 1)
         self.setLayout(root_layout)
 
-    def on_tree_item_clicked(self, item, column):
-        row_id = item.data(0, Qt.UserRole)
-        seq = self.row_data.get(row_id)
+    def _build_diagnostics_tab(self) -> QWidget:
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        self.diagnostics_table = QTableWidget(0, len(DIAGNOSTICS_COLUMNS))
+        self.diagnostics_table.setHorizontalHeaderLabels(DIAGNOSTICS_COLUMNS)
+        self.diagnostics_table.verticalHeader().setVisible(False)
+        self.diagnostics_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.diagnostics_table.horizontalHeader().setStretchLastSection(True)
+        self.diagnostics_table.setColumnWidth(0, 140)
+
+        buttons = QHBoxLayout()
+        self.diagnostics_clear_btn = QPushButton("Clear")
+        self.diagnostics_clear_btn.clicked.connect(self.clear_diagnostics)
+        self.diagnostics_export_btn = QPushButton("Export Trace...")
+        self.diagnostics_export_btn.setToolTip("Save the recorded timings as a Chrome trace (chrome://tracing, Perfetto)")
+        self.diagnostics_export_btn.clicked.connect(self.export_diagnostics_trace)
+        buttons.addWidget(self.diagnostics_clear_btn)
+        buttons.addWidget(self.diagnostics_export_btn)
+        buttons.addStretch(1)
+        if not DIAGNOSTICS.enabled:
+            buttons.addWidget(QLabel("Disabled (ELEMENT_BROWSER_DIAGNOSTICS=0)"))
+            self.diagnostics_clear_btn.setEnabled(False)
+            self.diagnostics_export_btn.setEnabled(False)
+
+        layout.addWidget(self.diagnostics_table, 1)
+        layout.addLayout(buttons)
+        self.diagnostics_timer = QTimer(self)
+        self.diagnostics_timer.setInterval(DIAGNOSTICS_REFRESH_MS)
+        self.diagnostics_timer.timeout.connect(self.refresh_diagnostics)
+        return tab
+
+    def _on_info_tab_changed(self, index) -> None:
+        # Percentiles are only computed while the tab is on screen.
+        if self.info_tabs.widget(index) is self.meta:
+            self.diagnostics_timer.stop()
+        else:
+            self.refresh_diagnostics()
+            self.diagnostics_timer.start()
+
+    def refresh_diagnostics(self) -> None:
+        rows = DIAGNOSTICS.summary()
+        self.diagnostics_table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            values = [row["channel"], str(row["count"])]
+            values += ["{:.2f}".format(row["p{}_ms".format(pct)]) for pct in PERCENTILES]
+            values += ["{:.2f}".format(row["max_ms"]), "{:.2f}".format(row["mean_ms"])]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.diagnostics_table.setItem(row_index, column, item)
+
+    def clear_diagnostics(self) -> None:
+        DIAGNOSTICS.clear()
+        self.refresh_diagnostics()
+
+    def export_diagnostics_trace(self) -> None:
+        default_name = os.path.join(
+            os.path.expanduser("~"), time.strftime("element_browser_trace_%Y%m%d_%H%M%S.json")
+        )
+        path, _filter = QFileDialog.getSaveFileName(self, "Export Trace", default_name, "Chrome trace (*.json)")
+        if not path:
+            return
+        try:
+            events = DIAGNOSTICS.write_chrome_trace(path)
+        except OSError as exc:
+            print("[Shot Loader] Trace export error: {}".format(exc))
+            self.status.setText("Trace export failed: {}".format(exc))
+            return
+        self.status.setText("Exported {} trace events to {}".format(events, path))
+
+    def on_tree_item_clicked(self, index):
+        seq = self.store.get(index.data(SLOT_ROLE))
         if seq:
             self.current_sequence = seq
             self.play_sequence(seq)
 
     def get_selected_sequence(self):
-        selected = self.tree.selectedItems()
+        selected = self.tree.selectionModel().selectedRows()
         if not selected:
             return self.current_sequence
 
-        row_id = selected[0].data(0, Qt.UserRole)
-        seq = self.row_data.get(row_id)
+        seq = self.store.get(selected[0].data(SLOT_ROLE))
         if seq:
             self.current_sequence = seq
         return seq
@@ -205,224 +1483,731 @@ class ShotLoaderPanel(QWidget):
             self.status.setText("No sequence selected")
             return
 
-        if self.playback_files and self.current_sequence == seq and not self.play_timer.isActive():
-            interval_ms = max(1, int(1000 / self.playback_fps))
-            self.play_timer.start(interval_ms)
+        if self.playback_files and self.current_sequence == seq and not self.playing:
+            self.decoder.prefetch(self.playback_index, self.loop_check.isChecked())
+            self._start_playback_clock()
             self.status.setText("Resumed sequence: {}".format(seq["seq_key"]))
             return
 
         self.play_sequence(seq)
 
     def pause_playback(self):
-        if self.play_timer.isActive():
-            self.play_timer.stop()
+        if self.playing:
+            self._halt_playback()
+            self._update_playback_status()
             self.status.setText("Paused")
 
     def stop_playback(self):
-        self.play_timer.stop()
+        self._halt_playback()
         self.playback_index = 0
         if self.playback_files:
-            self.show_frame(self.playback_files[0])
+            self.show_playback_frame(0)
+            self.decoder.prefetch(0, self.loop_check.isChecked())
+        self._set_scrub_position(0)
         self.status.setText("Stopped")
 
     def set_playback_fps(self, fps):
-        self.playback_fps = int(fps)
-        if self.play_timer.isActive():
-            interval_ms = max(1, int(1000 / self.playback_fps))
-            self.play_timer.start(interval_ms)
+        self.playback_fps = float(fps)
+        self.playback_clock.set_rate(self.playback_fps)
+        if self.playing:
+            self._schedule_tick()
+
+    def set_playback_mode(self, _index=None) -> None:
+        self.playback_clock.set_mode(self.mode_combo.currentData())
+        if self.playing:
+            self._schedule_tick()
+
+    def set_playback_loop(self, loop) -> None:
+        # The clock counts on past the last frame while looping; re-anchor it on
+        # the frame on screen so a pass in progress is not taken as finished.
+        if self.playing:
+            self.playback_clock.start(self.playback_index)
+            self.decoder.prefetch(self.playback_index, loop)
+            self._schedule_tick()
+
+    def _start_playback_clock(self) -> None:
+        """Start ticking from the frame on screen; also used to re-anchor after a seek."""
+        self.playing = True
+        self.playback_clock.start(self.playback_index)
+        self._schedule_tick()
+
+    def _halt_playback(self) -> None:
+        self.playing = False
+        self.play_timer.stop()
+
+    def _schedule_tick(self) -> None:
+        delay = self.playback_clock.next_deadline()
+        self.tick_due = self.playback_clock.now() + delay
+        self.play_timer.start(math.ceil(delay * 1000))
 
     @staticmethod
-    def _sequence_file_pattern(first_file):
-        base_name = os.path.basename(first_file)
-        match = re.match(r"(.+?)([._-]?)(\d{3,})(\.[^.]+)$", base_name)
-        if not match:
-            return None
-        prefix, separator, digits, extension = match.groups()
-        return prefix, separator, len(digits), extension
+    def sequence_frames(seq) -> list[tuple[int, str]]:
+        """``(frame, path)`` for every frame the scan found, built from its pattern without touching disk."""
+        return sequence_frames(seq)
+
+    @staticmethod
+    def sequence_frame_paths(seq) -> list[str]:
+        return sequence_frame_paths(seq)
+
+    def sequence_bad_frames(self, seq) -> dict[int, str]:
+        slot = self.store.slot_of(seq["folder"], seq["seq_key"])
+        return self.store.bad_frames(slot) if slot is not None else {}
 
     def build_sequence_file_list(self, seq) -> list[str]:
-        pattern = self._sequence_file_pattern(seq["first_file"])
-        if not pattern:
-            return []
+        """Playable frames: the scan's frame index minus frames that failed verification. No per-frame stat."""
+        return sequence_frame_paths(seq, self.sequence_bad_frames(seq))
+
+    def viewport_size(self) -> tuple[int, int]:
+        size = self.preview.contentsRect().size()
+        return max(1, size.width()), max(1, size.height())
+
+    def _fit_pixmap(self, image, transform) -> QPixmap:
+        pixmap = QPixmap.fromImage(image)
+        fitted = image.size().scaled(self.preview.contentsRect().size(), Qt.KeepAspectRatio)
+        if fitted == image.size() or fitted.isEmpty():
+            # Decoded at viewport size already: nothing to scale.
+            return pixmap
+        return pixmap.scaled(fitted, Qt.IgnoreAspectRatio, transform)
+
+    def show_preview_text(self, text) -> None:
+        self.current_image = None
+        self.pixmap_key = None
+        self.pixmap_bytes = 0
+        self.preview.setText(text)
+
+    def show_image(self, image, frame_path) -> None:
+        if image is None:
+            self.show_preview_text("Cannot load frame")
+            return
 
-        prefix, separator, padding, extension = pattern
-        folder = seq["folder"]
-        files: list[str] = []
-        for frame in range(int(seq["start_index"]), int(seq["end_index"]) + 1):
-            frame_name = "{}{}{:0{}d}{}".format(prefix, separator, frame, padding, extension)
-            frame_path = os.path.join(folder, frame_name)
-            if os.path.exists(frame_path):
-                files.append(frame_path)
-        return files
+        key = (image.cacheKey(), self.viewport_size())
+        if key != self.pixmap_key:
+            with DIAGNOSTICS.span(CHANNEL_SCALE, os.path.basename(frame_path)):
+                pixmap = self._fit_pixmap(image, Qt.SmoothTransformation)
+            self.preview.setPixmap(pixmap)
+            self.pixmap_key = key
+            self.pixmap_bytes = pixmap.width() * pixmap.height() * max(8, pixmap.depth()) // 8
+        self.current_image = image
+        self.current_frame_path = frame_path
 
     def show_frame(self, frame_path):
-        pixmap = QPixmap(frame_path)
-        if pixmap.isNull():
-            self.preview.setText("Cannot load frame")
+        key = (frame_path, self.view_size)
+        image = self.frame_cache.get(key)
+        if image is None:
+            image = decode_frame(frame_path, self.view_size)
+            if image is not None:
+                self.frame_cache.put(key, image)
+        self.show_image(image, frame_path)
+
+    def decode_playback_frame(self, frame_path, size):
+        """Decode for the player at ``size``, preferring a valid low-res proxy. Runs on decoder threads.
+
+        A frame's source is checked for a proxy on its first decode only, so
+        later passes over the sequence never stat it.
+        """
+        proxies = self.playback_proxies
+        proxy = proxies.get(frame_path) if proxies is not None else None
+        if proxy:
+            image = decode_frame(proxy, size)
+            if image is not None:
+                return image
+        return decode_frame(frame_path, size)
+
+    def _playback_proxy_bytes(self) -> int:
+        proxies = self.playback_proxies
+        return proxies.approx_bytes() if proxies is not None else 0
+
+    def show_poster(self, seq) -> None:
+        first_file = seq["first_file"]
+        poster = self.proxy_store.lookup(first_file, POSTER)
+        if poster:
+            self.show_frame(poster)
             return
+        self.proxy_store.queue([first_file], POSTER, PRIORITY_INTERACTIVE)
+        self.show_frame(first_file)
 
-        scaled = pixmap.scaled(self.preview.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.preview.setPixmap(scaled)
-        self.current_frame_path = frame_path
+    def build_checked_proxies(self) -> None:
+        sequences = [self.store.get(slot) for slot in self.get_checked_row_ids()]
+        if not sequences:
+            self.status.setText("No checked sequence(s) to build proxies for")
+            return
+        frame_count = 0
+        for seq in sequences:
+            self.proxy_store.queue([seq["first_file"]], POSTER)
+            frame_paths = self.sequence_frame_paths(seq)
+            self.proxy_store.queue(frame_paths, PROXY)
+            frame_count += len(frame_paths)
+        self.status.setText("Queued proxies for {} frame(s) in {} sequence(s)".format(frame_count, len(sequences)))
+
+    def verify_sequences(self) -> None:
+        """Start a background verification pass over the checked sequences, or the selected one."""
+        slots = self.get_checked_row_ids()
+        if slots:
+            sequences = [self.store.get(slot) for slot in slots]
+        else:
+            selected = self.get_selected_sequence()
+            sequences = [selected] if selected else []
+        if not sequences:
+            self.status.setText("No checked or selected sequence(s) to verify")
+            return
+
+        self.cancel_verification()
+        jobs = [(seq["folder"], seq["seq_key"], self.sequence_frames(seq)) for seq in sequences]
+        self.verify_id += 1
+        worker = FrameVerifyWorker(self.verify_id, jobs, self)
+        worker.sequence_verified.connect(self._on_sequence_verified)
+        worker.progress.connect(self._on_verify_progress)
+        worker.verify_finished.connect(self._on_verify_finished)
+        worker.finished.connect(worker.deleteLater)
+        self.verify_worker = worker
+        self.status.setText("Verifying {} sequence(s)...".format(len(jobs)))
+        worker.start()
+
+    def cancel_verification(self) -> None:
+        if self.verify_worker:
+            self.verify_worker.cancel()
+            self.verify_worker = None
+
+    def _on_sequence_verified(self, verify_id, folder, seq_key, bad_frames) -> None:
+        if verify_id != self.verify_id:
+            return
+        slot = self.store.slot_of(folder, seq_key)
+        if slot is None:
+            return
+        self.model.set_verification(slot, bad_frames)
+        current = self.current_sequence
+        if current and current["folder"] == folder and current["seq_key"] == seq_key:
+            self._refresh_playback_frames()
+            self.show_sequence_meta(current)
+
+    def _on_verify_progress(self, verify_id, checked, total) -> None:
+        if verify_id != self.verify_id or not self.verify_worker:
+            return
+        self.status.setText("Verifying... {}/{} frame(s)".format(checked, total))
+
+    def _on_verify_finished(self, verify_id, verified, bad_total, cancelled) -> None:
+        if verify_id != self.verify_id:
+            return
+        self.verify_worker = None
+        if cancelled:
+            self.status.setText("Verification cancelled after {} sequence(s)".format(verified))
+        else:
+            self.status.setText(
+                "Verified {} sequence(s): {} frame(s) excluded".format(verified, bad_total)
+            )
+
+    def _refresh_playback_frames(self) -> None:
+        """Re-derive the playing sequence's frame list after its verification state changed."""
+        if not self.current_sequence or not self.playback_files:
+            return
+        playback_files = self.build_sequence_file_list(self.current_sequence)
+        if playback_files == self.playback_files:
+            return
+        current_path = self.playback_files[self.playback_index]
+        self.playback_files = playback_files
+        self.decoder.set_frames(playback_files)
+        if current_path in playback_files:
+            self.playback_index = playback_files.index(current_path)
+        else:
+            self.playback_index = min(self.playback_index, max(0, len(playback_files) - 1))
+        self.scrub_slider.blockSignals(True)
+        self.scrub_slider.setRange(0, max(0, len(playback_files) - 1))
+        self.scrub_slider.setValue(self.playback_index)
+        self.scrub_slider.blockSignals(False)
+        if playback_files:
+            self.decoder.prefetch(self.playback_index, self.loop_check.isChecked())
+            if self.playing:
+                self._start_playback_clock()
+        else:
+            self._halt_playback()
+            self.show_preview_text("No readable frames")
+        self._update_playback_status()
+
+    def show_playback_frame(self, index) -> None:
+        self.show_image(self.decoder.decode_now(index), self.playback_files[index])
+
+    def _set_scrub_position(self, index) -> None:
+        self.scrub_slider.blockSignals(True)
+        self.scrub_slider.setValue(index)
+        self.scrub_slider.blockSignals(False)
+
+    def _update_memory_status(self) -> None:
+        """Enforce the memory budget and show its use, with the process's resident size, in the status bar."""
+        MEMORY.enforce()
+        text = MEMORY.describe()
+        rss = process_rss()
+        if rss:
+            text += " | RSS {:.0f} MB".format(rss / (1024 * 1024))
+        self.memory_status.setText(text)
+        self.memory_status.setToolTip(MEMORY.breakdown())
+
+    def _update_playback_status(self) -> None:
+        if not self.playback_files:
+            self.playback_status.setText("")
+            return
+        ready, window = self.decoder.buffered_ahead(
+            (self.playback_index + 1) % len(self.playback_files), self.loop_check.isChecked()
+        )
+        achieved = self.playback_clock.achieved_fps() if self.playing else 0.0
+        self.playback_status.setText(
+            "Frame {}/{} | Buffer {}/{} ({:.0f}/{} MB) | {} fps | Skipped {} | Dropped {}".format(
+                self.playback_index + 1,
+                len(self.playback_files),
+                ready,
+                window,
+                self.frame_cache.used_bytes / (1024 * 1024),
+                PLAYBACK_CACHE_MB,
+                "{:.2f}/{}".format(achieved, format_fps(self.playback_clock.fps)) if self.playing else "-",
+                self.playback_clock.skipped,
+                self.dropped_frames,
+            )
+        )
 
     def play_sequence(self, seq):
-        self.play_timer.stop()
+        self._halt_playback()
         self.current_sequence = seq
         self.playback_files = self.build_sequence_file_list(seq)
         self.playback_index = 0
+        self.dropped_frames = 0
+        self.playback_clock.skipped = 0
+        # Proxies beside the frames are only written by Build Proxies: rendering them
+        # while playing would touch render folders, their scan index entries and the watcher.
+        self.playback_proxies = PlaybackProxies(
+            self.proxy_store, self.playback_files, PROXY, generate=PROXY_LOCATION != LOCATION_BESIDE
+        )
+        self.decoder.set_frames(self.playback_files)
+        self.scrub_slider.blockSignals(True)
+        self.scrub_slider.setRange(0, max(0, len(self.playback_files) - 1))
+        self.scrub_slider.setValue(0)
+        self.scrub_slider.blockSignals(False)
 
         if not self.playback_files:
-            self.preview.setText("No readable frames")
+            self.show_preview_text("No readable frames")
             self.status.setText("Playback failed: no readable frames")
+            self._update_playback_status()
             return
 
-        self.show_frame(self.playback_files[0])
-        interval_ms = max(1, int(1000 / self.playback_fps))
-        self.play_timer.start(interval_ms)
+        self.decoder.prefetch(0, self.loop_check.isChecked())
+        self.show_playback_frame(0)
+        self._start_playback_clock()
         self.status.setText("Playing sequence: {}".format(seq["seq_key"]))
+        self._update_playback_status()
+
+    def seek_frame(self, index) -> None:
+        """Scrub to ``index``: show it immediately and re-aim read-ahead from there."""
+        if not self.playback_files:
+            return
+        index = max(0, min(int(index), len(self.playback_files) - 1))
+        self.playback_index = index
+        self.decoder.prefetch(index, self.loop_check.isChecked())
+        self.show_playback_frame(index)
+        if self.playing:
+            self._start_playback_clock()
+        self._update_playback_status()
 
     def _advance_frame(self):
         if not self.playback_files:
-            self.play_timer.stop()
+            self._halt_playback()
+            return
+        clock = self.playback_clock
+        now = clock.now()
+        self._record_tick(now)
+        target = clock.target(now)
+        if target == clock.position:
+            self._schedule_tick()
             return
 
-        self.playback_index = (self.playback_index + 1) % len(self.playback_files)
-        self.show_frame(self.playback_files[self.playback_index])
+        count = len(self.playback_files)
+        loop = self.loop_check.isChecked()
+        if not loop and target >= count:
+            if clock.position >= count - 1:
+                self._halt_playback()
+                self.status.setText("Finished sequence: {}".format(self.current_sequence["seq_key"]))
+                self._update_playback_status()
+                return
+            target = count - 1
+
+        # Show the due frame, or the latest decoded frame before it; never
+        # block the GUI thread on disk.
+        for position in range(target, max(clock.position, target - PLAYBACK_CATCH_UP_SEARCH), -1):
+            index = position % count
+            image = self.decoder.frame(index)
+            if image is not None:
+                break
+            if self.decoder.failed(index):
+                # Unreadable: step over it as if shown.
+                self.dropped_frames += 1
+                DIAGNOSTICS.record(CHANNEL_PLAYBACK_DROPPED, now, 0.0, "failed")
+                break
+        else:
+            self.dropped_frames += 1
+            DIAGNOSTICS.record(CHANNEL_PLAYBACK_DROPPED, now, 0.0, "not decoded")
+            self.decoder.prefetch(target % count, loop)
+            self._update_playback_status()
+            self._schedule_tick()
+            return
+
+        clock.shown(position, now)
+        self.playback_index = index
+        if image is not None:
+            self.show_image(image, self.playback_files[index])
+        self.decoder.prefetch(index, loop)
+        self._set_scrub_position(index)
+        self._update_playback_status()
+        self._schedule_tick()
+
+    def _record_tick(self, now) -> None:
+        """Record how late this playback tick fired against the deadline it was aimed at."""
+        if self.tick_due:
+            DIAGNOSTICS.record(CHANNEL_PLAYBACK_TICK, self.tick_due, max(0.0, now - self.tick_due))
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self.current_frame_path:
+        # Stretch what is on screen for now; frames are decoded again at the
+        # new size once resizing settles, not on every intermediate size.
+        if self.current_image is not None:
+            self.preview.setPixmap(self._fit_pixmap(self.current_image, Qt.FastTransformation))
+            self.pixmap_key = None
+        self.resize_timer.start()
+        self.header_timer.start()
+
+    def _on_resize_settled(self) -> None:
+        size = self.viewport_size()
+        if size == self.view_size:
+            return
+        self.view_size = size
+        self.decoder.set_size(size)
+        if self.playback_files and self.current_frame_path == self.playback_files[self.playback_index]:
+            self.show_playback_frame(self.playback_index)
+            if self.playing:
+                self.decoder.prefetch(self.playback_index, self.loop_check.isChecked())
+        elif self.current_frame_path:
             self.show_frame(self.current_frame_path)
 
-    def next_row_id(self) -> str:
-        self.row_counter += 1
-        return "row_{}".format(self.row_counter)
-
     @staticmethod
     def ensure_media_pool():
-        global resolve, project, media_pool
-        if media_pool:
-            return media_pool
-
-        try:
-            resolve = get_resolve()
-            project = resolve.GetProjectManager().GetCurrentProject()
-            media_pool = project.GetMediaPool() if project else None
-        except Exception:
-            media_pool = None
-
-        return media_pool
-
-    @staticmethod
-    def norm_path(path) -> str:
-        return str(path).replace("\\", "/")
+        return RESOLVE.media_pool()
 
     @staticmethod
     def thumb_path(first_file) -> str:
-        return os.path.join(os.path.dirname(first_file), ".thumb_{}.jpg".format(os.path.basename(first_file)))
+        return beside_proxy_path(first_file, POSTER)
 
     def detect_sequences(self, folder):
-        for dirpath, _dirs, files in os.walk(folder):
-            seq_map = {}
-            for name in files:
-                ext = os.path.splitext(name)[1].lower()
-                if ext not in SEQ_EXTENSIONS:
-                    continue
+        return detect_sequences(folder)
 
-                match: re.Match[str] | None = re.match(r"(.+?)([._-]?)(\d{3,})(\.[^.]+)$", name)
-                if not match:
-                    continue
+    def clear_tree(self) -> None:
+        self.model.clear()
+        self.shown_roots = set()
+        self.listed_roots = set()
 
-                seq_key: str | os.Any = match.group(1) + match.group(2) + match.group(4)
-                seq_map.setdefault(seq_key, []).append(name)
+    def populate_tree(self) -> None:
+        """Scan every root in ``roots`` in the background, patching the current tree in place.
+
+        Roots already listed by a completed scan are refreshed incrementally;
+        for the others the indexed state is shown first, then validated against
+        disk. The tree is only reset when it holds rows of a root that was
+        dropped.
+        """
+        self.cancel_scan()
+        roots = [root for root in self.roots if os.path.isdir(root)]
+        if not roots:
+            self.clear_tree()
+            self.status.setText("Invalid folder")
+            return
 
-            for seq_key, seq_files in seq_map.items():
-                if len(seq_files) < 2:
-                    continue
+        if self.shown_roots - set(roots):
+            self.clear_tree()
+        emit_cached = [root for root in roots if root not in self.listed_roots]
+        self.shown_roots.update(roots)
+        if self.watch_roots and self.watch_roots != tuple(roots):
+            self.stop_watching()
+
+        self.scan_id += 1
+        worker = SequenceScanWorker(self.scan_id, roots, self.scan_index, emit_cached, self)
+        worker.dirs_ready.connect(self._on_scan_dirs)
+        worker.dirs_removed.connect(self._on_scan_dirs_removed)
+        worker.progress.connect(self._on_scan_progress)
+        worker.scan_finished.connect(self._on_scan_finished)
+        worker.finished.connect(worker.deleteLater)
+        self.scan_worker = worker
+        self.cancel_scan_btn.setEnabled(True)
+        self.status.setText("Scanning {}...".format("; ".join(roots)))
+        worker.start()
+
+    def cancel_scan(self) -> None:
+        worker = self.scan_worker
+        if not worker:
+            return
+        worker.cancel()
+        self.scan_worker = None
+        self.model.resort()
+        self.cancel_scan_btn.setEnabled(False)
+        self.status.setText("Scan cancelled ({} sequence(s) listed)".format(len(self.store)))
+
+    def apply_directory_records(self, dirpath, records) -> None:
+        """Replace the rows listed for ``dirpath`` with ``records``, keeping check state of surviving rows."""
+        new_slots = self.model.replace_directory(dirpath, records)
+        if AUTO_POSTERS and new_slots:
+            self.proxy_store.queue([self.store.get(slot)["first_file"] for slot in new_slots], POSTER)
+
+    def _on_filter_text_changed(self, text) -> None:
+        # Name filters holding a trigram go through the search index and apply
+        # on every keystroke; shorter ones match most rows and the other fields
+        # test each row, so those wait for typing to pause.
+        if self.filter_field.currentData() == FIELD_NAME and is_instant(text):
+            self.filter_timer.stop()
+            self.apply_filter()
+        else:
+            self.filter_timer.start()
+
+    def apply_filter(self, *_args) -> None:
+        text = self.filter_edit.text()
+        selected = [index.data(SLOT_ROLE) for index in self.tree.selectionModel().selectedRows()]
+        started = time.perf_counter()
+        with DIAGNOSTICS.span(CHANNEL_FILTER, text):
+            self.model.set_filter(self.store.matcher(self.filter_field.currentData(), text))
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._reselect(selected)
+        self.status.setText("{} of {} sequence(s) listed ({:.1f} ms)".format(
+            self.model.rowCount(), len(self.store), elapsed_ms
+        ))
+
+    def _reselect(self, slots) -> None:
+        """Select the rows of ``slots`` that survived a model reset, without re-running selection handlers."""
+        if not slots:
+            return
+        rows = [row for row in (self.model.row_of(slot) for slot in slots) if row >= 0]
+        if not rows:
+            return
+        selection = self.tree.selectionModel()
+        selection.blockSignals(True)
+        try:
+            for row in rows:
+                selection.select(
+                    self.model.index(row, 0), QItemSelectionModel.Select | QItemSelectionModel.Rows
+                )
+        finally:
+            selection.blockSignals(False)
+        self.tree.viewport().update()
+        self.tree.scrollTo(self.model.index(rows[0], 0))
+
+    def set_listed_checked(self, checked) -> None:
+        """Check or uncheck every sequence that passes the current filter."""
+        changed = self.model.set_checked(self.model.visible_slots(), checked)
+        self.status.setText(
+            "{} {} sequence(s); {} checked".format("Checked" if checked else "Unchecked", changed, len(self.store.checked))
+        )
+
+    def _on_scan_dirs(self, scan_id, dir_batch) -> None:
+        if scan_id != self.scan_id or not self.scan_worker:
+            return
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for dirpath, records in dir_batch:
+                self.apply_directory_records(dirpath, records)
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
-                seq_files = sorted(seq_files)
-                first_name = seq_files[0]
-                last_name = seq_files[-1]
+    def _on_scan_dirs_removed(self, scan_id, dirpaths) -> None:
+        if scan_id != self.scan_id or not self.scan_worker:
+            return
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for dirpath in dirpaths:
+                self.apply_directory_records(dirpath, [])
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
-                first_match: re.Match[str] | None = re.search(r"(\d{3,})(\.[^.]+)$", first_name)
-                last_match: re.Match[str] | None = re.search(r"(\d{3,})(\.[^.]+)$", last_name)
-                start_index: int = int(first_match.group(1)) if first_match else 0
-                end_index: int = int(last_match.group(1)) if last_match else len(seq_files) - 1
+    def _on_scan_progress(self, scan_id, dir_count, rescanned, seq_count, elapsed) -> None:
+        if scan_id != self.scan_id or not self.scan_worker:
+            return
+        rate = dir_count / elapsed if elapsed > 0 else 0.0
+        self.status.setText(
+            "Scanning... {} dirs ({:.0f} dirs/s, {} rescanned), {} sequence(s) found".format(
+                dir_count, rate, rescanned, seq_count
+            )
+        )
 
-                name_match: re.Match[str] | None = re.match(r"(.+?)([._-]?)(\d{3,})(\.[^.]+)$", first_name)
-                if not name_match:
+    def _on_scan_finished(self, scan_id, dir_count, rescanned, seq_count, cancelled) -> None:
+        if scan_id != self.scan_id or not self.scan_worker:
+            return
+        roots = self.scan_worker.roots
+        self.scan_worker = None
+        self.model.resort()
+        self.cancel_scan_btn.setEnabled(False)
+        if cancelled:
+            self.status.setText("Scan cancelled ({} sequence(s) listed)".format(len(self.store)))
+        else:
+            self.listed_roots = set(roots)
+            self.status.setText(
+                "Found {} sequence(s) in {} dirs ({} rescanned)".format(seq_count, dir_count, rescanned)
+            )
+            if self.watch_check.isChecked():
+                self.start_watching()
+
+    def set_watching(self, enabled) -> None:
+        if not enabled:
+            self.stop_watching()
+            self.status.setText("Stopped watching")
+        elif self.listed_roots and not self.scan_worker:
+            self.start_watching()
+        # Otherwise watching starts when the running or next scan finishes.
+
+    def start_watching(self) -> None:
+        """Watch every directory the finished scan listed under the listed roots.
+
+        One notifying backend serves all roots; a root it cannot cover (a
+        network mount, say) is polled.
+        """
+        roots = tuple(root for root in self.roots if root in self.listed_roots)
+        if self.watch_roots != roots:
+            self.stop_watching()
+        if not roots:
+            return
+        backends = {root: choose_backend(root, WATCH_BACKEND) for root in roots}
+        if self.watcher is None:
+            backend = next((choice for choice in backends.values() if choice != BACKEND_POLL), BACKEND_POLL)
+            primary = None
+            try:
+                if backend == BACKEND_INOTIFY:
+                    primary = InotifyWatcher(self.watch_dirty_set)
+                elif backend == BACKEND_QT:
+                    primary = QtDirectoryWatcher(self.watch_dirty_set, self)
+            except OSError as exc:
+                print("[Shot Loader] {} watch unavailable, polling instead: {}".format(backend, exc))
+                backend = BACKEND_POLL
+            self.watcher = DirectoryWatcher(self.watch_dirty_set, primary, WATCH_POLL_INTERVAL)
+            self.watch_backend = backend
+            self.watch_roots = roots
+            self.watch_known = set()
+        self.watch_poll_roots = {root for root in roots if backends[root] == BACKEND_POLL}
+        for root in roots:
+            known = (set(self.scan_index.load(root)) or {root}) - self.watch_known
+            self.watcher.add(known, poll=root in self.watch_poll_roots)
+            self.watch_known |= known
+        notified, polled = self.watcher.counts()
+        print("[Shot Loader] Watching {} folder(s) under {} ({}: {} notified, {} polled)".format(
+            len(self.watch_known), "; ".join(roots), self.watch_backend, notified, polled
+        ))
+
+    def stop_watching(self) -> None:
+        self.watch_timer.stop()
+        self.watch_id += 1
+        if self.watch_worker:
+            self.watch_worker.cancel()
+            self.watch_worker = None
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+        self.watch_dirty_set.take()
+        self.watch_roots = ()
+        self.watch_poll_roots = set()
+        self.watch_known = set()
+
+    def _on_watch_dirty(self) -> None:
+        # Batch everything that arrives within the debounce window, so a
+        # render writing frames continuously refreshes at most twice a second.
+        if self.watcher and not self.watch_timer.isActive():
+            self.watch_timer.start()
+
+    def _rescan_watched(self) -> None:
+        if not self.watcher:
+            return
+        if self.watch_worker:
+            self.watch_timer.start()
+            return
+        dirpaths = self.watch_dirty_set.take()
+        if not dirpaths:
+            return
+        worker = WatchRescanWorker(self.watch_id, self.watch_roots, dirpaths, frozenset(self.watch_known), self)
+        worker.dirs_changed.connect(self._on_watched_dirs_changed)
+        worker.finished.connect(self._on_watch_worker_finished)
+        worker.finished.connect(worker.deleteLater)
+        self.watch_worker = worker
+        worker.start()
+
+    def _on_watch_worker_finished(self) -> None:
+        if self.watch_worker is self.sender():
+            self.watch_worker = None
+
+    def _on_watched_dirs_changed(self, watch_id, results) -> None:
+        if watch_id != self.watch_id or not self.watcher:
+            return
+        changed: dict = {}
+        removed: list[str] = []
+        added: list[str] = []
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for dirpath, mtime_ns, subdirs, records in results:
+                if mtime_ns is None:
+                    prefix = dirpath.rstrip(os.sep) + os.sep
+                    gone = [path for path in self.watch_known if path == dirpath or path.startswith(prefix)]
+                    for path in gone:
+                        self.apply_directory_records(path, [])
+                    removed.extend(gone)
                     continue
-
-                padding: int = len(name_match.group(3))
-                pattern_printf: str = os.path.join(
-                    dirpath,
-                    "{}{}%0{}d{}".format(name_match.group(1), name_match.group(2), padding, name_match.group(4)),
-                )
-                pattern_hash: str = os.path.join(
-                    dirpath,
-                    "{}{}{}{}".format(name_match.group(1), name_match.group(2), "#" * padding, name_match.group(4)),
-                )
-
-                yield {
-                    "seq_key": seq_key,
-                    "folder": dirpath,
-                    "folder_name": Path(dirpath).name or dirpath,
-                    "first_file": os.path.join(dirpath, first_name),
-                    "frames": len(seq_files),
-                    "start_index": start_index,
-                    "end_index": end_index,
-                    "extension": os.path.splitext(first_name)[1].lower(),
-                    "pattern_printf": pattern_printf,
-                    "pattern_hash": pattern_hash,
-                }
-
-    def populate_tree(self) -> None:
-        self.tree.clear()
-        self.row_data = {}
-        if not self.root_path or not os.path.isdir(self.root_path):
-            self.status.setText("Invalid folder")
+                self.apply_directory_records(dirpath, records)
+                changed[dirpath] = (mtime_ns, subdirs, records)
+                if dirpath not in self.watch_known:
+                    added.append(dirpath)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+        if removed:
+            self.watcher.remove(removed)
+            self.watch_known.difference_update(removed)
+        if added:
+            for dirpath in added:
+                self.watcher.add([dirpath], poll=root_for(dirpath, self.watch_roots) in self.watch_poll_roots)
+            self.watch_known.update(added)
+        by_root: dict = {}
+        for dirpath, entry in changed.items():
+            by_root.setdefault(root_for(dirpath, self.watch_roots), ({}, []))[0][dirpath] = entry
+        for dirpath in removed:
+            by_root.setdefault(root_for(dirpath, self.watch_roots), ({}, []))[1].append(dirpath)
+        for root, (root_changed, root_removed) in by_root.items():
+            if root is not None:
+                self.scan_index.save(root, root_changed, root_removed)
+        self._follow_current_sequence(set(changed) | set(removed))
+
+    def _follow_current_sequence(self, dirpaths) -> None:
+        """Pick up new frames of the sequence being shown when its folder changed."""
+        current = self.current_sequence
+        if not current or current["folder"] not in dirpaths:
+            return
+        slot = self.store.slot_of(current["folder"], current["seq_key"])
+        if slot is None:
+            return
+        seq = self.store.get(slot)
+        if seq == current:
             return
+        self.current_sequence = seq
+        self._refresh_playback_frames()
+        self.show_sequence_meta(seq)
 
-        count = 0
-        for seq in self.detect_sequences(self.root_path):
-            row_id: str = self.next_row_id()
-            self.row_data[row_id] = seq
-
-            item = QTreeWidgetItem([
-                "{} / {}".format(seq["folder_name"], seq["seq_key"]),
-                str(seq["frames"]),
-                "{}-{}".format(seq["start_index"], seq["end_index"]),
-                seq["extension"],
-            ])
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-            item.setCheckState(0, Qt.Unchecked)
-            item.setData(0, Qt.UserRole, row_id)
-            self.tree.addTopLevelItem(item)
-            count += 1
-
-        self.status.setText("Found {} sequence(s)".format(count))
-
-    def get_checked_row_ids(self) -> list[str]:
-        checked_row_ids: list[str] = []
-        total_items = self.tree.topLevelItemCount()
-        for index in range(total_items):
-            item = self.tree.topLevelItem(index)
-            if not item:
-                continue
-            if item.checkState(0) == Qt.Checked:
-                row_id = item.data(0, Qt.UserRole)
-                if row_id:
-                    checked_row_ids.append(row_id)
-        return checked_row_ids
+    def get_checked_row_ids(self) -> list[int]:
+        return self.model.checked_slots()
 
     def select_folder(self) -> None:
-        start_dir: str = self.root_path if self.root_path else DEFAULT_ROOT
+        start_dir: str = self.roots[0] if self.roots else DEFAULT_ROOT
         folder: str = QFileDialog.getExistingDirectory(self, "Select Sequence Folder", start_dir)
         if folder:
-            self.root_path: str = folder
-            self.path_label.setText(folder)
+            self.roots = [folder]
+            self._update_path_label()
+            self.populate_tree()
+
+    def add_folder(self) -> None:
+        """Add a shot root; the ones already listed stay and only the new one is walked in full."""
+        start_dir: str = self.roots[-1] if self.roots else DEFAULT_ROOT
+        folder: str = QFileDialog.getExistingDirectory(self, "Add Sequence Folder", start_dir)
+        if folder and folder not in self.roots:
+            self.roots.append(folder)
+            self._update_path_label()
             self.populate_tree()
 
+    def _update_path_label(self) -> None:
+        self.path_label.setText("; ".join(self.roots) or "No folder selected")
+        self.path_label.setToolTip("\n".join(self.roots))
+
     @staticmethod
     def clip_uid(clip) -> str:
         try:
@@ -433,141 +2218,230 @@ class ShotLoaderPanel(QWidget):
             pass
         return str(id(clip))
 
-    def snapshot_pool(self):
-        current_media_pool = self.ensure_media_pool()
-        if not current_media_pool:
-            return set(), []
-        clips = list(current_media_pool.GetRootFolder().GetClipList() or [])
-        ids: set[str] = {self.clip_uid(c) for c in clips}
-        return ids, clips
-
-    def import_sequence_item(self, seq):
-        current_media_pool = self.ensure_media_pool()
-        if not current_media_pool:
-            return []
-
-        first_file: str = self.norm_path(seq["first_file"])
-        pattern_printf: str = self.norm_path(seq["pattern_printf"])
-        pattern_hash: str = self.norm_path(seq["pattern_hash"])
+    @staticmethod
+    def project_key():
+        return RESOLVE.project_key()
 
-        print("[Shot Loader] Importing: {}".format(seq["seq_key"]))
+    @staticmethod
+    def _log_import_attempt(attempt) -> None:
+        print("[Shot Loader] {}".format(attempt.describe()))
+        if attempt.started is not None:
+            DIAGNOSTICS.record(
+                CHANNEL_IMPORT, attempt.started, attempt.seconds, "{} {}".format(attempt.call, attempt.form)
+            )
 
-        attempts = [
-            [{"FilePath": pattern_printf, "StartIndex": int(seq["start_index"]), "EndIndex": int(seq["end_index"])}],
-            [{"FilePath": pattern_hash, "StartIndex": int(seq["start_index"]), "EndIndex": int(seq["end_index"])}],
-            [first_file],
-            first_file,
-        ]
+    def sequence_import_item(self, seq):
+        """An :class:`ImportItem` with one run per stretch of present, verified frames, or ``None``."""
+        # Gaps and partial renders never reach the media pool.
+        item = sequence_import_item(seq, self.sequence_bad_frames(seq))
+        if item is None:
+            print("[Shot Loader] Import skipped for {}: no frames passed verification".format(seq["seq_key"]))
+        return item
 
-        for payload in attempts:
-            try:
-                result = current_media_pool.ImportMedia(payload)
-            except Exception as exc:
-                print("[Shot Loader] ImportMedia error: {}".format(exc))
-                continue
+    def prepare_import(self, seqs):
+        """Return ``(media_pool, items, import_bin)`` for ``seqs``; ``media_pool`` is ``None`` without Resolve."""
+        current_media_pool = self.ensure_media_pool()
+        if not current_media_pool:
+            return None, [], None
+
+        items = [item for item in (self.sequence_import_item(seq) for seq in seqs) if item]
+        if not items:
+            return current_media_pool, items, None
+        import_bin, indexed = prepare_import(current_media_pool, self.clip_index, self.project_key(), IMPORT_BIN_NAME)
+        if indexed:
+            print("[Shot Loader] Indexed {} clip(s) in the media pool".format(len(self.clip_index)))
+        if import_bin is None:
+            print("[Shot Loader] Could not create bin '{}', importing into the current bin".format(IMPORT_BIN_NAME))
+        return current_media_pool, items, import_bin
 
-            if result:
-                print("[Shot Loader] Import OK with payload: {}".format(payload))
-                if isinstance(result, (list, tuple)):
-                    return [c for c in result if c]
-                return [result]
+    @staticmethod
+    def report_import(run) -> None:
+        if run.reused:
+            print("[Shot Loader] {} sequence(s) already in the project ({} relinked)".format(run.reused, run.relinked))
+        for item in run.failed():
+            print("[Shot Loader] Import FAILED for {}".format(item.name))
+
+    def import_sequences(self, seqs) -> list:
+        """Import ``seqs`` synchronously and return their clips in sequence order."""
+        current_media_pool, items, import_bin = self.prepare_import(seqs)
+        if not items:
+            return []
+        print("[Shot Loader] Importing {} sequence(s)".format(len(items)))
+        run = self.importer.start(current_media_pool, items, self.clip_index, REIMPORT_POLICY)
+        previous_bin = switch_bin(current_media_pool, import_bin)
+        try:
+            for _step in run.steps():
+                pass
+        finally:
+            switch_bin(current_media_pool, previous_bin)
+        self.report_import(run)
+        return run.clips()
 
-        print("[Shot Loader] Import FAILED for {}".format(seq["seq_key"]))
-        return []
+    def import_sequence_item(self, seq):
+        return self.import_sequences([seq])
 
     def import_all_and_create_timeline(self) -> None:
-        current_media_pool = self.ensure_media_pool()
+        if self.import_job:
+            self.status.setText("An import is already running")
+            return
+        checked_row_ids = self.get_checked_row_ids()
+        if not checked_row_ids:
+            self.status.setText("No checked sequence(s) to import")
+            return
+        seqs = [seq for seq in (self.store.get(row_id) for row_id in checked_row_ids) if seq]
+        current_media_pool, items, import_bin = self.prepare_import(seqs)
         if not current_media_pool:
             self.status.setText("Resolve project/media pool unavailable")
             return
+        if not items:
+            self.status.setText("Nothing to import: no checked sequence has verified frames")
+            return
 
-        checked_row_ids = self.get_checked_row_ids()
-        total: int = len(checked_row_ids)
-        if total == 0:
-            self.status.setText("No checked sequence(s) to import")
+        print("[Shot Loader] Importing {} sequence(s)".format(len(items)))
+        self.status.setText("Importing {} checked sequence(s)...".format(len(items)))
+        # Items only carry their pattern; the folder decides which shot's timeline their clips join.
+        self.import_folders = {source_key(norm_path(seq["pattern_printf"])): seq["folder"] for seq in seqs}
+        run = self.importer.start(current_media_pool, items, self.clip_index, REIMPORT_POLICY)
+        self.import_job = ImportJob(run, current_media_pool, import_bin, IMPORT_SLICE_MS, self)
+        self.import_dialog = ProgressDialog(len(items), self)
+        self.import_dialog.pause_btn.toggled.connect(self._toggle_import_pause)
+        self.import_dialog.cancel_btn.clicked.connect(self.import_job.cancel)
+        self.import_dialog.rejected.connect(self.import_job.cancel)
+        self.import_job.progress.connect(self.import_dialog.update_progress)
+        self.import_job.import_finished.connect(self._on_import_finished)
+        self.import_btn.setEnabled(False)
+        self.import_dialog.show()
+        self.import_job.start()
+
+    def _toggle_import_pause(self, paused) -> None:
+        if not self.import_job:
             return
-        self.status.setText("Importing checked sequences...")
-        progress_dialog: ProgressDialog = ProgressDialog(total, self)
-        progress_dialog.show()
-        before_ids, _before_clips = self.snapshot_pool()
+        if paused:
+            self.import_job.pause()
+        else:
+            self.import_job.resume()
+        self.import_dialog.set_paused(paused)
+
+    def _on_import_finished(self, state) -> None:
+        job, dialog = self.import_job, self.import_dialog
+        self.import_job = None
+        self.import_dialog = None
+        self.import_btn.setEnabled(True)
+        if dialog:
+            dialog.close()
+            dialog.deleteLater()
+        run = job.run
+        import_seconds = job.active_seconds()
+        job.deleteLater()
+        self.report_import(run)
+        folders, self.import_folders = self.import_folders, {}
+
         imported_clips = []
         imported_clip_ids = set()
-        for i, row_id in enumerate(checked_row_ids):
-            seq = self.row_data.get(row_id)
-            if not seq:
-                continue
-            clips = self.import_sequence_item(seq)
-            for clip in clips:
-                uid = self.clip_uid(clip)
-                if uid not in imported_clip_ids:
-                    imported_clip_ids.add(uid)
-                    imported_clips.append(clip)
-            progress_dialog.setValue(i + 1)
-        if not imported_clips:
-            after_ids, after_clips = self.snapshot_pool()
-            new_ids: set[str] = after_ids - before_ids
-            for clip in after_clips:
-                uid: str = self.clip_uid(clip)
-                if uid in new_ids:
-                    imported_clips.append(clip)
+        for clip in run.clips():
+            uid = self.clip_uid(clip)
+            if uid not in imported_clip_ids:
+                imported_clip_ids.add(uid)
+                imported_clips.append(clip)
+        outcome = "{} of {} sequence(s)".format(run.done, run.total)
+        if state == ImportJob.CANCELLED:
+            outcome = "cancelled after " + outcome
+        elif state == ImportJob.FAILED:
+            outcome = "stopped by an error after " + outcome
         if not imported_clips:
-            self.status.setText("Import failed")
-            progress_dialog.close()
-            return
-        timeline_base: str = "{}_Timeline".format(Path(self.root_path).name or "Shots")
-        timeline_name: str = timeline_base
-        timeline = None
-        for idx in range(0, 100):
-            try_name = timeline_name if idx == 0 else "{}_{}".format(timeline_base, idx + 1)
-            try:
-                timeline = current_media_pool.CreateEmptyTimeline(try_name)
-            except Exception:
-                timeline = None
-            if timeline:
-                timeline_name = try_name
-                break
-        if not timeline:
-            self.status.setText("Imported {} clips, timeline creation failed".format(len(imported_clips)))
-            progress_dialog.close()
+            if state == ImportJob.FAILED:
+                self.status.setText("Import failed: {}".format(job.error))
+            else:
+                self.status.setText("Import {}: no clips imported".format(
+                    "cancelled" if state == ImportJob.CANCELLED else "failed"
+                ))
             return
-        try:
-            appended = current_media_pool.AppendToTimeline(imported_clips)
-        except Exception as exc:
-            print("[Shot Loader] AppendToTimeline error: {}".format(exc))
-            appended = False
-        if appended:
-            self.status.setText(
-                "Timeline '{}' created with {} clips from {} checked sequence(s)".format(
-                    timeline_name,
-                    len(imported_clips),
-                    total,
-                )
-            )
-        else:
-            self.status.setText("Timeline created, append failed")
-        progress_dialog.setValue(total)
-        progress_dialog.close()
 
-    def on_tree_selection(self) -> None:
-        selected: List[QTreeWidgetItem] = self.tree.selectedItems()
+        entries = [(folders.get(item.source_key), clips) for item, clips in zip(run.items, run.clips_by_item)]
+        entries.append((None, run.unmatched))
+        assembly = self.build_timelines(job.media_pool, entries, import_seconds)
+        built = [plan for plan in assembly.plans if plan.timeline is not None]
+        stages = assembly.describe_stages()
+        print("[Shot Loader] Timelines: {} ({})".format("; ".join(plan.describe() for plan in assembly.plans), stages))
+        if not built:
+            self.status.setText("Imported {} clips ({}), timeline creation failed".format(len(imported_clips), outcome))
+        elif any(plan.appended < len(plan.clips) for plan in built):
+            self.status.setText("Timeline created, append failed ({})".format(stages))
+        elif len(built) == 1:
+            self.status.setText("Timeline '{}' created with {} clips ({}; {})".format(
+                built[0].name, len(imported_clips), outcome, stages
+            ))
+        else:
+            self.status.setText("{} timelines created with {} clips ({}; {})".format(
+                len(built), len(imported_clips), outcome, stages
+            ))
+
+    def build_timelines(self, current_media_pool, entries, import_seconds=0.0):
+        """Build timelines in the chosen mode from ``(folder, clips)`` entries and return their :class:`TimelineAssembly`."""
+        base_name = "{}_Timeline".format(Path(self.roots[0]).name if self.roots else "Shots")
+        groups = timeline_groups(entries, base_name, self.timeline_mode_combo.currentData(), self.roots)
+        assembly = TimelineAssembly(current_media_pool, RESOLVE.project, recorder=DIAGNOSTICS.channel(CHANNEL_TIMELINE))
+        assembly.add_stage(STAGE_IMPORT, import_seconds)
+        assembly.build(groups)
+        return assembly
+
+    def show_resident(self) -> None:
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def quit_resident(self) -> None:
+        self.resident = False
+        self.close()
+        QCoreApplication.quit()
+
+    def closeEvent(self, event):
+        if self.resident:
+            # Keep scan results, caches and the Resolve connection warm for
+            # the next launch; running imports and scans carry on.
+            self._halt_playback()
+            self.hide()
+            event.ignore()
+            return
+        if self.import_job:
+            self.import_job.cancel()
+        self.stop_watching()
+        self.cancel_scan()
+        self.cancel_verification()
+        workers = self.findChildren(SequenceScanWorker) + self.findChildren(FrameVerifyWorker)
+        for worker in workers + self.findChildren(WatchRescanWorker):
+            worker.cancel()
+            worker.wait()
+        self._halt_playback()
+        for timer in self.findChildren(QTimer):
+            timer.stop()
+        self.decoder.shutdown()
+        self.proxy_store.close()
+        self.header_cache.close()
+        super().closeEvent(event)
+
+    def on_tree_selection(self, *_args) -> None:
+        selected = self.tree.selectionModel().selectedRows()
         if not selected:
-            self.play_timer.stop()
+            self._halt_playback()
             self.playback_files = []
+            self.playback_proxies = None
+            self.decoder.set_frames([])
+            self._update_playback_status()
             self.current_frame_path = ""
-            self.preview.setText("Select a sequence")
+            self.show_preview_text("Select a sequence")
             self.meta.setPlainText("")
             return
 
-        item: QTreeWidgetItem = selected[0]
-        row_id = item.data(0, Qt.UserRole)
-        seq = self.row_data.get(row_id)
+        seq = self.store.get(selected[0].data(SLOT_ROLE))
         if not seq:
             return
 
-        first_file = seq["first_file"]
-        if not self.play_timer.isActive():
-            self.show_frame(first_file)
+        if not self.playing:
+            self.show_poster(seq)
+        self.show_sequence_meta(seq)
 
+    def show_sequence_meta(self, seq) -> None:
         meta_lines: list[str] = [
             "Sequence : {}".format(seq["seq_key"]),
             "Folder   : {}".format(seq["folder"]),
@@ -577,10 +2451,75 @@ class ShotLoaderPanel(QWidget):
             "Frames   : {}".format(seq["frames"]),
             "Range    : {}-{}".format(seq["start_index"], seq["end_index"]),
         ]
+        runs = seq.get("frame_ranges") or []
+        gaps = missing_runs(runs)
+        if gaps:
+            meta_lines.append("Missing  : {} frame(s): {}".format(seq["missing"], format_runs(gaps)))
+            meta_lines.append("Present  : {}".format(format_runs(runs)))
+        slot = self.store.slot_of(seq["folder"], seq["seq_key"])
+        if slot is not None and slot in self.store.verified:
+            bad = self.store.bad_frames(slot)
+            if bad:
+                meta_lines.append("Verified : {} frame(s) excluded: {}".format(len(bad), describe_bad_frames(bad)))
+            else:
+                meta_lines.append("Verified : all frames OK")
+        else:
+            meta_lines.append("Verified : not checked")
+        header = self.model.header(slot) if slot is not None else None
+        if header is None:
+            meta_lines.append("Image    : reading header...")
+            self.request_visible_headers()
+        else:
+            meta_lines.extend("{:<9}: {}".format(label, value) for label, value in describe_metadata(header))
         self.meta.setPlainText("\n".join(meta_lines))
 
+    def visible_header_slots(self) -> list[int]:
+        """Slots of the rows on screen, top to bottom."""
+        rows = self.model.rowCount()
+        if not rows:
+            return []
+        viewport = self.tree.viewport()
+        top = self.tree.indexAt(QPoint(0, 0)).row()
+        bottom = self.tree.indexAt(QPoint(0, viewport.height() - 1)).row()
+        top = max(top, 0)
+        bottom = rows - 1 if bottom < 0 else bottom
+        return [self.model.slot_at(row) for row in range(top, bottom + 1)]
+
+    def request_visible_headers(self) -> None:
+        """Read headers for the selected row and the rows on screen, unread ones first.
+
+        Rows with a header are asked for again too, so an overwritten frame is
+        picked up; that costs a ``stat`` when the file is unchanged.
+        """
+        slots = self.visible_header_slots()
+        selected = self.tree.selectionModel().selectedRows()
+        if selected:
+            slots.insert(0, selected[0].data(SLOT_ROLE))
+        unread = [slot for slot in slots if self.store.header(slot) is None]
+        ordered = unread + [slot for slot in slots if self.store.header(slot) is not None]
+        self.header_slots = {self.store.first_file(slot): slot for slot in ordered}
+        self.header_cache.request(list(self.header_slots), self.header_read.emit)
+
+    def _on_header_read(self, path, metadata) -> None:
+        slot = self.header_slots.get(path)
+        if slot is None or slot not in self.store or self.store.first_file(slot) != path:
+            return
+        if self.store.header(slot) == metadata:
+            return
+        self.store.set_header(slot, metadata)
+        if not self.header_repaint_timer.isActive():
+            self.header_repaint_timer.start()
+        selected = self.tree.selectionModel().selectedRows()
+        if selected and selected[0].data(SLOT_ROLE) == slot:
+            self.show_sequence_meta(self.store.get(slot))
+
 
 app: QCoreApplication | QApplication = QApplication.instance() or QApplication(sys.argv)
 panel = ShotLoaderPanel()
+if RESIDENT:
+    resident_server = ResidentServer(panel)
+    if resident_server.listen():
+        panel.resident = True
+        app.setQuitOnLastWindowClosed(False)
 panel.show()
 app.exec()
@@ -0,0 +1,78 @@
+"""Time EXR preview decoding (header, full and reduced-resolution reads, display conversion) on synthetic 2K frames.
+
+The target applies to the reduced-resolution read the panel uses for previews.
+
+    python benchmarks/bench_exr_preview.py --compression zips --target-ms 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from synthetic import gradient_planes, write_exr
+
+from element_browser.exr import ExrPreviewReader, read_exr_channels, read_exr_header, to_display_rgb32
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--compression", choices=["none", "zips", "zip"], default="zips")
+    parser.add_argument("--preview-size", type=int, default=1024, help="longest side requested for reduced reads")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=50.0, help="fail if the preview-size read and conversion is slower")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="eb_exr_") as root:
+        path = os.path.join(root, "plate.1001.exr")
+        write_exr(path, gradient_planes(args.width, args.height), args.compression)
+
+        def full():
+            _names, planes, _step = read_exr_channels(path)
+            to_display_rgb32(planes)
+
+        def reduced():
+            _names, planes, _step = read_exr_channels(path, args.preview_size)
+            to_display_rgb32(planes)
+
+        _names, planes, _step = read_exr_channels(path)
+        reader = ExrPreviewReader()
+        reader.read_rgb32(path, args.preview_size)
+        results = {
+            "frame": "{}x{} {}".format(args.width, args.height, args.compression),
+            "file_mb": round(os.path.getsize(path) / (1024 * 1024), 2),
+            "header_ms": round(timed(lambda: read_exr_header(path), args.repeat), 3),
+            "convert_ms": round(timed(lambda: to_display_rgb32(planes), args.repeat), 3),
+            "full_ms": round(timed(full, args.repeat), 3),
+            "reduced_ms": round(timed(reduced, args.repeat), 3),
+            "cached_ms": round(timed(lambda: reader.read_rgb32(path, args.preview_size), args.repeat), 3),
+            "target_ms": args.target_ms,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            print("{:<11} {}".format(key, value))
+    if results["reduced_ms"] > args.target_ms:
+        print("FAIL: preview read took {} ms (target {} ms)".format(results["reduced_ms"], args.target_ms))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,259 @@
+"""Compare per-sequence ImportMedia calls with the batched importer against a mock media pool.
+
+Each scenario configures which payload forms the mock accepts. The legacy path
+tries printf, hash, ``[first_file]`` and ``first_file`` on every sequence; the
+batched importer must bring in the same clips with fewer calls. The run also
+checks the importer's behaviour against the mock: a learned payload form is
+reused, a failed batch falls back to one sequence at a time, the reimport
+policies, and ``clips_by_item`` lining up with the items when some fail.
+
+    python benchmarks/bench_import.py --sequences 200 --latency-ms 20
+"""
+
+import argparse
+import json
+import time
+
+import synthetic  # noqa: F401  (puts Modules on sys.path)
+from mock_resolve import MockMediaPool
+
+from element_browser.media_import import (
+    FORM_FIRST_FILE,
+    FORM_FIRST_FILE_LIST,
+    FORM_HASH,
+    FORM_PRINTF,
+    PAYLOAD_FORMS,
+    REIMPORT_IMPORT,
+    REIMPORT_RELINK,
+    REIMPORT_SKIP,
+    ClipIndex,
+    ImportItem,
+    MediaImporter,
+)
+
+SCENARIOS = {
+    "printf": {".exr": {FORM_PRINTF}, ".png": {FORM_PRINTF}},
+    "hash-only": {".exr": {FORM_HASH}, ".png": {FORM_HASH}},
+    "first-file-only": {".exr": {FORM_FIRST_FILE}, ".png": {FORM_FIRST_FILE_LIST}},
+    "mixed": {".exr": {FORM_HASH, FORM_FIRST_FILE}, ".png": {FORM_FIRST_FILE_LIST}},
+}
+
+
+def build_items(count, prefix="/shots", gap_every=0):
+    """``count`` sequences, every third a PNG; with ``gap_every`` every n-th has two frame runs."""
+    items = []
+    for index in range(count):
+        extension = ".exr" if index % 3 else ".png"
+        stem = "{}/shot_{:04d}/render/plate.".format(prefix, index)
+        runs = [(1001, 1040), (1061, 1100)] if gap_every and index % gap_every == 0 else [(1001, 1100)]
+        items.append(ImportItem(
+            "shot_{:04d}/plate.{}".format(index, extension),
+            stem + "%04d" + extension,
+            stem + "####" + extension,
+            stem + "1001" + extension,
+            runs,
+        ))
+    return items
+
+
+def misplaced_clips(items, clips_by_item) -> str | None:
+    """Where ``clips_by_item`` does not hold one clip per frame run of its own item."""
+    if len(clips_by_item) != len(items):
+        return "{} clip lists for {} items".format(len(clips_by_item), len(items))
+    for item, clips in zip(items, clips_by_item):
+        if len(clips) != len(item.runs) or not all(item.owns_clip_path(clip.path) for clip in clips):
+            return "{}: got {}".format(item.name, [clip.path for clip in clips])
+    return None
+
+
+def check_learned_form() -> str | None:
+    """The form learned on a style's first sequence imports the rest of it in batches, and the next run too."""
+    importer = MediaImporter()
+    items = build_items(12)
+    clips_by_item, _unmatched = importer.import_items(MockMediaPool(SCENARIOS["hash-only"]), items)
+    problem = misplaced_clips(items, clips_by_item)
+    if problem:
+        return problem
+    if set(importer.learned.values()) != {FORM_HASH} or len(importer.learned) != 2:
+        return "learned {}".format(importer.learned)
+    singles = [attempt.form for attempt in importer.log if not attempt.batch]
+    if singles != [FORM_PRINTF, FORM_HASH] * 2:
+        return "learning took {}".format(singles)
+    if any(attempt.form != FORM_HASH for attempt in importer.log if attempt.batch):
+        return "a batch did not use the learned form"
+
+    importer.log.clear()
+    items = build_items(12, "/shots2")
+    clips_by_item, _unmatched = importer.import_items(MockMediaPool(SCENARIOS["hash-only"]), items)
+    problem = misplaced_clips(items, clips_by_item)
+    if problem:
+        return "second run: {}".format(problem)
+    if not all(attempt.batch and attempt.form == FORM_HASH for attempt in importer.log):
+        return "second run learned again: {}".format([attempt.describe() for attempt in importer.log])
+    return None
+
+
+def check_batch_fallback() -> str | None:
+    """A batch that imports nothing is retried one sequence at a time, learned form first."""
+    importer = MediaImporter()
+    items = [item for item in build_items(12) if item.style[0] == ".exr"]
+    media_pool = MockMediaPool(max_entries=1)
+    clips_by_item, unmatched = importer.import_items(media_pool, items)
+    problem = misplaced_clips(items, clips_by_item)
+    if problem or unmatched:
+        return problem or "{} unmatched clip(s)".format(len(unmatched))
+    batches = [attempt for attempt in importer.log if attempt.batch]
+    if len(batches) != 1 or batches[0].clips:
+        return "expected one failed batch, got {}".format([attempt.describe() for attempt in batches])
+    if media_pool.import_calls() != len(items) + 1:
+        return "{} ImportMedia call(s) for {} sequence(s) and one batch".format(media_pool.import_calls(), len(items))
+    return None
+
+
+def check_reimport_policies() -> str | None:
+    """Sequences already in the project are reused, relinked or imported again, as the policy says."""
+    items = build_items(6)
+    media_pool = MockMediaPool()
+    clip_index = ClipIndex()
+    clip_index.attach(media_pool, "project")
+    first, _unmatched = MediaImporter().import_items(media_pool, items, clip_index=clip_index)
+    first_ids = [[clip.uid for clip in clips] for clips in first]
+
+    for policy in (REIMPORT_SKIP, REIMPORT_RELINK):
+        before = list(media_pool.calls)
+        run = MediaImporter().start(media_pool, items, clip_index, policy)
+        for _step in run.steps():
+            pass
+        calls = [name for name, _payload in media_pool.calls[len(before):]]
+        if [[clip.uid for clip in clips] for clips in run.clips_by_item] != first_ids:
+            return "{}: did not reuse the existing clips".format(policy)
+        expected = ["RelinkClips"] * len(items) if policy == REIMPORT_RELINK else []
+        if calls != expected or run.reused != len(items):
+            return "{}: made calls {} and reused {}".format(policy, calls, run.reused)
+
+    run = MediaImporter().start(media_pool, items, clip_index, REIMPORT_IMPORT)
+    for _step in run.steps():
+        pass
+    again = [[clip.uid for clip in clips] for clips in run.clips_by_item]
+    if run.reused or any(set(new) & set(old) for new, old in zip(again, first_ids)):
+        return "import: reused clips instead of importing again"
+    problem = misplaced_clips(items, run.clips_by_item)
+    if problem:
+        return "import: {}".format(problem)
+
+    # A clip deleted in Resolve is imported again even under skip.
+    media_pool.DeleteClips(first[2] + run.clips_by_item[2])
+    run = MediaImporter().start(media_pool, items, clip_index, REIMPORT_SKIP)
+    for _step in run.steps():
+        pass
+    if run.reused != len(items) - 1 or media_pool.import_calls() == 0 or not run.clips_by_item[2]:
+        return "skip: deleted clips were not imported again"
+    return None
+
+
+def check_partial_failures() -> str | None:
+    """``clips_by_item`` lines up with the items when a batch brings in only some of them."""
+    items = build_items(15, gap_every=4)
+    rejected = {2, 7, 8}
+    reject_paths = set()
+    for index in rejected:
+        reject_paths.update((items[index].pattern_printf, items[index].pattern_hash, items[index].first_file))
+    importer = MediaImporter()
+    clips_by_item, unmatched = importer.import_items(MockMediaPool(reject_paths=reject_paths), items)
+    if unmatched:
+        return "{} unmatched clip(s)".format(len(unmatched))
+    for index, (item, clips) in enumerate(zip(items, clips_by_item)):
+        if index in rejected:
+            if clips:
+                return "{}: rejected but got {}".format(item.name, [clip.path for clip in clips])
+        elif misplaced_clips([item], [clips]):
+            return misplaced_clips([item], [clips])
+    if not any(attempt.batch and attempt.clips < attempt.entries for attempt in importer.log):
+        return "no batch came back partial"
+    return None
+
+
+CHECKS = {
+    "learned_form": check_learned_form,
+    "batch_fallback": check_batch_fallback,
+    "reimport_policies": check_reimport_policies,
+    "partial_failures": check_partial_failures,
+}
+
+
+def legacy_import(media_pool, items):
+    clips = []
+    for item in items:
+        for form in PAYLOAD_FORMS:
+            result = media_pool.ImportMedia(item.payload(form))
+            if result:
+                clips.extend(result)
+                break
+    return clips
+
+
+def batched_import(media_pool, items):
+    clips_by_item, unmatched = MediaImporter().import_items(media_pool, items)
+    return [clip for clips in clips_by_item for clip in clips] + unmatched
+
+
+def run(name, accept, items, latency, reject_paths):
+    row = {"scenario": name}
+    imported = {}
+    for label, import_func in (("legacy", legacy_import), ("batched", batched_import)):
+        media_pool = MockMediaPool(accept, latency, reject_paths)
+        started = time.perf_counter()
+        clips = import_func(media_pool, items)
+        row[label + "_seconds"] = round(time.perf_counter() - started, 4)
+        row[label + "_calls"] = media_pool.import_calls()
+        imported[label] = sorted(clip.path for clip in clips)
+    row["clips"] = len(imported["batched"])
+    row["same_clips"] = imported["legacy"] == imported["batched"]
+    return row
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sequences", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="artificial delay per ImportMedia call")
+    parser.add_argument("--reject", type=int, default=3, help="sequences the mock refuses in every form")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    items = build_items(args.sequences)
+    rejected = set()
+    for item in items[1: 1 + args.reject]:
+        rejected.update((item.pattern_printf, item.pattern_hash, item.first_file))
+    results = [run(name, accept, items, args.latency_ms / 1000.0, rejected) for name, accept in SCENARIOS.items()]
+    checks = {name: check() for name, check in CHECKS.items()}
+
+    if args.json:
+        print(json.dumps({
+            "sequences": args.sequences,
+            "latency_ms": args.latency_ms,
+            "results": results,
+            "checks": {name: problem or "ok" for name, problem in checks.items()},
+        }, indent=2))
+    else:
+        print("{} sequences, {} rejected, {:.1f} ms per call".format(args.sequences, args.reject, args.latency_ms))
+        for row in results:
+            print(
+                "{scenario:<16} legacy {legacy_calls:>4} calls {legacy_seconds:8.3f}s   "
+                "batched {batched_calls:>4} calls {batched_seconds:8.3f}s   {clips} clips".format(**row)
+            )
+        for name, problem in checks.items():
+            print("{:<18} {}".format(name, problem or "ok"))
+    status = 0
+    failed = [row["scenario"] for row in results if not row["same_clips"] or row["batched_calls"] > row["legacy_calls"]]
+    if failed:
+        print("FAIL: batched import differs from or is slower than the legacy path in: {}".format(", ".join(failed)))
+        status = 1
+    for name, problem in checks.items():
+        if problem:
+            print("FAIL: {}: {}".format(name, problem))
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+"""Compare serial and parallel sequence scans on a synthetic tree with injected per-directory latency.
+
+    python benchmarks/bench_parallel_scan.py --shots 200 --latency-ms 5 --workers 1 4 8 16
+"""
+
+import argparse
+import json
+import tempfile
+import time
+
+from synthetic import build_shot_tree
+
+from element_browser.scan import ParallelDirectoryWalker, visit_sequences, walk_directories
+
+
+def record_key(record):
+    return record["folder"], record["seq_key"]
+
+
+def run_scan(root, workers, latency):
+    def visit(dirpath):
+        if latency:
+            time.sleep(latency)
+        return visit_sequences(dirpath)
+
+    started = time.perf_counter()
+    if workers > 1:
+        walk = ParallelDirectoryWalker(workers).walk(root, visit)
+    else:
+        walk = walk_directories(root, visit)
+    records = [record for _dirpath, dir_records in walk for record in dir_records]
+    return time.perf_counter() - started, sorted(records, key=record_key)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=100)
+    parser.add_argument("--seqs-per-shot", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=24)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="artificial delay per directory listing")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    latency = args.latency_ms / 1000.0
+    results = []
+    with tempfile.TemporaryDirectory(prefix="eb_scan_") as root:
+        build_shot_tree(root, args.shots, args.seqs_per_shot, args.frames)
+        serial_time, expected = run_scan(root, 1, latency)
+        for workers in args.workers:
+            elapsed, records = serial_time, expected
+            if workers > 1:
+                elapsed, records = run_scan(root, workers, latency)
+            if records != expected:
+                print("Parallel scan with {} workers returned different records".format(workers))
+                return 1
+            results.append({
+                "workers": workers,
+                "seconds": round(elapsed, 4),
+                "speedup": round(serial_time / elapsed, 2) if elapsed else None,
+                "sequences": len(records),
+            })
+
+    if args.json:
+        print(json.dumps({"latency_ms": args.latency_ms, "shots": args.shots, "results": results}, indent=2))
+    else:
+        print("{} sequences, {:.1f} ms per directory".format(len(expected), args.latency_ms))
+        for row in results:
+            print("workers={workers:>3}  {seconds:8.3f}s  x{speedup}".format(**row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
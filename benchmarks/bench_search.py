@@ -0,0 +1,113 @@
+"""Time the name filter per keystroke over a large synthetic sequence list.
+
+Records are generated in memory for a show/sequence/shot/department layout
+spread over several roots, then loaded into a ``SequenceStore``. Each query is
+typed one character at a time and every prefix is filtered the way the panel
+does it: through the store's trigram index, from the rows of the previous
+prefix when it narrows them. Prefixes without a full trigram wait for the
+panel's debounce and are reported apart; the target applies to the
+per-keystroke ones.
+
+    python benchmarks/bench_search.py --sequences 200000 --target-ms 5
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+import synthetic  # noqa: F401  (puts Modules on sys.path)
+
+from element_browser.scan import sequences_in_directory
+from element_browser.search import is_instant
+from element_browser.store import FIELD_NAME, SequenceStore, select_slots
+
+DEPARTMENTS = ["comp", "lighting", "fx", "anim", "plate", "roto", "matte", "cfx"]
+LAYERS = ["beauty", "diffuse", "specular", "denoise", "crypto", "depth", "motion", "main", "bg", "fg"]
+QUERIES = ["sh0420", "lighting/beauty", "ROTO", "v012", "fx_denoise", "zzz_nomatch", "/cfx/"]
+
+
+def build_records(count, roots, seed) -> list[dict]:
+    rng = random.Random(seed)
+    records = []
+    shot = 0
+    while len(records) < count:
+        shot += 1
+        root = roots[shot % len(roots)]
+        department = rng.choice(DEPARTMENTS)
+        dirpath = os.path.join(root, "sq{:03d}".format(shot // 40), "sh{:04d}".format(shot * 10), department, "render")
+        names = []
+        for layer in rng.sample(LAYERS, rng.randint(1, 4)):
+            stem = "sh{:04d}_{}_{}_v{:03d}".format(shot * 10, department, layer, rng.randint(1, 30))
+            names.extend("{}.{:04d}.exr".format(stem, frame) for frame in (1001, 1002))
+        records.extend(sequences_in_directory(dirpath, names))
+    return records[:count]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sequences", type=int, default=200000)
+    parser.add_argument("--roots", type=int, default=3, help="shot roots the sequences are spread over")
+    parser.add_argument("--queries", nargs="+", default=QUERIES, help="typed one character at a time")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--target-ms", type=float, default=5.0, help="fail if the median keystroke is slower")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    roots = [os.path.join(os.sep, "mnt", "show{}".format(index)) for index in range(args.roots)]
+    records = build_records(args.sequences, roots, args.seed)
+    store = SequenceStore()
+    started = time.perf_counter()
+    slots = [store.add(record) for record in records]
+    load_s = time.perf_counter() - started
+    texts = [os.path.join(record["folder"], record["seq_key"]).lower() for record in records]
+
+    order = dict(zip(slots, range(len(slots))))
+
+    keystrokes = []
+    debounced = []
+    matched = {}
+    for query in args.queries:
+        previous = shown = None
+        for length in range(1, len(query) + 1):
+            started = time.perf_counter()
+            match = store.matcher(FIELD_NAME, query[:length])
+            candidates = shown if shown is not None and match.refines(previous) else slots
+            shown = select_slots(match, candidates, order)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            (keystrokes if is_instant(query[:length]) else debounced).append(elapsed_ms)
+            previous = match
+        matched[query] = len(shown)
+        expected = sum(1 for text in texts if query.lower() in text)
+        if expected != len(shown):
+            print("FAIL: {!r} matched {} sequence(s), expected {}".format(query, len(shown), expected))
+            return 1
+
+    keystrokes.sort()
+    results = {
+        "sequences": len(store),
+        "load_s": round(load_s, 3),
+        "keystrokes": len(keystrokes),
+        "median_ms": round(statistics.median(keystrokes), 3),
+        "p90_ms": round(keystrokes[int(len(keystrokes) * 0.9)], 3),
+        "max_ms": round(keystrokes[-1], 3),
+        "debounced": len(debounced),
+        "debounced_median_ms": round(statistics.median(debounced), 3) if debounced else 0.0,
+        "matched": matched,
+        "target_ms": args.target_ms,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            print("{:<20} {}".format(key, value))
+    if results["median_ms"] > args.target_ms:
+        print("FAIL: median keystroke took {} ms (target {} ms)".format(results["median_ms"], args.target_ms))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+"""Play and browse in the panel for a while and check that the process's resident size stays flat.
+
+A synthetic tree of long PNG sequences is generated and the panel is loaded
+offscreen (PySide6 required) with a memory budget smaller than its playback
+cache. For ``--minutes`` it cycles through the sequences: playing each for a
+few seconds, scrubbing, showing posters, filtering the list and rescanning.
+RSS and the panel's accounted use are sampled throughout, without trimming
+first, so an overshoot shows. Accounted use may pass the budget by at most
+``--slack-mb`` at any sample: a frame decoded just before the sample, or a
+member that is only counted, growing until the panel's once-a-second check.
+Growth is measured once the caches have first filled the budget and the
+``--warmup`` share of the run is over: the median of the last quarter of
+those samples may exceed that of the first quarter by at most
+``--max-growth-mb``. The panel is closed and freed before the process exits.
+
+    python benchmarks/bench_soak.py --minutes 10 --frames 10000 --budget-mb 256
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts Modules on sys.path)
+from bench_suite import close_panel, load_panel, wait_for
+
+from element_browser.memory import process_rss
+
+MB = 1024 * 1024
+# The caches count as full once accounted use first reaches this share of the budget.
+FULL_SHARE = 0.95
+
+
+class BindingLeak(RuntimeError):
+    """``None`` is losing references: Qt bindings built for another Python drop one on calls returning ``None``.
+
+    Left to run, the count reaches zero and the interpreter aborts with
+    "Fatal Python error: none_dealloc", so the run stops while it is still safe
+    to close the panel.
+    """
+
+
+def quarter_medians(values) -> tuple[float, float]:
+    quarter = max(1, len(values) // 4)
+    return statistics.median(values[:quarter]), statistics.median(values[-quarter:])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=2.0)
+    parser.add_argument("--sequences", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=5000, help="frames per sequence")
+    parser.add_argument("--size", type=int, nargs=2, default=(320, 180), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--budget-mb", type=int, default=256, help="ELEMENT_BROWSER_MEMORY_BUDGET_MB for the panel")
+    parser.add_argument("--cache-mb", type=int, default=1024, help="playback cache, larger than the budget on purpose")
+    parser.add_argument("--play-seconds", type=float, default=3.0)
+    parser.add_argument("--sample-seconds", type=float, default=1.0)
+    parser.add_argument("--warmup", type=float, default=0.25, help="share of the run left out of the growth check")
+    parser.add_argument("--max-growth-mb", type=float, default=32.0)
+    parser.add_argument("--slack-mb", type=float, default=4.0, help="overshoot of the budget allowed at a sample")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic tree")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ["ELEMENT_BROWSER_MEMORY_BUDGET_MB"] = str(args.budget_mb)
+    os.environ["ELEMENT_BROWSER_PLAYBACK_CACHE_MB"] = str(args.cache_mb)
+    workdir = tempfile.mkdtemp(prefix="element_browser_soak_")
+    root = os.path.join(workdir, "shots")
+    rng = random.Random(args.seed)
+    try:
+        started = time.perf_counter()
+        synthetic.build_render_tree(
+            root,
+            dirs=args.sequences,
+            seqs_per_dir=1,
+            frames=args.frames,
+            extensions=(".png",),
+            content=synthetic.png_bytes(*args.size),
+        )
+        generate_s = time.perf_counter() - started
+        try:
+            namespace = load_panel(os.path.join(workdir, "cache"))
+        except ImportError as exc:
+            print("FAIL: the soak test needs the panel: {}".format(exc))
+            return 1
+        app, panel, memory = namespace["app"], namespace["panel"], namespace["MEMORY"]
+        panel.resize(1280, 800)
+        app.processEvents()
+
+        samples = []
+        over_budget = []
+        slack = args.slack_mb * MB
+        # Immortal from Python 3.12 on, where the count never moves.
+        none_floor = sys.getrefcount(None) // 4
+        run_started = time.perf_counter()
+        next_sample = run_started
+
+        def pump(seconds) -> None:
+            nonlocal next_sample
+            until = time.perf_counter() + seconds
+            while time.perf_counter() < until:
+                app.processEvents()
+                now = time.perf_counter()
+                if now >= next_sample:
+                    used = memory.used_bytes()
+                    samples.append((now - run_started, process_rss(), used))
+                    if used > memory.budget_bytes + slack:
+                        over_budget.append(used)
+                    if sys.getrefcount(None) < none_floor:
+                        raise BindingLeak(
+                            "None's reference count fell to {}; PySide6 does not match this Python".format(
+                                sys.getrefcount(None)
+                            )
+                        )
+                    next_sample = now + args.sample_seconds
+                time.sleep(0.01)
+
+        def rescan() -> None:
+            panel.roots = [root]
+            panel.clear_tree()
+            panel.populate_tree()
+            if not wait_for(app, lambda: panel.scan_worker is None, 300):
+                raise RuntimeError("panel scan did not finish")
+
+        deadline = run_started + args.minutes * 60.0
+        step = rescans = 0
+        leak = ""
+        try:
+            rescan()
+            while time.perf_counter() < deadline:
+                seqs = [seq for seq in (panel.store.get(slot) for slot in panel.model.ordered_slots()) if seq]
+                if not seqs:
+                    print("FAIL: the scan listed no sequences")
+                    return 1
+                seq = seqs[step % len(seqs)]
+                panel.show_poster(seq)
+                panel.play_sequence(seq)
+                pump(args.play_seconds)
+                for _scrub in range(5):
+                    panel.seek_frame(rng.randrange(len(panel.playback_files)))
+                    pump(0.1)
+                panel.filter_edit.setText(seq["seq_key"][:6])
+                pump(0.2)
+                panel.filter_edit.setText("")
+                step += 1
+                if step % (2 * len(seqs)) == 0:
+                    panel.pause_playback()
+                    rescan()
+                    rescans += 1
+            panel.pause_playback()
+            pump(args.sample_seconds)
+        except BindingLeak as exc:
+            leak = str(exc)
+        finally:
+            status = panel.memory_status.text()
+            breakdown = panel.memory_status.toolTip()
+            close_panel(app, namespace)
+    finally:
+        if args.keep:
+            print("Synthetic tree kept at {}".format(root), file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if leak:
+        print("FAIL: stopped after {:.0f} s: {}".format(samples[-1][0] if samples else 0.0, leak))
+        return 1
+    full = next((elapsed for elapsed, _rss, used in samples if used >= FULL_SHARE * args.budget_mb * MB), 0.0)
+    warmup_s = max(full, args.warmup * args.minutes * 60.0)
+    measured = [rss for elapsed, rss, _used in samples if elapsed >= warmup_s]
+    if len(measured) < 4:
+        print("FAIL: only {} RSS sample(s) after a {:.0f} s warm-up; run longer".format(len(measured), warmup_s))
+        return 1
+    first, last = quarter_medians(measured)
+    results = {
+        "minutes": args.minutes,
+        "frames": args.sequences * args.frames,
+        "generate_s": round(generate_s, 1),
+        "cycles": step,
+        "rescans": rescans,
+        "samples": len(samples),
+        "warmup_s": round(warmup_s, 1),
+        "rss_start_mb": round(first / MB, 1),
+        "rss_end_mb": round(last / MB, 1),
+        "rss_growth_mb": round((last - first) / MB, 1),
+        "rss_peak_mb": round(max(rss for _elapsed, rss, _used in samples) / MB, 1),
+        "accounted_peak_mb": round(max(used for _elapsed, _rss, used in samples) / MB, 1),
+        "budget_mb": args.budget_mb,
+        "status": status,
+        "breakdown": breakdown.replace("\n", "; "),
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            print("{:<18} {}".format(key, value))
+    failed = False
+    if over_budget:
+        print("FAIL: accounted memory over budget by more than {} MB at {} sample(s), up to {:.1f} MB".format(
+            args.slack_mb, len(over_budget), max(over_budget) / MB
+        ))
+        failed = True
+    if results["rss_growth_mb"] > args.max_growth_mb:
+        print("FAIL: RSS grew {} MB after warm-up (limit {} MB)".format(results["rss_growth_mb"], args.max_growth_mb))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,322 @@
+"""Time the scan, frame list, preview and import paths on a synthetic render tree.
+
+The Qt-free stages always run. When PySide6 is available the panel script is
+also loaded offscreen and its own ``populate_tree``, ``build_sequence_file_list``,
+``show_frame`` and ``import_all_and_create_timeline`` are timed, the import
+running against the mock media pool in ``mock_resolve.py``.
+
+    python benchmarks/bench_suite.py --dirs 50 --frames 200 --gap-every 25 -o results.json
+    python benchmarks/bench_suite.py --baseline results.json --threshold 0.25
+
+Each stage reports the median of ``--repeat`` runs. With ``--baseline`` the run
+fails when a stage's median is more than ``--threshold`` slower than the
+baseline's (and at least ``--min-delta-ms`` slower, so tiny stages do not flap).
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from synthetic import build_render_tree, png_bytes  # puts Modules on sys.path
+from mock_resolve import MockMediaPool
+
+from element_browser.media_import import ClipIndex, MediaImporter, switch_bin
+from element_browser.resolve_api import create_timeline, prepare_import
+from element_browser.scan import detect_sequences
+from element_browser.sequences import sequence_frame_paths, sequence_import_item
+
+PANEL_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Utility", "Element Browser.py")
+PREVIEW_FOLDER = "preview"
+
+
+def measure(func, repeat, items=None):
+    """Run ``func`` ``repeat`` times and summarise the wall-clock seconds.
+
+    ``items`` (a count, or a callable returning one after the runs) adds a per-item time.
+    """
+    times = []
+    for _run in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    result = {
+        "median_s": round(statistics.median(times), 6),
+        "min_s": round(min(times), 6),
+        "max_s": round(max(times), 6),
+        "runs": repeat,
+    }
+    if callable(items):
+        items = items()
+    if items:
+        result["items"] = items
+        result["per_item_us"] = round(statistics.median(times) / items * 1e6, 3)
+    return result
+
+
+def core_import(records, latency):
+    media_pool = MockMediaPool(latency=latency)
+    items = [item for item in (sequence_import_item(record) for record in records) if item]
+    clip_index = ClipIndex()
+    import_bin, _indexed = prepare_import(media_pool, clip_index, "bench", "Element Browser bench")
+    run = MediaImporter().start(media_pool, items, clip_index)
+    previous_bin = switch_bin(media_pool, import_bin)
+    try:
+        for _step in run.steps():
+            pass
+    finally:
+        switch_bin(media_pool, previous_bin)
+    clips = run.clips()
+    timeline_name, appended = create_timeline(media_pool, "bench_Timeline", clips)
+    if not (timeline_name and appended) or run.failed() or len(items) != len(records):
+        raise RuntimeError("core import brought in {} of {} sequences".format(run.done - len(run.failed()), len(records)))
+
+
+def run_core(root, args, results) -> list:
+    records = []
+
+    def scan():
+        records[:] = detect_sequences(root)
+
+    results["detect_sequences"] = measure(scan, args.repeat, lambda: len(records))
+
+    def frame_lists():
+        for record in records:
+            sequence_frame_paths(record)
+
+    results["sequence_frame_paths"] = measure(frame_lists, args.repeat, len(records))
+    results["import.core"] = measure(lambda: core_import(records, args.latency_ms / 1000.0), args.repeat, len(records))
+    return records
+
+
+def load_panel(cache_dir):
+    """Run the panel script offscreen up to its event loop and return its globals."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["ELEMENT_BROWSER_RESIDENT"] = "0"
+    os.environ["ELEMENT_BROWSER_WATCH"] = "0"
+    os.environ["ELEMENT_BROWSER_AUTO_POSTERS"] = "0"
+    os.environ["ELEMENT_BROWSER_CACHE"] = cache_dir
+    from PySide6.QtWidgets import QApplication
+
+    # The script ends in app.exec(); return at once so the benchmark drives the event loop.
+    QApplication.exec = lambda *_args: 0
+    return runpy.run_path(PANEL_SCRIPT, run_name="element_browser_panel")
+
+
+def close_panel(app, namespace) -> None:
+    """Close the panel for good and free it and the script's globals before the interpreter exits.
+
+    Its ``closeEvent`` stops the timers and joins the decode, proxy and header
+    threads; deleting the widget here, rather than during interpreter
+    finalization, keeps Qt from tearing it down after Python's objects are gone.
+    """
+    from PySide6.QtCore import QEvent
+
+    panel = namespace["panel"]
+    panel.resident = False
+    panel.close()
+    panel.deleteLater()
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    namespace.clear()
+    gc.collect()
+
+
+def wait_for(app, done, timeout) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not done():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+def run_panel(root, args, results) -> None:
+    namespace = load_panel(os.path.join(root, os.pardir, "cache"))
+    app, panel = namespace["app"], namespace["panel"]
+    clip_index_type = namespace["ClipIndex"]
+    panel.resize(1280, 800)
+    app.processEvents()
+
+    def populate():
+        panel.roots = [root]
+        panel.clear_tree()
+        panel.populate_tree()
+        if not wait_for(app, lambda: panel.scan_worker is None, args.timeout):
+            raise RuntimeError("panel scan did not finish")
+
+    results["panel.populate_tree"] = measure(populate, args.repeat)
+    seqs = [seq for seq in (panel.store.get(slot) for slot in panel.model.ordered_slots()) if seq]
+    results["panel.populate_tree"]["items"] = len(seqs)
+
+    def frame_lists():
+        for seq in seqs:
+            panel.build_sequence_file_list(seq)
+
+    results["panel.build_sequence_file_list"] = measure(frame_lists, args.repeat, len(seqs))
+
+    preview = [seq for seq in seqs if os.path.basename(os.path.dirname(seq["folder"])) == PREVIEW_FOLDER]
+    frames = panel.build_sequence_file_list(preview[0]) if preview else []
+    if frames:
+        def decode():
+            panel.frame_cache.clear()
+            for frame_path in frames:
+                panel.show_frame(frame_path)
+
+        def cached():
+            for frame_path in frames:
+                panel.show_frame(frame_path)
+
+        results["panel.show_frame.decode"] = measure(decode, args.repeat, len(frames))
+        results["panel.show_frame.cached"] = measure(cached, args.repeat, len(frames))
+
+    panel.model.set_checked(list(panel.model.ordered_slots()), True)
+    latency = args.latency_ms / 1000.0
+
+    def import_all():
+        media_pool = MockMediaPool(latency=latency)
+        panel.ensure_media_pool = lambda: media_pool
+        panel.clip_index = clip_index_type()
+        panel.importer.forget()
+        panel.import_all_and_create_timeline()
+        if not wait_for(app, lambda: panel.import_job is None, args.timeout):
+            raise RuntimeError("panel import did not finish")
+        if not media_pool.timelines or not media_pool.timelines[-1].items:
+            raise RuntimeError("panel import: {}".format(panel.status.text()))
+
+    results["panel.import_all_and_create_timeline"] = measure(import_all, args.repeat, len(seqs))
+    close_panel(app, namespace)
+
+
+def compare(results, baseline, threshold, min_delta) -> list:
+    """Stages whose median regressed past ``threshold`` against ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        ratio = result["median_s"] / before["median_s"] if before["median_s"] else 1.0
+        result["baseline_median_s"] = before["median_s"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1.0 + threshold and result["median_s"] - before["median_s"] >= min_delta:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=20, help="shot folders")
+    parser.add_argument("--seqs-per-dir", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=100, help="frames per sequence before gaps")
+    parser.add_argument("--paddings", type=int, nargs="+", default=[4, 6, 0], help="padding styles, 0 for unpadded")
+    parser.add_argument("--extensions", nargs="+", default=[".exr", ".png", ".jpg"])
+    parser.add_argument("--gap-every", type=int, default=0, help="drop every Nth frame (0: no gaps)")
+    parser.add_argument("--preview-frames", type=int, default=24, help="decodable PNG frames for show_frame")
+    parser.add_argument("--preview-size", type=int, nargs=2, default=[1920, 1080], metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="artificial delay per mock ImportMedia call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--panel", choices=["auto", "on", "off"], default="auto",
+                        help="also time the panel's own methods (needs PySide6)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for a panel scan or import")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic tree")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="element_browser_bench_")
+    root = os.path.join(workdir, "shots")
+    results = {}
+    try:
+        started = time.perf_counter()
+        sequences, frame_files = build_render_tree(
+            root, args.dirs, args.seqs_per_dir, args.frames, args.paddings, args.gap_every,
+            extensions=args.extensions,
+        )
+        if args.preview_frames:
+            preview_dir = os.path.join(root, PREVIEW_FOLDER, "render")
+            os.makedirs(preview_dir)
+            image = png_bytes(*args.preview_size)
+            for frame in range(1001, 1001 + args.preview_frames):
+                with open(os.path.join(preview_dir, "preview.{}.png".format(frame)), "wb") as handle:
+                    handle.write(image)
+            sequences += 1
+            frame_files += args.preview_frames
+        generate_s = time.perf_counter() - started
+
+        run_core(root, args, results)
+        panel_error = None
+        if args.panel != "off":
+            try:
+                run_panel(root, args, results)
+            except ImportError as exc:
+                if args.panel == "on":
+                    raise
+                panel_error = str(exc)
+    finally:
+        if args.keep:
+            print("Synthetic tree kept at {}".format(root), file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle)["results"], args.threshold, args.min_delta_ms / 1000.0)
+
+    report = {
+        "tree": {
+            "dirs": args.dirs,
+            "seqs_per_dir": args.seqs_per_dir,
+            "frames": args.frames,
+            "paddings": args.paddings,
+            "extensions": args.extensions,
+            "gap_every": args.gap_every,
+            "sequences": sequences,
+            "frame_files": frame_files,
+            "generate_s": round(generate_s, 3),
+        },
+        "latency_ms": args.latency_ms,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "panel_skipped": panel_error,
+        "results": results,
+        "regressions": regressions,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+            handle.write("\n")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("{sequences} sequences, {frame_files} frame files ({generate_s}s to generate)".format(**report["tree"]))
+        if panel_error:
+            print("Panel stages skipped: {}".format(panel_error))
+        for name, result in results.items():
+            line = "{:<40} {:10.4f}s median {:10.4f}s min".format(name, result["median_s"], result["min_s"])
+            if "per_item_us" in result:
+                line += " {:12.1f} us/item".format(result["per_item_us"])
+            if "ratio" in result:
+                line += "  x{:.2f} vs baseline".format(result["ratio"])
+            print(line)
+    if regressions:
+        print(
+            "FAIL: slower than the baseline by more than {:.0%}: {}".format(args.threshold, ", ".join(regressions)),
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+"""Compare probing for a free timeline name with the batched timeline assembly against a mock project.
+
+The project already holds ``--existing`` timelines named like the one being
+built, as after repeated imports of the same show. The legacy path calls
+``CreateEmptyTimeline`` until a name is free and appends every clip in one
+call; the assembly lists the project's timelines once, creates each timeline
+with a single call and appends clip-info batches with record frames, in one
+combined timeline and one per shot. Listing calls are reported apart; the
+mock only charges latency for creating and appending. A dry run on an
+identical project must plan the same names without creating or appending
+anything.
+
+    python benchmarks/bench_timeline.py --shots 40 --existing 60 --latency-ms 5
+"""
+
+import argparse
+import json
+import time
+
+import synthetic  # noqa: F401  (puts Modules on sys.path)
+from mock_resolve import MockClip, MockMediaPool, MockProject, MockTimeline
+
+from element_browser.timeline import (
+    MODE_COMBINED,
+    MODE_PER_SHOT,
+    TimelineAssembly,
+    clip_frames,
+    timeline_groups,
+)
+
+ROOT = "/shows/show"
+BASE_NAME = "show_Timeline"
+
+
+def build_entries(shots, clips_per_shot) -> list[tuple]:
+    entries = []
+    for shot in range(shots):
+        folder = "{}/sh{:04d}/comp".format(ROOT, (shot + 1) * 10)
+        for layer in range(clips_per_shot):
+            path = "{}/sh{:04d}_layer{}.[1001-{}].exr".format(folder, (shot + 1) * 10, layer, 1001 + 20 * layer + 47)
+            entries.append((folder, [MockClip(path, 1001, 1001 + 20 * layer + 47)]))
+    return entries
+
+
+def make_project(existing, shots, latency) -> MockProject:
+    media_pool = MockMediaPool(latency=latency)
+    names = [BASE_NAME] + ["{}_{}".format(BASE_NAME, index) for index in range(2, existing + 1)] if existing else []
+    # Earlier per-shot imports left a timeline for every other shot.
+    names += ["sh{:04d}".format((shot + 1) * 10) for shot in range(0, shots, 2)]
+    media_pool.timelines.extend(MockTimeline(name) for name in names)
+    return MockProject(media_pool)
+
+
+def legacy_timeline(media_pool, base_name, clips, attempts=100):
+    for idx in range(attempts):
+        try_name = base_name if idx == 0 else "{}_{}".format(base_name, idx + 1)
+        if media_pool.CreateEmptyTimeline(try_name):
+            return try_name if media_pool.AppendToTimeline(clips) else None
+    return None
+
+
+def call_counts(media_pool) -> dict:
+    return {
+        "create_calls": media_pool.call_count("CreateEmptyTimeline"),
+        "append_calls": media_pool.call_count("AppendToTimeline"),
+        "list_calls": media_pool.call_count("GetTimelineCount") + media_pool.call_count("GetTimelineByIndex"),
+    }
+
+
+def check_placements(plans) -> str | None:
+    """Where a plan's clips did not land back to back from the timeline start, in order."""
+    for plan in plans:
+        expected = plan.record_start
+        for clip, record_frame in plan.timeline.items:
+            if record_frame != expected:
+                return "{}: {} at {}, expected {}".format(plan.name, clip.GetName(), record_frame, expected)
+            expected += clip_frames(clip)
+        if len(plan.timeline.items) != len(plan.clips):
+            return "{}: {} of {} clips appended".format(plan.name, len(plan.timeline.items), len(plan.clips))
+    return None
+
+
+def run_assembly(args, entries, mode) -> tuple[dict, str | None]:
+    groups = timeline_groups(entries, BASE_NAME, mode, [ROOT])
+    dry_project = make_project(args.existing, args.shots, args.latency_ms / 1000.0)
+    dry = TimelineAssembly(dry_project.media_pool, dry_project, args.batch_size, dry_run=True)
+    dry.build(groups)
+    dry_counts = call_counts(dry_project.media_pool)
+    dry_made = dry_counts["create_calls"] + dry_counts["append_calls"]
+
+    project = make_project(args.existing, args.shots, args.latency_ms / 1000.0)
+    started = time.perf_counter()
+    assembly = TimelineAssembly(project.media_pool, project, args.batch_size)
+    plans = assembly.build(groups)
+    elapsed = time.perf_counter() - started
+    result = {
+        "timelines": len(plans),
+        **call_counts(project.media_pool),
+        "seconds": round(elapsed, 4),
+        "stages": {name: round(seconds, 4) for name, seconds in assembly.stages.items()},
+    }
+    if dry_made:
+        return result, "dry run made {} create/append call(s)".format(dry_made)
+    if [plan.name for plan in dry.plans] != [plan.name for plan in plans]:
+        return result, "dry run planned {}, build made {}".format(
+            [plan.name for plan in dry.plans], [plan.name for plan in plans]
+        )
+    if any(plan.timeline is None for plan in plans):
+        return result, "timeline creation failed"
+    if result["create_calls"] != len(plans):
+        return result, "{} CreateEmptyTimeline call(s) for {} timeline(s)".format(result["create_calls"], len(plans))
+    return result, check_placements(plans)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=40)
+    parser.add_argument("--clips-per-shot", type=int, default=3)
+    parser.add_argument("--existing", type=int, default=60, help="timelines already named like the combined one")
+    parser.add_argument("--batch-size", type=int, default=100, help="clip infos per AppendToTimeline call")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated time per Resolve call")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    entries = build_entries(args.shots, args.clips_per_shot)
+    clips = [clip for _folder, clips in entries for clip in clips]
+
+    project = make_project(args.existing, args.shots, args.latency_ms / 1000.0)
+    started = time.perf_counter()
+    legacy_name = legacy_timeline(project.media_pool, BASE_NAME, clips)
+    results = {
+        "clips": len(clips),
+        "existing": args.existing,
+        "legacy": {
+            "timeline": legacy_name,
+            **call_counts(project.media_pool),
+            "seconds": round(time.perf_counter() - started, 4),
+        },
+    }
+    failures = []
+    for mode in (MODE_COMBINED, MODE_PER_SHOT):
+        results[mode], failure = run_assembly(args, entries, mode)
+        if failure:
+            failures.append("{}: {}".format(mode, failure))
+    if results[MODE_COMBINED]["timelines"] != 1 or results[MODE_PER_SHOT]["timelines"] != args.shots:
+        failures.append("built {} combined and {} per-shot timeline(s) for {} shot(s)".format(
+            results[MODE_COMBINED]["timelines"], results[MODE_PER_SHOT]["timelines"], args.shots
+        ))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            print("{:<10} {}".format(key, value))
+    for failure in failures:
+        print("FAIL: {}".format(failure))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,198 @@
+"""A stand-in for the parts of Resolve's MediaPool and Project API the panel uses.
+
+``MockMediaPool`` accepts only the payload forms it is told to (per
+extension), can reject named paths or whole lists longer than ``max_entries``,
+and sleeps ``latency`` seconds per import, timeline creation and append so
+call counts show up as time. Every call is recorded in
+``calls``. ``MockProject`` lists the pool's timelines by index.
+"""
+
+import os
+import re
+import time
+
+from element_browser.media_import import FORM_FIRST_FILE, FORM_FIRST_FILE_LIST, FORM_HASH, FORM_PRINTF
+
+FRAME_PATTERN_RE = re.compile(r"(%0?\d*d|#+)")
+
+
+class MockClip:
+    _next_id = 0
+
+    def __init__(self, path, start, end) -> None:
+        MockClip._next_id += 1
+        self.uid = "clip-{}".format(MockClip._next_id)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.deleted = False
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetName(self):
+        return os.path.basename(self.path)
+
+    def GetClipProperty(self, name=None):
+        if self.deleted:
+            return None
+        properties = {"File Path": self.path, "Start": str(self.start), "End": str(self.end)}
+        return properties.get(name, "") if name else properties
+
+
+class MockFolder:
+    def __init__(self, name="Master") -> None:
+        self.name = name
+        self.clips = []
+        self.subfolders = []
+        self.listed = 0
+
+    def GetName(self):
+        return self.name
+
+    def GetClipList(self):
+        self.listed += 1
+        return list(self.clips)
+
+    def GetSubFolderList(self):
+        return list(self.subfolders)
+
+
+class MockTimeline:
+    def __init__(self, name, start_frame=86400) -> None:
+        self.name = name
+        self.start_frame = start_frame
+        self.items = []
+
+    def GetName(self):
+        return self.name
+
+    def GetStartFrame(self):
+        return self.start_frame
+
+
+class MockMediaPool:
+    def __init__(self, accept=None, latency=0.0, reject_paths=(), max_entries=None) -> None:
+        """``accept`` maps extension to the set of payload forms that import (default: printf everywhere)."""
+        self.accept = accept or {}
+        self.latency = latency
+        self.reject_paths = set(reject_paths)
+        self.max_entries = max_entries
+        self.root = MockFolder()
+        self.current = self.root
+        self.timelines = []
+        self.current_timeline = None
+        self.calls = []
+
+    def _accepts(self, form, path) -> bool:
+        extension = os.path.splitext(path)[1].lower()
+        return form in self.accept.get(extension, {FORM_PRINTF}) and path not in self.reject_paths
+
+    def _import_entry(self, entry, single_path):
+        if isinstance(entry, dict):
+            path = entry.get("FilePath", "")
+            form = FORM_HASH if "#" in path else FORM_PRINTF
+            if not FRAME_PATTERN_RE.search(path) or not self._accepts(form, path):
+                return None
+            shown = FRAME_PATTERN_RE.sub("[{}-{}]".format(entry["StartIndex"], entry["EndIndex"]), path, count=1)
+            return MockClip(shown, entry["StartIndex"], entry["EndIndex"])
+        form = FORM_FIRST_FILE if single_path else FORM_FIRST_FILE_LIST
+        if not self._accepts(form, entry):
+            return None
+        return MockClip(entry, 0, 0)
+
+    def ImportMedia(self, payload):
+        self.calls.append(("ImportMedia", payload))
+        if self.latency:
+            time.sleep(self.latency)
+        single_path = isinstance(payload, str)
+        entries = [payload] if single_path else list(payload)
+        if self.max_entries is not None and len(entries) > self.max_entries:
+            # Large lists sometimes import nothing at all in Resolve.
+            return []
+        clips = [clip for clip in (self._import_entry(entry, single_path) for entry in entries) if clip]
+        self.current.clips.extend(clips)
+        return clips
+
+    def GetRootFolder(self):
+        return self.root
+
+    def GetCurrentFolder(self):
+        return self.current
+
+    def SetCurrentFolder(self, folder):
+        self.current = folder
+        return True
+
+    def AddSubFolder(self, parent, name):
+        self.calls.append(("AddSubFolder", name))
+        folder = MockFolder(name)
+        parent.subfolders.append(folder)
+        return folder
+
+    def RelinkClips(self, clips, folder_path):
+        self.calls.append(("RelinkClips", folder_path))
+        return bool(clips)
+
+    def DeleteClips(self, clips):
+        for clip in clips:
+            clip.deleted = True
+        return True
+
+    def CreateEmptyTimeline(self, name):
+        self.calls.append(("CreateEmptyTimeline", name))
+        if self.latency:
+            time.sleep(self.latency)
+        if any(timeline.name == name for timeline in self.timelines):
+            return None
+        timeline = MockTimeline(name)
+        self.timelines.append(timeline)
+        self.current_timeline = timeline
+        return timeline
+
+    def AppendToTimeline(self, clips):
+        """Append clips or clip-info dicts to the current timeline; ``items`` keeps ``(clip, record_frame)``."""
+        self.calls.append(("AppendToTimeline", len(clips)))
+        if self.latency:
+            time.sleep(self.latency)
+        timeline = self.current_timeline
+        if timeline is None:
+            return False
+        for clip in clips:
+            if isinstance(clip, dict):
+                timeline.items.append((clip["mediaPoolItem"], clip.get("recordFrame")))
+            else:
+                timeline.items.append((clip, None))
+        return True
+
+    def import_calls(self) -> int:
+        return self.call_count("ImportMedia")
+
+    def call_count(self, name) -> int:
+        return sum(1 for called, _payload in self.calls if called == name)
+
+
+class MockProject:
+    def __init__(self, media_pool=None) -> None:
+        self.media_pool = media_pool or MockMediaPool()
+
+    def GetName(self):
+        return "Mock Project"
+
+    def GetMediaPool(self):
+        return self.media_pool
+
+    def GetTimelineCount(self):
+        self.media_pool.calls.append(("GetTimelineCount", None))
+        return len(self.media_pool.timelines)
+
+    def GetTimelineByIndex(self, index):
+        self.media_pool.calls.append(("GetTimelineByIndex", index))
+        timelines = self.media_pool.timelines
+        return timelines[index - 1] if 1 <= index <= len(timelines) else None
+
+    def SetCurrentTimeline(self, timeline):
+        if timeline not in self.media_pool.timelines:
+            return False
+        self.media_pool.current_timeline = timeline
+        return True
@@ -0,0 +1,169 @@
+"""Synthetic shot trees for the benchmarks in this directory."""
+
+import os
+import struct
+import sys
+import zlib
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Modules")
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+
+UNPADDED_START_FRAME = 990
+
+
+def build_shot_tree(root, shots=50, seqs_per_shot=2, frames=24, start_frame=1001, padding=4, ext=".exr"):
+    """Create ``root/shot_NNN/render_N/plate_N.<frame>.<ext>`` empty frame files and return the frame count."""
+    created = 0
+    for shot in range(shots):
+        for seq in range(seqs_per_shot):
+            folder = os.path.join(root, "shot_{:03d}".format(shot), "render_{}".format(seq))
+            os.makedirs(folder, exist_ok=True)
+            for frame in range(start_frame, start_frame + frames):
+                name = "plate_{}.{:0{}d}{}".format(seq, frame, padding, ext)
+                with open(os.path.join(folder, name), "wb"):
+                    pass
+                created += 1
+    return created
+
+
+def frame_numbers(frames, start_frame=1001, gap_every=0) -> list[int]:
+    """``frames`` consecutive frame numbers, less every ``gap_every``-th one when it is set."""
+    numbers = range(start_frame, start_frame + frames)
+    if gap_every > 1:
+        return [frame for index, frame in enumerate(numbers) if (index + 1) % gap_every]
+    return list(numbers)
+
+
+def build_render_tree(
+    root,
+    dirs=20,
+    seqs_per_dir=3,
+    frames=100,
+    paddings=(4,),
+    gap_every=0,
+    start_frame=1001,
+    extensions=(".exr",),
+    content=b"",
+):
+    """Create ``root/shot_NNN/render/<name>`` sequences mixing padding styles, separators and gaps.
+
+    Sequences take their padding, extension and separator (``.`` or ``_``)
+    round-robin from the arguments. Padding ``0`` writes unpadded numbers
+    starting at frame 990, so their names cross from three to four digits. With
+    ``gap_every`` set every sequence drops every ``gap_every``-th frame.
+    Every frame file holds ``content``. Returns ``(sequences, frame_files)``.
+    """
+    sequences = created = 0
+    for shot in range(dirs):
+        folder = os.path.join(root, "shot_{:03d}".format(shot), "render")
+        os.makedirs(folder, exist_ok=True)
+        for seq in range(seqs_per_dir):
+            index = shot * seqs_per_dir + seq
+            padding = paddings[index % len(paddings)]
+            ext = extensions[index % len(extensions)]
+            separator = "._"[index % 2]
+            numbers = frame_numbers(frames, start_frame if padding else UNPADDED_START_FRAME, gap_every)
+            for frame in numbers:
+                name = "layer{}{}{:0{}d}{}".format(seq, separator, frame, padding, ext)
+                with open(os.path.join(folder, name), "wb") as handle:
+                    handle.write(content)
+            sequences += 1
+            created += len(numbers)
+    return sequences, created
+
+
+def png_bytes(width=1920, height=1080) -> bytes:
+    """An 8-bit RGB PNG with a diagonal ramp, built without Qt or NumPy."""
+    base = bytes(value % 256 for value in range(width * 3 + height))
+    raw = b"".join(b"\0" + base[row: row + width * 3] for row in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(raw, 6)),
+        chunk(b"IEND", b""),
+    ])
+
+
+def _exr_attribute(name, attr_type, value) -> bytes:
+    return name.encode() + b"\0" + attr_type.encode() + b"\0" + struct.pack("<i", len(value)) + value
+
+
+def _exr_zip(raw) -> bytes:
+    import numpy as np
+
+    data = np.frombuffer(raw, dtype=np.uint8)
+    split = np.concatenate([data[0::2], data[1::2]])
+    deltas = np.empty_like(split)
+    deltas[0] = split[0]
+    deltas[1:] = split[1:] - split[:-1] + np.uint8(128)
+    return zlib.compress(deltas.tobytes(), 4)
+
+
+def write_exr(path, planes, compression="zip"):
+    """Write half-float ``planes`` (``{channel: (h, w) float16 array}``) as a scanline EXR.
+
+    Supports ``none``, ``zips`` and ``zip`` compression; enough to produce
+    realistic benchmark input without the OpenEXR bindings.
+    """
+    import numpy as np
+
+    codes = {"none": 0, "zips": 2, "zip": 3}
+    lines = {"none": 1, "zips": 1, "zip": 16}[compression]
+    names = sorted(planes)
+    height, width = planes[names[0]].shape
+    chlist = b"".join(name.encode() + b"\0" + struct.pack("<iB3xii", 1, 0, 1, 1) for name in names) + b"\0"
+    box = struct.pack("<4i", 0, 0, width - 1, height - 1)
+    header = b"".join([
+        struct.pack("<ii", 20000630, 2),
+        _exr_attribute("channels", "chlist", chlist),
+        _exr_attribute("compression", "compression", bytes([codes[compression]])),
+        _exr_attribute("dataWindow", "box2i", box),
+        _exr_attribute("displayWindow", "box2i", box),
+        _exr_attribute("lineOrder", "lineOrder", b"\0"),
+        _exr_attribute("pixelAspectRatio", "float", struct.pack("<f", 1.0)),
+        _exr_attribute("screenWindowCenter", "v2f", struct.pack("<2f", 0.0, 0.0)),
+        _exr_attribute("screenWindowWidth", "float", struct.pack("<f", 1.0)),
+        b"\0",
+    ])
+
+    blocks = []
+    for first_row in range(0, height, lines):
+        rows = range(first_row, min(first_row + lines, height))
+        raw = b"".join(
+            np.ascontiguousarray(planes[name][row], dtype="<f2").tobytes() for row in rows for name in names
+        )
+        data = raw if compression == "none" else _exr_zip(raw)
+        if len(data) >= len(raw):
+            data = raw
+        blocks.append(struct.pack("<ii", first_row, len(data)) + data)
+
+    offset = len(header) + 8 * len(blocks)
+    offsets = []
+    for block in blocks:
+        offsets.append(offset)
+        offset += len(block)
+    with open(path, "wb") as handle:
+        handle.write(header)
+        handle.write(struct.pack("<{}Q".format(len(offsets)), *offsets))
+        for block in blocks:
+            handle.write(block)
+
+
+def gradient_planes(width=2048, height=1080, channels=("R", "G", "B", "A")):
+    """Smooth HDR-ish half-float test pattern with a little noise, so compression ratios look like real plates."""
+    import numpy as np
+
+    rng = np.random.default_rng(7)
+    x = np.linspace(0.0, 4.0, width, dtype=np.float32)[None, :]
+    y = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    base = x * y
+    planes = {}
+    for index, name in enumerate(channels):
+        noise = rng.normal(0.0, 0.01, size=(height, width)).astype(np.float32)
+        planes[name] = (base * (0.6 + 0.2 * index) + noise).astype(np.float16)
+    return planes